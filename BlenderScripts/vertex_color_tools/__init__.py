@@ -17,10 +17,23 @@ from . import main_menu
 from . import vertex_color_preview
 from . import set_color_to_selection
 from . import bake_ao
+from . import disk_ao
+from . import thickness
+from . import light_bake
+from . import color_bleed
+from . import proximity_mask
 from . import directional_shade
+from . import sh_relight
 from . import dot_shade
+from . import curvature
+from . import geodesic
+from . import procedural_noise
 from . import density_weighted
+from . import proxy_bake
+from . import color_transfer
 from . import blur 
+from . import morphology
+from . import mirror_colors
 from . import intensity
 from . import combine_layers
 from . import lerp_colors_by_layer
@@ -31,10 +44,23 @@ def register():
     vertex_color_preview.register()
     set_color_to_selection.register()
     bake_ao.register()
+    disk_ao.register()
+    thickness.register()
+    light_bake.register()
+    color_bleed.register()
+    proximity_mask.register()
     directional_shade.register()
+    sh_relight.register()
     dot_shade.register()
+    curvature.register()
+    geodesic.register()
+    procedural_noise.register()
     density_weighted.register()
+    proxy_bake.register()
+    color_transfer.register()
     blur.register()
+    morphology.register()
+    mirror_colors.register()
     intensity.register()
     combine_layers.register()
     lerp_colors_by_layer.register()
@@ -44,10 +70,23 @@ def unregister():
     vertex_color_preview.unregister()
     set_color_to_selection.unregister()
     bake_ao.unregister()
+    disk_ao.unregister()
+    thickness.unregister()
+    light_bake.unregister()
+    color_bleed.unregister()
+    proximity_mask.unregister()
     directional_shade.unregister()
+    sh_relight.unregister()
     dot_shade.unregister()
+    curvature.unregister()
+    geodesic.unregister()
+    procedural_noise.unregister()
     density_weighted.unregister()
+    proxy_bake.unregister()
+    color_transfer.unregister()
     blur.unregister()
+    morphology.unregister()
+    mirror_colors.unregister()
     intensity.unregister()
     combine_layers.unregister()
     lerp_colors_by_layer.unregister()
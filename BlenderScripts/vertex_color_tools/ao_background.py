@@ -0,0 +1,91 @@
+# ao_background.py
+import os
+import queue
+import shutil
+import subprocess
+import tempfile
+import threading
+import numpy as np
+from . import ao_worker
+
+WORKER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "ao_worker.py")
+
+
+def _pump(stream, lines):
+    """Reader thread: forward the worker's protocol lines, then None at end of stream."""
+    for line in stream:
+        if line.startswith(ao_worker.PREFIX + " "):
+            lines.put(line[len(ao_worker.PREFIX) + 1:].strip())
+    lines.put(None)
+
+
+class BackgroundBake:
+    """One object's AO bake in a background Blender, fed and read back through temp files.
+
+    Call start() once, then poll() from a timer; it never blocks. state is one of
+    'PENDING', 'RUNNING', 'DONE' or 'FAILED'.
+    """
+
+    def __init__(self, name, arrays):
+        self.name = name
+        self.arrays = arrays
+        self.state = 'PENDING'
+        self.progress = (0, 0)
+        self.error = ""
+        self.result = None
+        self._dir = None
+        self._process = None
+        self._lines = queue.Queue()
+
+    def start(self, blender_binary):
+        self._dir = tempfile.mkdtemp(prefix="vct_ao_")
+        job_path = os.path.join(self._dir, "job.npz")
+        self._result_path = os.path.join(self._dir, "result.npy")
+        np.savez(job_path, **self.arrays)
+        self.arrays = None
+
+        self._process = subprocess.Popen(
+            [blender_binary, "-b", "--factory-startup", "--python", WORKER_SCRIPT,
+             "--", job_path, self._result_path],
+            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, stdin=subprocess.DEVNULL,
+            text=True, bufsize=1)
+        threading.Thread(target=_pump, args=(self._process.stdout, self._lines), daemon=True).start()
+        self.state = 'RUNNING'
+
+    def poll(self):
+        while self.state == 'RUNNING':
+            try:
+                line = self._lines.get_nowait()
+            except queue.Empty:
+                break
+            if line is None:
+                self._finish()
+            elif line.startswith("PROGRESS"):
+                done, total = line.split()[1:3]
+                self.progress = (int(done), int(total))
+            elif line.startswith("ERROR"):
+                self.error = line[len("ERROR"):].strip()
+        return self.state
+
+    def _finish(self):
+        self._process.wait()
+        if os.path.exists(self._result_path):
+            self.result = np.load(self._result_path)
+            self.state = 'DONE'
+        else:
+            self.error = self.error or f"worker exited with code {self._process.returncode}"
+            self.state = 'FAILED'
+        self.cleanup()
+
+    def cancel(self):
+        if self._process is not None and self._process.poll() is None:
+            self._process.terminate()
+            self._process.wait()
+        self.state = 'FAILED'
+        self.error = "cancelled"
+        self.cleanup()
+
+    def cleanup(self):
+        if self._dir is not None:
+            shutil.rmtree(self._dir, ignore_errors=True)
+            self._dir = None
@@ -0,0 +1,90 @@
+# ao_cache.py
+import hashlib
+import os
+import tempfile
+import zipfile
+import numpy as np
+
+DEFAULT_DIR_NAME = "vertex_color_tools_ao_cache"
+SUFFIX = ".npz"
+
+
+# Keys
+def bake_key(coords, triangles, modifiers, settings):
+    """Hex digest over the evaluated geometry, the modifier stack and the bake settings.
+
+    modifiers and settings are any repr-stable sequences, e.g. tuples of names and numbers.
+    """
+    digest = hashlib.blake2b(digest_size=20)
+    for array in (coords, triangles):
+        array = np.ascontiguousarray(array)
+        digest.update(repr((array.dtype.str, array.shape)).encode())
+        digest.update(array.tobytes())
+    digest.update(repr(tuple(modifiers)).encode())
+    digest.update(repr(tuple(settings)).encode())
+    return digest.hexdigest()
+
+
+# Storage
+def resolve_dir(cache_dir):
+    return cache_dir or os.path.join(tempfile.gettempdir(), DEFAULT_DIR_NAME)
+
+
+def _entry_path(cache_dir, key):
+    return os.path.join(resolve_dir(cache_dir), key + SUFFIX)
+
+
+def load(cache_dir, key, count):
+    """Cached colors (count, 4) or None; a hit refreshes the entry's LRU time."""
+    path = _entry_path(cache_dir, key)
+    try:
+        with np.load(path) as data:
+            colors = data["colors"]
+    except (OSError, KeyError, ValueError, zipfile.BadZipFile):
+        return None
+    if colors.shape != (count, 4):
+        return None
+    os.utime(path)
+    return colors
+
+
+def store(cache_dir, key, colors, max_bytes):
+    directory = resolve_dir(cache_dir)
+    os.makedirs(directory, exist_ok=True)
+    path = _entry_path(cache_dir, key)
+    # Write to a temp name first so a concurrent reader never sees half a file
+    partial = path + ".partial"
+    with open(partial, "wb") as f:
+        np.savez_compressed(f, colors=np.asarray(colors, dtype=np.float32))
+    os.replace(partial, path)
+    evict(cache_dir, max_bytes)
+
+
+def _entries(cache_dir):
+    directory = resolve_dir(cache_dir)
+    if not os.path.isdir(directory):
+        return []
+    entries = []
+    for name in os.listdir(directory):
+        if name.endswith(SUFFIX):
+            stat = os.stat(os.path.join(directory, name))
+            entries.append((stat.st_mtime, stat.st_size, os.path.join(directory, name)))
+    return entries
+
+
+def evict(cache_dir, max_bytes):
+    """Delete least recently used entries until the cache fits in max_bytes."""
+    entries = sorted(_entries(cache_dir))
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in entries:
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            continue
+        total -= size
+
+
+def clear(cache_dir):
+    evict(cache_dir, 0)
@@ -0,0 +1,141 @@
+# ao_engine.py
+import numpy as np
+from . import chunked_executor
+from . import ray_engine
+
+# Rays per chunk task, keeps memory per thread bounded whatever the sample count
+RAYS_PER_TASK = 65536
+# Normal quantile for the adaptive confidence interval (95 %)
+CONFIDENCE_Z = 1.96
+
+
+# Core logic
+
+def visibility_pass(bvh, coords, normals, samples, max_distance, seed, bias=0.001):
+    """Unoccluded cosine-weighted rays per vertex out of `samples` (rounded to a square).
+
+    Returns (visible counts (N,), rays per vertex). Runs on one thread: the rays are a
+    Python loop over BVHTree.ray_cast that holds the GIL, so a thread pool would not
+    speed it up. Parallel bakes go through separate processes (ao_background).
+    """
+    per_vertex = rays_per_vertex(samples)
+    chunk_size = max(1, RAYS_PER_TASK // per_vertex)
+
+    def trace_chunk(start, stop):
+        rng = np.random.default_rng((seed, start))
+        no = normals[start:stop]
+        u, v = ray_engine.stratified_uv(rng, len(no), per_vertex)
+        dirs = ray_engine.cosine_hemisphere(no, u, v).reshape(-1, 3)
+        origins = np.repeat(coords[start:stop] + no * bias, per_vertex, axis=0)
+        hits = ray_engine.ray_hits(bvh, origins, dirs, np.full(len(dirs), max_distance))
+        return per_vertex - hits.reshape(len(no), per_vertex).sum(axis=1)
+
+    parts = chunked_executor.map_chunks(trace_chunk, len(coords), chunk_size, workers=1)
+    visible = np.concatenate(parts) if parts else np.zeros(0)
+    return visible.astype(np.float64), per_vertex
+
+
+def hit_distance_pass(bvh, coords, normals, samples, max_distance, seed, bias=0.001):
+    """Sum of cosine-weighted ray hit distances per vertex, misses counted as max_distance.
+
+    Pass negated normals to probe the inside of the surface. Returns (sums (N,), rays per vertex).
+    """
+    per_vertex = rays_per_vertex(samples)
+    chunk_size = max(1, RAYS_PER_TASK // per_vertex)
+
+    def trace_chunk(start, stop):
+        rng = np.random.default_rng((seed, start))
+        no = normals[start:stop]
+        u, v = ray_engine.stratified_uv(rng, len(no), per_vertex)
+        dirs = ray_engine.cosine_hemisphere(no, u, v).reshape(-1, 3)
+        origins = np.repeat(coords[start:stop] + no * bias, per_vertex, axis=0)
+        _, _, _, distance = ray_engine.ray_cast_batch(bvh, origins, dirs, np.full(len(dirs), max_distance))
+        return np.minimum(distance, max_distance).reshape(len(no), per_vertex).sum(axis=1)
+
+    parts = chunked_executor.map_chunks(trace_chunk, len(coords), chunk_size, workers=1)
+    return (np.concatenate(parts) if parts else np.zeros(0)), per_vertex
+
+
+def rays_per_vertex(samples):
+    return max(1, int(round(np.sqrt(samples)))) ** 2
+
+
+def confidence_half_width(visible, rays, z=CONFIDENCE_Z):
+    """Half width of the Wilson score interval of each visibility estimate.
+
+    Unlike the plug-in variance p(1 - p), it does not collapse to zero when every
+    ray of a batch agrees: an all-visible vertex keeps a width of about
+    z^2 / (2 (n + z^2)) and is refined until enough rays back it up.
+    """
+    n = np.maximum(rays, 1.0)
+    p = visible / n
+    z2 = z * z
+    return z * np.sqrt(p * (1.0 - p) / n + z2 / (4.0 * n * n)) / (1.0 + z2 / n)
+
+
+class RaycastAO:
+    """Progressive ray-traced AO: every run_pass adds samples, result() is the running mean.
+
+    refine() is the adaptive variant: after one pass over every vertex, further
+    batches only go to vertices whose confidence interval is wider than the tolerance.
+    """
+
+    def __init__(self, bvh, coords, normals, max_distance, bias=0.001, seed=0):
+        self.bvh = bvh
+        self.coords = np.asarray(coords, dtype=np.float64)
+        self.normals = np.asarray(normals, dtype=np.float64)
+        self.max_distance = max_distance
+        self.bias = bias
+        self.seed = seed
+        self.visible = np.zeros(len(self.coords))
+        self.rays = np.zeros(len(self.coords))
+        self.passes = 0
+        self.total_rays = 0
+        self.uncertain = len(self.coords)
+
+    def run_pass(self, samples, vertices=None):
+        """Trace `samples` rays for every vertex, or only for the given vertex indices."""
+        coords, normals = self.coords, self.normals
+        if vertices is not None:
+            coords, normals = coords[vertices], normals[vertices]
+        visible, per_vertex = visibility_pass(self.bvh, coords, normals, samples,
+                                              self.max_distance, self.seed + self.passes,
+                                              self.bias)
+        if vertices is None:
+            self.visible += visible
+            self.rays += per_vertex
+        else:
+            self.visible[vertices] += visible
+            self.rays[vertices] += per_vertex
+        self.total_rays += per_vertex * len(coords)
+        self.passes += 1
+
+    def refine(self, samples, tolerance, budget):
+        """One adaptive pass; returns True once every vertex is within tolerance or the budget is spent."""
+        if self.passes == 0:
+            # The first pass covers every vertex, so it must fit in the budget too
+            affordable = budget // max(len(self.coords), 1)
+            first = min(rays_per_vertex(samples), int(np.sqrt(max(affordable, 1))) ** 2)
+            self.run_pass(first)
+        else:
+            half_width = confidence_half_width(self.visible, self.rays)
+            vertices = np.nonzero(half_width > tolerance)[0]
+            affordable = (budget - self.total_rays) // rays_per_vertex(samples)
+            if len(vertices) > affordable:
+                # Spend what is left on the widest intervals
+                vertices = vertices[np.argsort(-half_width[vertices], kind='stable')[:max(affordable, 0)]]
+            if len(vertices):
+                self.run_pass(samples, np.sort(vertices))
+
+        self.uncertain = int(np.count_nonzero(confidence_half_width(self.visible, self.rays) > tolerance))
+        return self.uncertain == 0 or self.total_rays + rays_per_vertex(samples) > budget
+
+    def step(self, samples, passes, tolerance=None, budget=None):
+        """One progressive step, fixed or (with a tolerance) adaptive; True when the bake is complete."""
+        if tolerance is None:
+            self.run_pass(samples)
+            return self.passes >= passes
+        return self.refine(samples, tolerance, budget)
+
+    def result(self):
+        return self.visible / np.maximum(self.rays, 1.0)
@@ -0,0 +1,29 @@
+# chunked_executor.py
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+DEFAULT_CHUNK_SIZE = 4096
+
+
+def chunk_ranges(count, chunk_size=DEFAULT_CHUNK_SIZE):
+    return [(start, min(start + chunk_size, count)) for start in range(0, count, chunk_size)]
+
+
+def resolve_workers(workers=0):
+    return workers if workers > 0 else (os.cpu_count() or 1)
+
+
+def map_chunks(func, count, chunk_size=DEFAULT_CHUNK_SIZE, workers=0):
+    """Call func(start, stop) for consecutive chunks of range(count) on a thread pool.
+
+    Results come back in chunk order. Threads only help chunks dominated by large
+    NumPy operations, which release the GIL. Per-ray Python loops such as
+    ray_engine.ray_hits hold the GIL and run no faster than with workers=1.
+    """
+    ranges = chunk_ranges(count, chunk_size)
+    workers = min(resolve_workers(workers), len(ranges))
+    if workers <= 1:
+        return [func(start, stop) for start, stop in ranges]
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(lambda r: func(*r), ranges))
@@ -0,0 +1,237 @@
+# color_bleed.py
+import bpy
+import numpy as np
+from bpy.props import StringProperty, IntProperty, FloatProperty, FloatVectorProperty, PointerProperty
+from . import config
+from . import chunked_executor
+from . import mesh_arrays
+from . import progressive
+from . import ray_engine
+
+# Core logic
+
+def triangle_corner_colors(mesh, color_layer):
+    """Albedo at the three corners of every loop triangle, (T, 3, 3)."""
+    colors = mesh_arrays.read_colors(color_layer)[:, :3]
+    mesh.calc_loop_triangles()
+    if color_layer.domain == 'CORNER':
+        corners = np.empty(len(mesh.loop_triangles) * 3, dtype=np.int32)
+        mesh.loop_triangles.foreach_get("loops", corners)
+    else:
+        corners = mesh_arrays.read_triangles(mesh).ravel()
+    return colors[corners].reshape(-1, 3, 3).astype(np.float64)
+
+
+def bounce_pass(bvh, coords, normals, tris, corner_colors, samples, sky, seed, bias=0.001):
+    """Sum of incoming bounce color over `samples` cosine-weighted rays per vertex, (N, 3).
+
+    Every hit returns the barycentrically interpolated albedo of the hit triangle,
+    misses return the sky color. Runs on one thread: the rays are a Python loop over
+    BVHTree.ray_cast that holds the GIL, so a thread pool would not speed it up.
+    """
+
+    def trace_chunk(start, stop):
+        rng = np.random.default_rng((seed, start))
+        no = normals[start:stop]
+        u, v = ray_engine.stratified_uv(rng, len(no), samples)
+        dirs = ray_engine.cosine_hemisphere(no, u, v)
+        per_vertex = dirs.shape[1]
+
+        origins = np.repeat(coords[start:stop] + no * bias, per_vertex, axis=0)
+        dirs = dirs.reshape(-1, 3)
+        hit, index, location, _ = ray_engine.ray_cast_batch(
+            bvh, origins, dirs, np.full(len(dirs), ray_engine.MAX_DISTANCE))
+
+        gathered = np.broadcast_to(np.asarray(sky, dtype=np.float64), dirs.shape).copy()
+        if hit.any():
+            tri = index[hit]
+            corners = coords[tris[tri]]
+            weights = ray_engine.barycentric(location[hit], corners[:, 0], corners[:, 1], corners[:, 2])
+            gathered[hit] = np.einsum('nk,nkc->nc', weights, corner_colors[tri])
+        return gathered.reshape(len(no), per_vertex, 3).sum(axis=1), per_vertex
+
+    parts = chunked_executor.map_chunks(trace_chunk, len(coords), chunk_size=1024, workers=1)
+    if not parts:
+        return np.zeros((0, 3)), 0
+    return np.concatenate([p[0] for p in parts]), parts[0][1]
+
+
+# Operator
+
+class COLOR_BLEED_OT_bake(progressive.ProgressiveBakeMixin, bpy.types.Operator):
+    bl_idname = "object.color_bleed_bake"
+    bl_label = "Bake Color Bleeding"
+    bl_description = "Bake one bounce of colored light from an albedo layer into a new layer (ESC stops early)"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    def start(self, context):
+        obj = context.object
+        if obj is None or obj.type != 'MESH':
+            self.report({'ERROR'}, "Select a mesh object")
+            return False
+
+        settings = context.scene.color_bleed_settings
+        self.layer_name = settings.layer_name.strip()
+        if not self.layer_name:
+            self.report({'ERROR'}, "Result layer name cannot be empty")
+            return False
+
+        if obj.mode != 'OBJECT':
+            bpy.ops.object.mode_set(mode='OBJECT')
+
+        mesh = obj.data
+        albedo = mesh.color_attributes.get(settings.albedo_layer)
+        if albedo is None:
+            self.report({'ERROR'}, "Albedo layer not found")
+            return False
+
+        self.obj = obj
+        self.coords = mesh_arrays.read_vertex_coords(mesh).astype(np.float64)
+        self.normals = mesh_arrays.read_vertex_normals(mesh).astype(np.float64)
+        self.tris = mesh_arrays.read_triangles(mesh)
+        self.corner_colors = triangle_corner_colors(mesh, albedo)
+        self.bvh = ray_engine.build_bvh(self.coords, self.tris)
+
+        self.settings = settings
+        self.total = np.zeros((len(self.coords), 3))
+        self.rays = 0
+        self.passes_done = 0
+
+        if self.layer_name not in mesh.color_attributes:
+            mesh.color_attributes.new(name=self.layer_name, type='FLOAT_COLOR', domain='POINT')
+        return True
+
+    def run_pass(self, context):
+        s = self.settings
+        summed, rays = bounce_pass(self.bvh, self.coords, self.normals, self.tris, self.corner_colors,
+                                   s.rays_per_pass, tuple(s.sky_color), s.seed + self.passes_done,
+                                   s.bias)
+        self.total += summed
+        self.rays += rays
+        self.passes_done += 1
+        self.write_result()
+        return self.passes_done >= s.passes
+
+    def write_result(self):
+        mesh = self.obj.data
+        colors = np.ones((len(self.coords), 4), dtype=np.float32)
+        colors[:, :3] = np.clip(self.total / max(self.rays, 1) * self.settings.strength, 0.0, 1.0)
+        mesh_arrays.write_colors(mesh.color_attributes[self.layer_name], colors)
+        mesh.update()
+
+    def progress_text(self):
+        return f"Color bleeding: pass {self.passes_done}/{self.settings.passes}, {self.rays} rays per vertex"
+
+    def finish(self, context):
+        mesh = self.obj.data
+        mesh.color_attributes.active_color = mesh.color_attributes[self.layer_name]
+        self.report({'INFO'}, f"Color bleeding baked to '{self.layer_name}' with {self.rays} rays per vertex")
+
+
+# Panel
+
+class COLOR_BLEED_PT_panel(bpy.types.Panel):
+    bl_label = "Color Bleeding"
+    bl_idname = "COLOR_BLEED_PT_panel"
+    bl_parent_id = config.MAIN_PANEL_ID
+    bl_space_type = 'VIEW_3D'
+    bl_region_type = 'UI'
+    bl_category = config.BL_CATEGORY
+    bl_options = {'DEFAULT_CLOSED'}
+
+    @classmethod
+    def poll(cls, context):
+        obj = context.object
+        return obj and obj.type == 'MESH'
+
+    def draw(self, context):
+        layout = self.layout
+        settings = context.scene.color_bleed_settings
+
+        layout.prop_search(settings, "albedo_layer", context.object.data, "color_attributes", text="Albedo")
+        layout.prop(settings, "layer_name", icon='GROUP_VCOL')
+        layout.prop(settings, "sky_color")
+        layout.prop(settings, "strength")
+
+        col = layout.column(align=True)
+        col.prop(settings, "rays_per_pass")
+        col.prop(settings, "passes")
+        col.prop(settings, "seed")
+        col.prop(settings, "bias")
+        layout.operator(COLOR_BLEED_OT_bake.bl_idname, icon='LIGHT_HEMI')
+
+
+# Property Group
+
+class ColorBleedSettings(bpy.types.PropertyGroup):
+    albedo_layer: StringProperty(
+        name="Albedo Layer",
+        description="Painted base colors that bounce onto neighbouring surfaces"
+    )
+    layer_name: StringProperty(
+        name="Result Layer",
+        default="Bounce",
+        description="Name of the vertex color layer to write irradiance into"
+    )
+    sky_color: FloatVectorProperty(
+        name="Sky",
+        subtype='COLOR',
+        size=3,
+        min=0.0,
+        max=1.0,
+        default=(0.0, 0.0, 0.0),
+        description="Color returned by rays that escape"
+    )
+    strength: FloatProperty(
+        name="Strength",
+        description="Multiplier on the gathered light",
+        default=1.0,
+        min=0.0,
+        max=20.0
+    )
+    rays_per_pass: IntProperty(
+        name="Rays per Pass",
+        description="Stratified hemisphere rays per vertex in every pass (rounded to a square)",
+        default=16,
+        min=1,
+        max=256
+    )
+    passes: IntProperty(
+        name="Passes",
+        description="Progressive passes, the result is updated after each one",
+        default=8,
+        min=1,
+        max=256
+    )
+    seed: IntProperty(
+        name="Seed",
+        default=0,
+        min=0
+    )
+    bias: FloatProperty(
+        name="Normal Offset",
+        description="Distance rays start above the surface",
+        default=0.001,
+        min=0.0,
+        max=1.0,
+        precision=4
+    )
+
+
+# Registration
+
+classes = (
+    ColorBleedSettings,
+    COLOR_BLEED_OT_bake,
+    COLOR_BLEED_PT_panel,
+)
+
+def register():
+    for cls in classes:
+        bpy.utils.register_class(cls)
+    bpy.types.Scene.color_bleed_settings = PointerProperty(type=ColorBleedSettings)
+
+def unregister():
+    for cls in reversed(classes):
+        bpy.utils.unregister_class(cls)
+    del bpy.types.Scene.color_bleed_settings
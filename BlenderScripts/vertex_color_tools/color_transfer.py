@@ -0,0 +1,153 @@
+# color_transfer.py
+import bpy
+import numpy as np
+from bpy.props import StringProperty, PointerProperty
+from . import config
+from . import mesh_arrays
+from . import ray_engine
+from . import surface_transfer
+
+# Core logic
+
+def vertex_colors(mesh, color_layer):
+    """Per-vertex colors (N, 4); corner layers are averaged over each vertex's corners."""
+    colors = mesh_arrays.read_colors(color_layer)
+    if color_layer.domain == 'POINT':
+        return colors
+    loop_verts = mesh_arrays.read_loop_vertices(mesh)
+    count = len(mesh.vertices)
+    summed = np.column_stack([np.bincount(loop_verts, colors[:, c], minlength=count) for c in range(4)])
+    corners = np.bincount(loop_verts, minlength=count)
+    return (summed / np.maximum(corners, 1)[:, None]).astype(np.float32)
+
+
+def target_in_source_space(source, target):
+    """Target vertex coordinates expressed in the source object's local space."""
+    matrix = source.matrix_world.inverted() @ target.matrix_world
+    coords = mesh_arrays.read_vertex_coords(target.data).astype(np.float64)
+    return ray_engine.transform_points(matrix, coords)
+
+
+# Operator
+
+class COLOR_TRANSFER_OT_apply(bpy.types.Operator):
+    bl_idname = "object.vertex_color_transfer"
+    bl_label = "Transfer Vertex Colors"
+    bl_description = ("Transfer a color layer from the active mesh to every other selected mesh "
+                      "through the nearest point on the active mesh's surface")
+    bl_options = {'REGISTER', 'UNDO'}
+
+    def execute(self, context):
+        source = context.object
+        if source is None or source.type != 'MESH':
+            self.report({'ERROR'}, "Make the source mesh the active object")
+            return {'CANCELLED'}
+
+        targets = [o for o in context.selected_objects if o.type == 'MESH' and o is not source]
+        if not targets:
+            self.report({'ERROR'}, "Select the target meshes as well as the active source")
+            return {'CANCELLED'}
+
+        settings = context.scene.color_transfer_settings
+        source_layer = source.data.color_attributes.get(settings.source_layer)
+        if source_layer is None:
+            self.report({'ERROR'}, "Source layer not found")
+            return {'CANCELLED'}
+        layer_name = settings.target_layer.strip() or source_layer.name
+
+        if context.mode != 'OBJECT':
+            bpy.ops.object.mode_set(mode='OBJECT')
+
+        for target in targets:
+            color_layer = target.data.color_attributes.get(layer_name)
+            if color_layer is not None and color_layer.domain != 'POINT':
+                self.report({'ERROR'}, "Only POINT domain vertex colors supported.")
+                return {'CANCELLED'}
+
+        source_mesh = source.data
+        source_coords = mesh_arrays.read_vertex_coords(source_mesh).astype(np.float64)
+        source_tris = mesh_arrays.read_triangles(source_mesh)
+        if len(source_tris) == 0:
+            self.report({'ERROR'}, "Source mesh has no faces")
+            return {'CANCELLED'}
+        colors = vertex_colors(source_mesh, source_layer)
+
+        for target in targets:
+            mapping = surface_transfer.get_mapping(
+                (source.name_full, target.name_full), source_coords, source_tris,
+                target_in_source_space(source, target))
+
+            mesh = target.data
+            color_layer = mesh.color_attributes.get(layer_name)
+            if color_layer is None:
+                color_layer = mesh.color_attributes.new(name=layer_name, type=source_layer.data_type,
+                                                        domain='POINT')
+            mesh_arrays.write_colors(color_layer, mapping.transfer(colors))
+            mesh.color_attributes.active_color = mesh.color_attributes[layer_name]
+            mesh.update()
+
+        self.report({'INFO'}, f"Transferred '{source_layer.name}' to '{layer_name}' on {len(targets)} meshes")
+        return {'FINISHED'}
+
+
+# Panel
+
+class COLOR_TRANSFER_PT_panel(bpy.types.Panel):
+    bl_label = "Transfer Colors"
+    bl_idname = "COLOR_TRANSFER_PT_panel"
+    bl_parent_id = config.MAIN_PANEL_ID
+    bl_space_type = 'VIEW_3D'
+    bl_region_type = 'UI'
+    bl_category = config.BL_CATEGORY
+    bl_options = {'DEFAULT_CLOSED'}
+
+    @classmethod
+    def poll(cls, context):
+        obj = context.object
+        return obj and obj.type == 'MESH'
+
+    def draw(self, context):
+        layout = self.layout
+        settings = context.scene.color_transfer_settings
+
+        layout.prop_search(settings, "source_layer", context.object.data, "color_attributes", text="Source")
+        layout.prop(settings, "target_layer", icon='GROUP_VCOL')
+        layout.operator(COLOR_TRANSFER_OT_apply.bl_idname, icon='PASTEDOWN')
+
+        row = layout.row()
+        row.label(text=f"Cache: {surface_transfer.mapping_cache_nbytes() / (1024 * 1024):.1f} MB")
+        row.operator("object.clear_surface_transfer_cache", text="", icon='TRASH')
+
+
+# Property Group
+
+class ColorTransferSettings(bpy.types.PropertyGroup):
+    source_layer: StringProperty(
+        name="Source Layer",
+        description="Color layer on the active mesh to transfer"
+    )
+    target_layer: StringProperty(
+        name="Target Layer",
+        description="Layer to write on the selected meshes (empty = same name as the source)",
+        default=""
+    )
+
+
+# Registration
+
+classes = (
+    ColorTransferSettings,
+    COLOR_TRANSFER_OT_apply,
+    COLOR_TRANSFER_PT_panel,
+)
+
+def register():
+    for cls in classes:
+        bpy.utils.register_class(cls)
+    bpy.types.Scene.color_transfer_settings = PointerProperty(type=ColorTransferSettings)
+
+def unregister():
+    for cls in reversed(classes):
+        bpy.utils.unregister_class(cls)
+    del bpy.types.Scene.color_transfer_settings
+    surface_transfer.clear_mapping_cache()
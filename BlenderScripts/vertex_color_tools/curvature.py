@@ -0,0 +1,269 @@
+# curvature.py
+import math
+import bpy
+import numpy as np
+from bpy.props import EnumProperty, IntProperty, FloatProperty, StringProperty, PointerProperty
+from . import config
+from . import mesh_arrays
+
+# Core logic
+
+def corner_cotangents(coords, tris):
+    """Cotangent and angle at every triangle corner, plus triangle areas."""
+    p = coords[tris]  # (T, 3 corners, 3)
+    cot = np.empty(tris.shape, dtype=np.float64)
+    angle = np.empty(tris.shape, dtype=np.float64)
+    area = None
+    for c in range(3):
+        e1 = p[:, (c + 1) % 3] - p[:, c]
+        e2 = p[:, (c + 2) % 3] - p[:, c]
+        dot = np.sum(e1 * e2, axis=1)
+        cross = np.linalg.norm(np.cross(e1, e2), axis=1)
+        cot[:, c] = dot / np.maximum(cross, 1e-20)
+        angle[:, c] = np.arctan2(cross, dot)
+        if area is None:
+            area = 0.5 * cross
+    return cot, angle, area
+
+
+def vertex_areas(tris, tri_area, count):
+    """Barycentric area: one third of every adjacent triangle."""
+    return np.bincount(tris.ravel(), np.repeat(tri_area / 3.0, 3), minlength=count)
+
+
+def boundary_vertices(tris, count):
+    edges = np.sort(np.concatenate((tris[:, [0, 1]], tris[:, [1, 2]], tris[:, [2, 0]])), axis=1)
+    # One int64 key per edge; a 1-D unique is far cheaper than unique over rows
+    keys = edges[:, 0].astype(np.int64) * count + edges[:, 1]
+    unique, uses = np.unique(keys, return_counts=True)
+    on_boundary = np.zeros(count, dtype=bool)
+    boundary = unique[uses == 1]
+    on_boundary[boundary // count] = True
+    on_boundary[boundary % count] = True
+    return on_boundary
+
+
+def cotangent_laplacian(coords, tris, cot, areas):
+    """Cotangent Laplace-Beltrami of the positions, (1 / 2A) * sum (cot a + cot b)(x_j - x_i)."""
+    count = len(coords)
+    lap = np.zeros((count, 3), dtype=np.float64)
+    for c in range(3):
+        # The corner's cotangent weights the opposite edge (u, v)
+        u, v = tris[:, (c + 1) % 3], tris[:, (c + 2) % 3]
+        diff = (coords[v] - coords[u]) * cot[:, c, None]
+        for k in range(3):
+            lap[:, k] += np.bincount(u, diff[:, k], minlength=count)
+            lap[:, k] -= np.bincount(v, diff[:, k], minlength=count)
+    return lap / (2.0 * np.maximum(areas, 1e-20))[:, None]
+
+
+def mean_and_gaussian_curvature(coords, tris, normals):
+    """Signed mean curvature (convex > 0) and Gaussian curvature from angle defects."""
+    count = len(coords)
+    cot, angle, tri_area = corner_cotangents(coords, tris)
+    areas = vertex_areas(tris, tri_area, count)
+
+    lap = cotangent_laplacian(coords, tris, cot, areas)
+    mean = -0.5 * np.sum(lap * normals, axis=1)
+
+    angle_sum = np.bincount(tris.ravel(), angle.ravel(), minlength=count)
+    full_turn = np.where(boundary_vertices(tris, count), math.pi, 2.0 * math.pi)
+    gaussian = (full_turn - angle_sum) / np.maximum(areas, 1e-20)
+
+    unused = areas <= 0.0
+    mean[unused] = 0.0
+    gaussian[unused] = 0.0
+    return mean, gaussian
+
+
+def cavity(coords, normals, indptr, indices, scale=1):
+    """Height above the neighborhood average along the normal (crevices < 0)."""
+    smoothed = mesh_arrays.smooth_over_adjacency(coords, indptr, indices, scale)
+    return np.sum((coords - smoothed) * normals, axis=1)
+
+
+def normalize_signed(values, percentile=98.0):
+    """Map signed values to [0, 1] with zero at 0.5, scaled by a robust percentile."""
+    ref = np.percentile(np.abs(values), percentile) if len(values) else 0.0
+    if ref <= 0.0:
+        return np.full(len(values), 0.5)
+    return np.clip(0.5 + 0.5 * values / ref, 0.0, 1.0)
+
+
+def compute_measures(mesh, measures, scale=1, smooth_iterations=0, percentile=98.0):
+    """Normalized curvature measures for a mesh: dict name -> (N,) values in [0, 1]."""
+    coords = mesh_arrays.read_vertex_coords(mesh).astype(np.float64)
+    normals = mesh_arrays.read_vertex_normals(mesh).astype(np.float64)
+    indptr, indices = mesh_arrays.vertex_adjacency(mesh, include_self=True)
+
+    raw = {}
+    if measures & {'MEAN', 'GAUSSIAN'}:
+        tris = mesh_arrays.read_triangles(mesh)
+        mean, gaussian = mean_and_gaussian_curvature(coords, tris, normals)
+        raw['MEAN'] = mean
+        raw['GAUSSIAN'] = gaussian
+    if 'CAVITY' in measures:
+        raw['CAVITY'] = cavity(coords, normals, indptr, indices, scale)
+
+    result = {}
+    for name in measures:
+        values = raw[name]
+        if smooth_iterations:
+            values = mesh_arrays.smooth_over_adjacency(values, indptr, indices, smooth_iterations)
+        result[name] = normalize_signed(values, percentile)
+    return result
+
+
+# Operator
+
+MEASURE_ORDER = ('MEAN', 'GAUSSIAN', 'CAVITY')
+
+class CURVATURE_OT_apply(bpy.types.Operator):
+    bl_idname = "object.vertex_curvature"
+    bl_label = "Apply Curvature"
+    bl_description = "Write mean curvature, Gaussian curvature and cavity to vertex colors"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    def execute(self, context):
+        obj = context.object
+        if obj is None or obj.type != 'MESH':
+            self.report({'ERROR'}, "Select a mesh object.")
+            return {'CANCELLED'}
+
+        props = context.scene.curvature_props
+        layer_name = props.layer_name.strip()
+        if not layer_name:
+            self.report({'ERROR'}, "Layer name is empty.")
+            return {'CANCELLED'}
+        if not props.measures:
+            self.report({'ERROR'}, "Select at least one measure.")
+            return {'CANCELLED'}
+
+        if obj.mode != 'OBJECT':
+            bpy.ops.object.mode_set(mode='OBJECT')
+
+        mesh = obj.data
+        values = compute_measures(mesh, set(props.measures), props.cavity_scale,
+                                  props.smooth_iterations, props.percentile)
+
+        def layer(name):
+            if name not in mesh.color_attributes:
+                mesh.color_attributes.new(name=name, type='FLOAT_COLOR', domain='POINT')
+            return mesh.color_attributes[name]
+
+        if props.output == 'CHANNELS':
+            # R = mean, G = Gaussian, B = cavity
+            colors = np.zeros((len(mesh.vertices), 4), dtype=np.float32)
+            colors[:, 3] = 1.0
+            for channel, name in enumerate(MEASURE_ORDER):
+                if name in values:
+                    colors[:, channel] = values[name]
+            written = [layer_name]
+            mesh_arrays.write_colors(layer(layer_name), colors)
+        else:
+            written = []
+            for name in MEASURE_ORDER:
+                if name in values:
+                    full_name = f"{layer_name}_{name.title()}"
+                    mesh_arrays.write_colors(layer(full_name), mesh_arrays.gray_to_rgba(values[name]))
+                    written.append(full_name)
+
+        mesh.color_attributes.active_color = mesh.color_attributes[written[0]]
+        mesh.update()
+
+        self.report({'INFO'}, f"Curvature written to {', '.join(repr(n) for n in written)}")
+        return {'FINISHED'}
+
+
+# Panel
+
+class CURVATURE_PT_panel(bpy.types.Panel):
+    bl_label = "Curvature / Cavity"
+    bl_idname = "CURVATURE_PT_panel"
+    bl_parent_id = config.MAIN_PANEL_ID
+    bl_space_type = 'VIEW_3D'
+    bl_region_type = 'UI'
+    bl_category = config.BL_CATEGORY
+    bl_options = {'DEFAULT_CLOSED'}
+
+    def draw(self, context):
+        layout = self.layout
+        props = context.scene.curvature_props
+
+        layout.prop(props, "layer_name", icon='GROUP_VCOL')
+        layout.prop(props, "measures")
+        layout.prop(props, "output", expand=True)
+        col = layout.column(align=True)
+        col.prop(props, "cavity_scale")
+        col.prop(props, "smooth_iterations")
+        col.prop(props, "percentile", slider=True)
+        layout.operator(CURVATURE_OT_apply.bl_idname, icon='SPHERECURVE')
+
+
+# Properties
+
+class CurvatureProps(bpy.types.PropertyGroup):
+    layer_name: StringProperty(
+        name="Layer",
+        default="Curvature",
+        description="Layer name, or prefix when every measure gets its own layer"
+    )
+    measures: EnumProperty(
+        name="Measures",
+        description="Which measures to compute",
+        items=[
+            ('MEAN', "Mean", "Mean curvature from the cotangent Laplacian, convex is bright"),
+            ('GAUSSIAN', "Gaussian", "Gaussian curvature from angle defects, saddles are dark"),
+            ('CAVITY', "Cavity", "Height above the smoothed surface, crevices are dark"),
+        ],
+        options={'ENUM_FLAG'},
+        default={'MEAN', 'GAUSSIAN', 'CAVITY'}
+    )
+    output: EnumProperty(
+        name="Output",
+        items=[
+            ('LAYERS', "Layers", "One layer per measure, named <Layer>_<Measure>"),
+            ('CHANNELS', "Channels", "R = mean, G = Gaussian, B = cavity in one layer"),
+        ],
+        default='LAYERS'
+    )
+    cavity_scale: IntProperty(
+        name="Cavity Scale",
+        description="Smoothing rings for the reference surface, larger finds broader cavities",
+        default=4,
+        min=1,
+        max=200
+    )
+    smooth_iterations: IntProperty(
+        name="Smooth",
+        description="Smoothing passes over the result",
+        default=0,
+        min=0,
+        max=200
+    )
+    percentile: FloatProperty(
+        name="Contrast Percentile",
+        description="Absolute value percentile that maps to black / white",
+        default=98.0,
+        min=50.0,
+        max=100.0
+    )
+
+
+# Register
+
+classes = (
+    CurvatureProps,
+    CURVATURE_OT_apply,
+    CURVATURE_PT_panel,
+)
+
+def register():
+    for cls in classes:
+        bpy.utils.register_class(cls)
+    bpy.types.Scene.curvature_props = PointerProperty(type=CurvatureProps)
+
+def unregister():
+    for cls in reversed(classes):
+        bpy.utils.unregister_class(cls)
+    del bpy.types.Scene.curvature_props
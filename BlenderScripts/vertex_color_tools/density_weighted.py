@@ -1,10 +1,55 @@
 # density_weighted.py
 
 import bpy
-import bmesh
-import math
-from mathutils import kdtree
+import numpy as np
 from . import config
+from . import density_grid
+from . import mesh_arrays
+
+# Spatial index per mesh, reused while the vertex coordinates are unchanged.
+# Kept in least recently used order and capped at INDEX_CACHE_MESHES entries.
+_index_cache = {}
+INDEX_CACHE_MESHES = 8
+
+
+# Utility
+def get_density_index(mesh, coords):
+    fingerprint = density_grid.coords_fingerprint(coords)
+    index = _index_cache.pop(mesh.name_full, None)
+    if index is None or index.fingerprint != fingerprint:
+        index = density_grid.DensityIndex(coords, fingerprint)
+    _index_cache[mesh.name_full] = index
+    prune_index_cache()
+    return index
+
+
+def prune_index_cache():
+    """Drop indices of deleted or renamed meshes, then the least recently used beyond the cap."""
+    existing = {mesh.name_full for mesh in bpy.data.meshes}
+    for name in [name for name in _index_cache if name not in existing]:
+        del _index_cache[name]
+    while len(_index_cache) > INDEX_CACHE_MESHES:
+        del _index_cache[next(iter(_index_cache))]
+
+
+def forget_mesh(name_full):
+    _index_cache.pop(name_full, None)
+
+
+def index_cache_nbytes():
+    return sum(index.nbytes for index in _index_cache.values())
+
+
+def parse_radii(text):
+    return [float(part) for part in text.replace(';', ',').split(',') if part.strip()]
+
+
+def get_or_create_density_layer(mesh, name):
+    color_layer = mesh.color_attributes.get(name)
+    if not color_layer:
+        color_layer = mesh.color_attributes.new(name=name, type='FLOAT_COLOR', domain='POINT')
+    return color_layer
+
 
 # Operator
 class VERTEXDENSITY_OT_PaintDensityWeighted(bpy.types.Operator):
@@ -28,45 +73,74 @@ class VERTEXDENSITY_OT_PaintDensityWeighted(bpy.types.Operator):
             self.report({'ERROR'}, "Layer name is empty.")
             return {'CANCELLED'}
 
+        if scene.vdp_use_pyramid:
+            try:
+                radii = parse_radii(scene.vdp_radii)
+            except ValueError:
+                self.report({'ERROR'}, "Radii must be numbers separated by commas.")
+                return {'CANCELLED'}
+            if not radii or min(radii) <= 0.0:
+                self.report({'ERROR'}, "Enter at least one positive radius.")
+                return {'CANCELLED'}
+            if scene.vdp_pyramid_output == 'CHANNELS' and len(radii) > 3:
+                self.report({'ERROR'}, "At most 3 radii fit into the RGB channels.")
+                return {'CANCELLED'}
+        else:
+            radii = [radius]
+
         mesh = obj.data
 
-        # Create or get vertex color attribute (vertex domain)
-        color_layer = mesh.color_attributes.get(layer_name)
-        if not color_layer:
-            color_layer = mesh.color_attributes.new(name=layer_name, type='FLOAT_COLOR', domain='POINT')
-
-        mesh.color_attributes.active_color = color_layer
-
-        bm = bmesh.new()
-        bm.from_mesh(mesh)
-        bm.verts.ensure_lookup_table()
-
-        # Build KD-tree
-        size = len(bm.verts)
-        kd = kdtree.KDTree(size)
-        for i, v in enumerate(bm.verts):
-            kd.insert(v.co, i)
-        kd.balance()
-
-        # Compute weighted densities
-        densities = [0.0] * size
-        for i, v in enumerate(bm.verts):
-            neighbors = kd.find_range(v.co, radius)
-            weighted_density = 0.0
-            for (co, index, dist) in neighbors:
-                w = math.exp(- (dist / radius) ** 2)
-                weighted_density += w
-            weighted_density -= 1.0  # exclude self
-            densities[i] = min(weighted_density / max_density, 1.0)
+        # Bucket vertices into a grid with cell size == largest radius and evaluate neighbor cells in blocks.
+        # The index is cached per mesh, so only a changed radius triggers new neighbor work.
+        coords = mesh_arrays.read_vertex_coords(mesh)
+        index = get_density_index(mesh, coords)
+        tile_size = scene.vdp_tile_size if scene.vdp_use_tiles else None
+        weighted_density = index.densities(radii, tile_size, scene.vdp_workers)
+        weighted_density -= 1.0  # exclude self
+
+        if scene.vdp_normalize == 'PERCENTILE':
+            densities = np.column_stack([
+                density_grid.normalize_by_percentile(column, scene.vdp_percentile)
+                for column in weighted_density.T
+            ])
+        else:
+            densities = np.minimum(weighted_density / max_density, 1.0)
 
         # Write colors to vertex color attribute (vertex domain)
-        for i, dens in enumerate(densities):
-            color_layer.data[i].color = (dens, dens, dens, 1.0)
+        if not scene.vdp_use_pyramid:
+            color_layer = get_or_create_density_layer(mesh, layer_name)
+            mesh_arrays.write_colors(color_layer, mesh_arrays.gray_to_rgba(densities[:, 0]))
+            written = [layer_name]
+        elif scene.vdp_pyramid_output == 'CHANNELS':
+            color_layer = get_or_create_density_layer(mesh, layer_name)
+            colors = np.zeros((len(densities), 4), dtype=np.float32)
+            colors[:, :len(radii)] = densities
+            colors[:, 3] = 1.0
+            mesh_arrays.write_colors(color_layer, colors)
+            written = [layer_name]
+        else:
+            written = []
+            for k, r in enumerate(radii):
+                name = f"{layer_name}_{r:g}"
+                color_layer = get_or_create_density_layer(mesh, name)
+                mesh_arrays.write_colors(color_layer, mesh_arrays.gray_to_rgba(densities[:, k]))
+                written.append(name)
 
-        bm.free()
+        mesh.color_attributes.active_color = mesh.color_attributes[written[0]]
         mesh.update()
 
-        self.report({'INFO'}, f"Weighted vertex density painted to '{layer_name}'")
+        self.report({'INFO'}, f"Weighted vertex density painted to {', '.join(repr(n) for n in written)}")
+        return {'FINISHED'}
+
+
+class VERTEXDENSITY_OT_ClearIndexCache(bpy.types.Operator):
+    bl_idname = "object.clear_vertex_density_cache"
+    bl_label = "Clear Density Cache"
+    bl_description = "Free the cached spatial indices and neighbor lists"
+
+    def execute(self, context):
+        _index_cache.clear()
+        self.report({'INFO'}, "Density cache cleared")
         return {'FINISHED'}
 
 
@@ -84,15 +158,40 @@ class VERTEXDENSITY_PT_Panel(bpy.types.Panel):
         layout = self.layout
         scene = context.scene
 
-        layout.prop(scene, "vdp_radius", slider=True)
-        layout.prop(scene, "vdp_max_density", slider=True)
+        layout.prop(scene, "vdp_use_pyramid")
+        if scene.vdp_use_pyramid:
+            layout.prop(scene, "vdp_radii")
+            layout.prop(scene, "vdp_pyramid_output", expand=True)
+        else:
+            layout.prop(scene, "vdp_radius", slider=True)
+
+        layout.prop(scene, "vdp_normalize", expand=True)
+        if scene.vdp_normalize == 'PERCENTILE':
+            layout.prop(scene, "vdp_percentile", slider=True)
+        else:
+            layout.prop(scene, "vdp_max_density", slider=True)
         layout.prop(scene, "vdp_layer_name", text="Layer Name")
+
+        layout.prop(scene, "vdp_use_tiles")
+        if scene.vdp_use_tiles:
+            col = layout.column(align=True)
+            col.prop(scene, "vdp_tile_size")
+            if density_grid.PARALLEL_TILES:
+                col.prop(scene, "vdp_workers")
+            else:
+                col.label(text="Tiles run one at a time on this platform", icon='INFO')
+
         layout.operator("object.paint_vertex_density_weighted", icon='BRUSH_DATA', text="Apply Weighted Density")
 
+        row = layout.row()
+        row.label(text=f"Cache: {index_cache_nbytes() / (1024 * 1024):.1f} MB ({len(_index_cache)} meshes)")
+        row.operator("object.clear_vertex_density_cache", text="", icon='TRASH')
+
 
 # Register properties and classes
 def register():
     bpy.utils.register_class(VERTEXDENSITY_OT_PaintDensityWeighted)
+    bpy.utils.register_class(VERTEXDENSITY_OT_ClearIndexCache)
     bpy.utils.register_class(VERTEXDENSITY_PT_Panel)
 
     bpy.types.Scene.vdp_radius = bpy.props.FloatProperty(
@@ -121,11 +220,86 @@ def register():
         default="DensityColorWeighted"
     )
 
+    bpy.types.Scene.vdp_use_pyramid = bpy.props.BoolProperty(
+        name="Multiple Radii",
+        description="Compute density at several radii from a single neighbor search",
+        default=False
+    )
+
+    bpy.types.Scene.vdp_radii = bpy.props.StringProperty(
+        name="Radii",
+        description="Comma separated radii, e.g. fine, mid and broad scale",
+        default="0.05, 0.2, 0.5"
+    )
+
+    bpy.types.Scene.vdp_pyramid_output = bpy.props.EnumProperty(
+        name="Output",
+        description="Where to write the density of each radius",
+        items=[
+            ('LAYERS', "Layers", "One layer per radius, named <Layer>_<radius>"),
+            ('CHANNELS', "Channels", "One RGB channel per radius in a single layer (up to 3)"),
+        ],
+        default='LAYERS'
+    )
+
+    bpy.types.Scene.vdp_normalize = bpy.props.EnumProperty(
+        name="Normalize",
+        description="How densities are mapped to 0-1",
+        items=[
+            ('FIXED', "Max Density", "Divide by a fixed max density"),
+            ('PERCENTILE', "Percentile", "Map the given percentile of each radius to white"),
+        ],
+        default='FIXED'
+    )
+
+    bpy.types.Scene.vdp_percentile = bpy.props.FloatProperty(
+        name="Percentile",
+        description="Density percentile that maps to white",
+        min=50.0,
+        max=100.0,
+        default=98.0,
+        precision=1
+    )
+
+    bpy.types.Scene.vdp_use_tiles = bpy.props.BoolProperty(
+        name="Split Into Tiles",
+        description="Compute density tile by tile to bound memory on very large meshes, "
+                    "in parallel worker processes on Linux",
+        default=False
+    )
+
+    bpy.types.Scene.vdp_tile_size = bpy.props.FloatProperty(
+        name="Tile Size",
+        description="Edge length of one tile; each tile also reads a halo of one radius",
+        min=0.01,
+        max=1000.0,
+        default=2.0,
+        precision=2
+    )
+
+    bpy.types.Scene.vdp_workers = bpy.props.IntProperty(
+        name="Workers",
+        description="Number of worker processes, Linux only (0 = one per CPU core)",
+        min=0,
+        max=256,
+        default=0
+    )
+
 
 def unregister():
     bpy.utils.unregister_class(VERTEXDENSITY_OT_PaintDensityWeighted)
+    bpy.utils.unregister_class(VERTEXDENSITY_OT_ClearIndexCache)
     bpy.utils.unregister_class(VERTEXDENSITY_PT_Panel)
+    _index_cache.clear()
 
     del bpy.types.Scene.vdp_radius
     del bpy.types.Scene.vdp_max_density
     del bpy.types.Scene.vdp_layer_name
+    del bpy.types.Scene.vdp_use_pyramid
+    del bpy.types.Scene.vdp_radii
+    del bpy.types.Scene.vdp_pyramid_output
+    del bpy.types.Scene.vdp_normalize
+    del bpy.types.Scene.vdp_percentile
+    del bpy.types.Scene.vdp_use_tiles
+    del bpy.types.Scene.vdp_tile_size
+    del bpy.types.Scene.vdp_workers
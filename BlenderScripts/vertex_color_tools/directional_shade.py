@@ -1,10 +1,63 @@
 ﻿# directional_shade.py
 import bpy
-from bpy.props import StringProperty, FloatVectorProperty, BoolProperty, PointerProperty
+from bpy.props import (StringProperty, FloatVectorProperty, FloatProperty, BoolProperty,
+                       IntProperty, PointerProperty, CollectionProperty)
 from mathutils import Vector
+import numpy as np
 from . import config
+from . import mesh_arrays
+
+# Core logic
+def shade_rig(normals, directions, colors, intensities, wraps, falloffs):
+    """Sum of wrapped Lambert terms for K lights as one (N x 3) @ (3 x K) product.
+
+    directions: (K, 3) unit vectors, colors: (K, 3). Returns (N, 3) RGB in [0, 1].
+    """
+    cosines = normals @ directions.T
+    lit = np.clip((cosines + wraps) / (1.0 + wraps), 0.0, None) ** falloffs
+    return np.clip((lit * intensities) @ colors, 0.0, 1.0)
+
 
 # Properties
+class DirectionalShadeLight(bpy.types.PropertyGroup):
+    direction: FloatVectorProperty(
+        name="Direction",
+        description="Direction the light comes from",
+        default=(0.0, 0.0, 1.0),
+        subtype='DIRECTION',
+        size=3
+    )
+    color: FloatVectorProperty(
+        name="Color",
+        subtype='COLOR',
+        size=3,
+        min=0.0,
+        max=1.0,
+        default=(1.0, 1.0, 1.0)
+    )
+    intensity: FloatProperty(
+        name="Intensity",
+        description="Light strength",
+        default=1.0,
+        min=0.0,
+        max=10.0
+    )
+    wrap: FloatProperty(
+        name="Wrap",
+        description="How far the light wraps around the terminator (0 = Lambert, 1 = half-Lambert)",
+        default=0.0,
+        min=0.0,
+        max=1.0
+    )
+    falloff: FloatProperty(
+        name="Falloff",
+        description="Exponent applied to the wrapped term, higher values tighten the lit area",
+        default=1.0,
+        min=0.1,
+        max=8.0
+    )
+
+
 class DirectionalShadeProperties(bpy.types.PropertyGroup):
     result_name: StringProperty(
         name="Layer",
@@ -23,6 +76,17 @@ class DirectionalShadeProperties(bpy.types.PropertyGroup):
         description="Interpret the direction in world space",
         default=True
     )
+    use_split_normals: BoolProperty(
+        name="Use Split Normals",
+        description="Average the corner (split) normals per vertex instead of using vertex normals",
+        default=False
+    )
+    use_light_rig: BoolProperty(
+        name="Light Rig",
+        description="Shade with several colored lights in one pass instead of a single direction",
+        default=False
+    )
+    lights: CollectionProperty(type=DirectionalShadeLight)
 
 # Operators
 class DIRECTIONAL_SHADE_OT_apply(bpy.types.Operator):
@@ -32,6 +96,9 @@ class DIRECTIONAL_SHADE_OT_apply(bpy.types.Operator):
 
     def execute(self, context):
         obj = context.object
+        if obj is None or obj.type != 'MESH':
+            self.report({'ERROR'}, "Select a mesh object")
+            return {'CANCELLED'}
 
         if obj.mode != 'OBJECT':
             bpy.ops.object.mode_set(mode='OBJECT')
@@ -49,35 +116,50 @@ class DIRECTIONAL_SHADE_OT_apply(bpy.types.Operator):
             mesh.color_attributes.new(name=result_name, type='BYTE_COLOR', domain='POINT')
         color_layer = mesh.color_attributes[result_name]
 
-        # Compute average normals per vertex
-        vertex_normals = [Vector((0, 0, 0)) for _ in mesh.vertices]
-        counts = [0] * len(mesh.vertices)
+        if props.use_light_rig and not props.lights:
+            self.report({'ERROR'}, "Add at least one light to the rig")
+            return {'CANCELLED'}
+
+        if props.use_light_rig:
+            raw_directions = [light.direction for light in props.lights]
+        else:
+            raw_directions = [props.shade_direction]
 
-        for loop in mesh.loops:
-            idx = loop.vertex_index
-            vertex_normals[idx] += loop.normal
-            counts[idx] += 1
+        directions = []
+        for raw_dir in raw_directions:
+            # Use user-defined direction
+            shade_dir = Vector(raw_dir)
+            if shade_dir.length == 0:
+                self.report({'ERROR'}, "Direction vector cannot be zero")
+                return {'CANCELLED'}
 
-        for i, count in enumerate(counts):
-            if count > 0:
-                vertex_normals[i] /= count
-                vertex_normals[i].normalize()
+            if props.use_world_space:
+                shade_dir = obj.matrix_world.to_3x3() @ shade_dir
+            shade_dir.normalize()
+            directions.append(shade_dir)
 
-        # Use user-defined direction
-        shade_dir = Vector(props.shade_direction)
-        if shade_dir.length == 0:
-            self.report({'ERROR'}, "Direction vector cannot be zero")
-            return {'CANCELLED'}
+        if props.use_light_rig:
+            lights = props.lights
+            colors = np.array([light.color for light in lights], dtype=np.float32)
+            intensities = np.array([light.intensity for light in lights], dtype=np.float32)
+            wraps = np.array([light.wrap for light in lights], dtype=np.float32)
+            falloffs = np.array([light.falloff for light in lights], dtype=np.float32)
+        else:
+            # A single direction is a white half-Lambert light: (dot + 1) / 2
+            colors = np.ones((1, 3), dtype=np.float32)
+            intensities = wraps = falloffs = np.ones(1, dtype=np.float32)
 
-        if props.use_world_space:
-            shade_dir = obj.matrix_world.to_3x3() @ shade_dir
-        shade_dir.normalize()
+        if props.use_split_normals:
+            normals = mesh_arrays.average_corner_normals(mesh)
+        else:
+            normals = mesh_arrays.read_vertex_normals(mesh)
 
         # Assign one color per vertex (POINT domain)
-        for i, normal in enumerate(vertex_normals):
-            dot = normal.dot(shade_dir)
-            shade = max(0.0, min((dot + 1.0) / 2.0, 1.0))  # Map [-1,1] → [0,1]
-            color_layer.data[i].color = (shade, shade, shade, 1.0)
+        rgb = shade_rig(normals, np.array(directions, dtype=np.float32), colors, intensities, wraps, falloffs)
+        shade = np.ones((len(rgb), 4), dtype=np.float32)
+        shade[:, :3] = rgb
+        mesh_arrays.write_colors(color_layer, shade)
+        mesh.update()
 
         mesh.color_attributes.active_color = color_layer
         self.report({'INFO'}, f"Directional shade written to POINT attribute '{result_name}'")
@@ -93,6 +175,29 @@ class DIRECTIONAL_SHADE_OT_reset_vector(bpy.types.Operator):
         self.report({'INFO'}, "Direction reset to world up (0, 0, 1)")
         return {'FINISHED'}
 
+class DIRECTIONAL_SHADE_OT_add_light(bpy.types.Operator):
+    bl_idname = "directional_shade.add_light"
+    bl_label = "Add Light"
+    bl_description = "Add a directional light to the rig"
+
+    def execute(self, context):
+        light = context.scene.directional_shade_props.lights.add()
+        light.direction = context.scene.directional_shade_props.shade_direction
+        return {'FINISHED'}
+
+class DIRECTIONAL_SHADE_OT_remove_light(bpy.types.Operator):
+    bl_idname = "directional_shade.remove_light"
+    bl_label = "Remove Light"
+    bl_description = "Remove this light from the rig"
+
+    index: IntProperty()
+
+    def execute(self, context):
+        lights = context.scene.directional_shade_props.lights
+        if 0 <= self.index < len(lights):
+            lights.remove(self.index)
+        return {'FINISHED'}
+
 # Panel
 class DIRECTIONAL_SHADE_PT_controls(bpy.types.Panel):
     bl_label = "Directional Shade"
@@ -108,19 +213,38 @@ class DIRECTIONAL_SHADE_PT_controls(bpy.types.Panel):
         props = context.scene.directional_shade_props
 
         layout.prop(props, "result_name", icon='RENDERLAYERS')
-        row = layout.row(align=True)
-        row.prop(props, "shade_direction")
-        row.operator("directional_shade.reset_vector", text="", icon='FILE_REFRESH')
+        layout.prop(props, "use_light_rig")
+
+        if props.use_light_rig:
+            for i, light in enumerate(props.lights):
+                box = layout.box()
+                row = box.row()
+                row.prop(light, "color", text="")
+                row.prop(light, "intensity")
+                row.operator("directional_shade.remove_light", text="", icon='X').index = i
+                box.prop(light, "direction", text="")
+                row = box.row(align=True)
+                row.prop(light, "wrap", slider=True)
+                row.prop(light, "falloff")
+            layout.operator("directional_shade.add_light", icon='ADD')
+        else:
+            row = layout.row(align=True)
+            row.prop(props, "shade_direction")
+            row.operator("directional_shade.reset_vector", text="", icon='FILE_REFRESH')
 
         layout.prop(props, "use_world_space")
+        layout.prop(props, "use_split_normals")
         layout.operator("directional_shade.apply", icon='EVENT_DOWN_ARROW')
 
 # Registration
 classes = (
+    DirectionalShadeLight,
     DirectionalShadeProperties,
     DIRECTIONAL_SHADE_PT_controls,
     DIRECTIONAL_SHADE_OT_apply,
     DIRECTIONAL_SHADE_OT_reset_vector,
+    DIRECTIONAL_SHADE_OT_add_light,
+    DIRECTIONAL_SHADE_OT_remove_light,
 )
 
 def register():
@@ -2,99 +2,108 @@
 
 
 import bpy
-import bmesh
-from mathutils import Vector
+import numpy as np
 from . import config
+from . import mesh_arrays
 
 # Core logic
-def vertex_normal_direction_dot(v: bmesh.types.BMVert):
-    dir_sum = Vector((0.0, 0.0, 0.0))
-    n_dir = 0
-    for e in v.link_edges:
-        ov = e.other_vert(v)
-        edge_vec = ov.co - v.co
-        if edge_vec.length > 1e-6:
-            dir_sum += edge_vec.normalized()
-            n_dir += 1
-    if n_dir == 0:
-        return None
-    avg_dir = dir_sum / n_dir
-    if avg_dir.length < 1e-6:
-        return None
-    avg_dir.normalize()
-
-    norm_sum = Vector((0.0, 0.0, 0.0))
-    n_norm = 0
-    for f in v.link_faces:
-        norm_sum += f.normal
-        n_norm += 1
-    if n_norm == 0:
-        return None
-    avg_norm = norm_sum / n_norm
-    if avg_norm.length < 1e-6:
-        return None
-    avg_norm.normalize()
-
-    dot = avg_dir.dot(avg_norm)
+def vertex_normal_direction_dot(coords, edges, loop_verts, loop_polys, poly_normals, poly_areas):
+    """Per vertex: mean unit edge direction dotted with the area-averaged face normal, mapped to [0, 1].
+
+    Vertices without usable edges or faces get NaN.
+    """
+    count = len(coords)
+    coords = coords.astype(np.float64)
+
+    # Normalized edge directions, summed per vertex (b - a for a, a - b for b)
+    edge_vec = coords[edges[:, 1]] - coords[edges[:, 0]]
+    length = np.linalg.norm(edge_vec, axis=1)
+    keep = length > 1e-6
+    unit = edge_vec[keep] / length[keep, None]
+    a, b = edges[keep, 0], edges[keep, 1]
+
+    n_dir = np.bincount(a, minlength=count) + np.bincount(b, minlength=count)
+    dir_sum = np.column_stack([
+        np.bincount(a, unit[:, k], minlength=count) - np.bincount(b, unit[:, k], minlength=count)
+        for k in range(3)
+    ])
+    avg_dir = dir_sum / np.maximum(n_dir, 1)[:, None]
+
+    # Face normals weighted by polygon area, summed per corner vertex
+    weighted = poly_normals[loop_polys].astype(np.float64) * poly_areas[loop_polys, None]
+    area_sum = np.bincount(loop_verts, poly_areas[loop_polys], minlength=count)
+    norm_sum = np.column_stack([np.bincount(loop_verts, weighted[:, k], minlength=count) for k in range(3)])
+    avg_norm = norm_sum / np.where(area_sum > 0.0, area_sum, 1.0)[:, None]
+
+    dir_len = np.linalg.norm(avg_dir, axis=1)
+    norm_len = np.linalg.norm(avg_norm, axis=1)
+    valid = (n_dir > 0) & (dir_len >= 1e-6) & (area_sum > 0.0) & (norm_len >= 1e-6)
+
+    dot = np.sum(avg_dir * avg_norm, axis=1) / np.where(valid, dir_len * norm_len, 1.0)
     # Normalize dot from [-1, 1] to [0, 1]
-    val = (dot + 1) / 2
-    return val
+    return np.where(valid, (dot + 1.0) / 2.0, np.nan)
 
 
 def apply_dot_vertex_colors(obj, layer_name="dot_color"):
+    """Object mode only; reads the mesh arrays directly, so it works on any mesh object."""
     if obj.type != 'MESH':
-        return
+        return False
 
-    obj = bpy.context.object
-    old_mode = obj.mode
-
-    bpy.ops.object.mode_set(mode='EDIT')
     me = obj.data
-    bm = bmesh.from_edit_mesh(me)
-
-    bm.verts.ensure_lookup_table()
+    values = vertex_normal_direction_dot(
+        mesh_arrays.read_vertex_coords(me),
+        mesh_arrays.read_edges(me),
+        mesh_arrays.read_loop_vertices(me),
+        mesh_arrays.read_loop_polygons(me),
+        mesh_arrays.read_polygon_normals(me),
+        mesh_arrays.read_polygon_areas(me),
+    )
+    values = np.where(np.isnan(values), 0.5, values)  # fallback mid-gray
+    values = 1.0 - values
 
     # Use POINT domain color layer
-    color_layer = bm.verts.layers.color.get(layer_name)
+    color_layer = me.color_attributes.get(layer_name)
     if color_layer is None:
-        color_layer = bm.verts.layers.color.new(layer_name)
-
-    for v in bm.verts:
-        val = vertex_normal_direction_dot(v)
-        if val is None:
-            val = 0.5  # fallback mid-gray
-
-        val = 1.0 - val
-        col = (val, val, val, 1.0)
-        v[color_layer] = col
-
-    bmesh.update_edit_mesh(me, loop_triangles=False, destructive=False)
-    
-  
-    print(f"Vertex coloring done with POINT domain layer: {layer_name}")
+        color_layer = me.color_attributes.new(name=layer_name, type='FLOAT_COLOR', domain='POINT')
+    elif color_layer.domain != 'POINT':
+        return False
 
-
-
-    if old_mode != 'EDIT':
-        bpy.ops.object.mode_set(mode=old_mode)
-
-   # me.color_attributes.active_color = color_layer
+    mesh_arrays.write_colors(color_layer, mesh_arrays.gray_to_rgba(values))
+    me.color_attributes.active_color = color_layer
+    me.update()
+    return True
 
 # Operator
 class DOT_COLOR_OT_dot_color(bpy.types.Operator):
     bl_idname = "object.vertex_dot_color"
     bl_label = "Apply Dot Shade"
-    bl_description = "Colors vertices based on dot product of edge direction and face normals"
+    bl_description = "Colors vertices of all selected meshes based on dot product of edge direction and face normals"
     bl_options = {'REGISTER', 'UNDO'}
 
     def execute(self, context):
-        obj = context.object
         settings = context.scene.dot_color_settings
-        if obj is None or obj.type != 'MESH':
+        objects = [o for o in context.selected_objects if o.type == 'MESH']
+        if context.object and context.object.type == 'MESH' and context.object not in objects:
+            objects.append(context.object)
+        if not objects:
             self.report({'WARNING'}, "No mesh object selected.")
             return {'CANCELLED'}
 
-        apply_dot_vertex_colors(obj, settings.color_layer_name)
+        # Edit-mode changes must be flushed to the mesh before reading its arrays
+        was_in_edit = context.mode == 'EDIT_MESH'
+        if was_in_edit:
+            bpy.ops.object.mode_set(mode='OBJECT')
+
+        done = sum(apply_dot_vertex_colors(obj, settings.color_layer_name) for obj in objects)
+
+        if was_in_edit:
+            bpy.ops.object.mode_set(mode='EDIT')
+
+        if done < len(objects):
+            self.report({'WARNING'}, f"Dot shade applied to {done} of {len(objects)} objects "
+                                     f"(layer '{settings.color_layer_name}' is not POINT domain on the rest)")
+        else:
+            self.report({'INFO'}, f"Dot shade applied to {done} object(s)")
         return {'FINISHED'}
 
 # UI Panel
@@ -0,0 +1,301 @@
+# geodesic.py
+import bpy
+import numpy as np
+from bpy.props import StringProperty, FloatProperty, EnumProperty, BoolProperty, PointerProperty
+from . import config
+from . import curvature
+from . import mesh_arrays
+
+# SciPy is not bundled with Blender; without it Dijkstra runs on NumPy frontiers and the heat method is off
+try:
+    import scipy.sparse
+    from scipy.sparse import csgraph
+    from scipy.sparse.linalg import factorized
+except ImportError:
+    scipy = None
+
+
+# Core logic
+
+def dijkstra(indptr, indices, weights, seeds):
+    """Multi-source shortest path lengths over a CSR graph."""
+    count = len(indptr) - 1
+    if scipy is not None:
+        graph = scipy.sparse.csr_matrix((weights, indices, indptr), shape=(count, count))
+        return csgraph.dijkstra(graph, directed=True, indices=seeds, min_only=True)
+    return frontier_distances(indptr, indices, weights, seeds)
+
+
+def frontier_distances(indptr, indices, weights, seeds):
+    """Same result as dijkstra without SciPy: delta-stepping over whole frontiers in NumPy.
+
+    Every round relaxes the edges of all queued vertices closer than a moving bound
+    at once; the bound advances by the median edge length when none are left, so a
+    vertex is rarely relaxed more than a few times.
+    """
+    count = len(indptr) - 1
+    dist = np.full(count, np.inf)
+    dist[seeds] = 0.0
+    pending = np.unique(seeds)
+    queued = np.zeros(count, dtype=bool)
+    queued[pending] = True
+    step = float(np.median(weights)) if len(weights) else 1.0
+    bound = step
+
+    while len(pending):
+        pending_dist = dist[pending]
+        near = pending_dist <= bound
+        if not near.any():
+            bound = pending_dist.min() + step
+            continue
+        frontier = pending[near]
+        pending = pending[~near]
+        queued[frontier] = False
+
+        counts = indptr[frontier + 1] - indptr[frontier]
+        edge = np.repeat(indptr[frontier] - (np.cumsum(counts) - counts), counts) + np.arange(counts.sum())
+        target = indices[edge]
+        candidate = np.repeat(dist[frontier], counts) + weights[edge]
+        better = candidate < dist[target]
+        target = target[better]
+        np.minimum.at(dist, target, candidate[better])
+
+        target = np.unique(target[~queued[target]])
+        queued[target] = True
+        pending = np.concatenate((pending, target))
+    return dist
+
+
+def edge_distances(mesh, coords, seeds):
+    indptr, indices = mesh_arrays.vertex_adjacency(mesh)
+    owner = np.repeat(np.arange(len(coords)), np.diff(indptr))
+    weights = np.linalg.norm(coords[indices] - coords[owner], axis=1)
+    return dijkstra(indptr, indices, weights, seeds)
+
+
+def heat_method(coords, tris, seeds, time_scale=1.0):
+    """Geodesic distance by the heat method (Crane et al. 2013). Needs SciPy."""
+    count = len(coords)
+    cot, _, tri_area = curvature.corner_cotangents(coords, tris)
+    mass = curvature.vertex_areas(tris, tri_area, count)
+
+    # Positive semi-definite cotangent stiffness matrix
+    rows, cols, vals = [], [], []
+    for c in range(3):
+        u, v = tris[:, (c + 1) % 3], tris[:, (c + 2) % 3]
+        w = 0.5 * cot[:, c]
+        rows += [u, v, u, v]
+        cols += [v, u, u, v]
+        vals += [-w, -w, w, w]
+    stiffness = scipy.sparse.csc_matrix(
+        (np.concatenate(vals), (np.concatenate(rows), np.concatenate(cols))), shape=(count, count))
+    mass_matrix = scipy.sparse.diags(mass)
+
+    p = coords[tris]
+    edge_len = np.linalg.norm(p[:, 1] - p[:, 0], axis=1)
+    t = time_scale * np.mean(edge_len) ** 2
+
+    # 1. Diffuse heat from the seeds
+    delta = np.zeros(count)
+    delta[seeds] = 1.0
+    heat = factorized((mass_matrix + t * stiffness).tocsc())(delta)
+
+    # 2. Normalized negative gradient per triangle
+    normal = np.cross(p[:, 1] - p[:, 0], p[:, 2] - p[:, 0])
+    double_area = np.maximum(np.linalg.norm(normal, axis=1), 1e-30)
+    normal /= double_area[:, None]
+    grad = np.zeros((len(tris), 3))
+    for c in range(3):
+        opposite = p[:, (c + 2) % 3] - p[:, (c + 1) % 3]
+        grad += heat[tris[:, c], None] * np.cross(normal, opposite)
+    grad /= double_area[:, None]
+    field = -grad / np.maximum(np.linalg.norm(grad, axis=1), 1e-30)[:, None]
+
+    # 3. Integrated divergence per vertex
+    div = np.zeros(count)
+    for c in range(3):
+        e1 = p[:, (c + 1) % 3] - p[:, c]
+        e2 = p[:, (c + 2) % 3] - p[:, c]
+        contrib = 0.5 * (cot[:, (c + 2) % 3] * np.sum(e1 * field, axis=1)
+                         + cot[:, (c + 1) % 3] * np.sum(e2 * field, axis=1))
+        div += np.bincount(tris[:, c], contrib, minlength=count)
+
+    # 4. Recover the distance; regularize the singular stiffness matrix slightly
+    regularized = (stiffness + 1e-8 * mass_matrix).tocsc()
+    phi = factorized(regularized)(-div)
+    return phi - phi[seeds].min()
+
+
+def normalize_distance(dist, max_distance=0.0):
+    finite = np.isfinite(dist)
+    limit = max_distance if max_distance > 0.0 else (dist[finite].max() if finite.any() else 1.0)
+    if limit <= 0.0:
+        limit = 1.0
+    return np.where(finite, np.clip(dist / limit, 0.0, 1.0), 1.0)
+
+
+def seed_vertices(mesh, source, threshold):
+    if source == 'SELECTION':
+        selected = np.empty(len(mesh.vertices), dtype=bool)
+        mesh.vertices.foreach_get("select", selected)
+        return np.nonzero(selected)[0]
+
+    color_layer = mesh.color_attributes.active_color
+    if color_layer is None or color_layer.domain != 'POINT':
+        return np.zeros(0, dtype=np.int64)
+    return np.nonzero(mesh_arrays.luminance(mesh_arrays.read_colors(color_layer)) > threshold)[0]
+
+
+# Operator
+
+class GEODESIC_OT_apply(bpy.types.Operator):
+    bl_idname = "object.geodesic_distance"
+    bl_label = "Apply Geodesic Distance"
+    bl_description = "Write the distance along the surface from seed vertices to a vertex color layer"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    def execute(self, context):
+        obj = context.object
+        if obj is None or obj.type != 'MESH':
+            self.report({'ERROR'}, "Select a mesh object.")
+            return {'CANCELLED'}
+
+        settings = context.scene.geodesic_settings
+        layer_name = settings.layer_name.strip()
+        if not layer_name:
+            self.report({'ERROR'}, "Layer name is empty.")
+            return {'CANCELLED'}
+
+        # Edit-mode selection must be flushed before reading it
+        if obj.mode != 'OBJECT':
+            bpy.ops.object.mode_set(mode='OBJECT')
+
+        mesh = obj.data
+        seeds = seed_vertices(mesh, settings.seed_source, settings.seed_threshold)
+        if len(seeds) == 0:
+            self.report({'ERROR'}, "No seed vertices (select vertices or paint seeds in the active layer).")
+            return {'CANCELLED'}
+
+        coords = mesh_arrays.read_vertex_coords(mesh).astype(np.float64)
+        if settings.use_heat_method and scipy is not None:
+            dist = heat_method(coords, mesh_arrays.read_triangles(mesh), seeds, settings.heat_time)
+            # Heat diffusion cannot cross between disconnected parts either
+            dist[~np.isfinite(edge_distances(mesh, coords, seeds))] = np.inf
+        else:
+            if settings.use_heat_method:
+                self.report({'WARNING'}, "SciPy not available, using edge distances")
+            dist = edge_distances(mesh, coords, seeds)
+
+        values = normalize_distance(dist, settings.max_distance)
+        if settings.invert:
+            values = 1.0 - values
+
+        if layer_name not in mesh.color_attributes:
+            mesh.color_attributes.new(name=layer_name, type='FLOAT_COLOR', domain='POINT')
+        color_layer = mesh.color_attributes[layer_name]
+        mesh_arrays.write_colors(color_layer, mesh_arrays.gray_to_rgba(values))
+        mesh.color_attributes.active_color = color_layer
+        mesh.update()
+
+        self.report({'INFO'}, f"Geodesic distance from {len(seeds)} seed(s) written to '{layer_name}'")
+        return {'FINISHED'}
+
+
+# Panel
+
+class GEODESIC_PT_panel(bpy.types.Panel):
+    bl_label = "Geodesic Distance"
+    bl_idname = "GEODESIC_PT_panel"
+    bl_parent_id = config.MAIN_PANEL_ID
+    bl_space_type = 'VIEW_3D'
+    bl_region_type = 'UI'
+    bl_category = config.BL_CATEGORY
+    bl_options = {'DEFAULT_CLOSED'}
+
+    def draw(self, context):
+        layout = self.layout
+        settings = context.scene.geodesic_settings
+
+        layout.prop(settings, "layer_name", icon='GROUP_VCOL')
+        layout.prop(settings, "seed_source", expand=True)
+        if settings.seed_source == 'PAINTED':
+            layout.prop(settings, "seed_threshold", slider=True)
+        layout.prop(settings, "max_distance")
+        layout.prop(settings, "invert")
+
+        row = layout.row()
+        row.enabled = scipy is not None
+        row.prop(settings, "use_heat_method")
+        if scipy is None:
+            layout.label(text="Heat method and fastest edge distances need SciPy", icon='INFO')
+        elif settings.use_heat_method:
+            layout.prop(settings, "heat_time")
+        layout.operator(GEODESIC_OT_apply.bl_idname, icon='DRIVER_DISTANCE')
+
+
+# Property Group
+
+class GeodesicSettings(bpy.types.PropertyGroup):
+    layer_name: StringProperty(
+        name="Layer",
+        default="Geodesic",
+        description="Name of the vertex color layer to write the distance into"
+    )
+    seed_source: EnumProperty(
+        name="Seeds",
+        items=[
+            ('SELECTION', "Selection", "Start from the selected vertices"),
+            ('PAINTED', "Painted", "Start from vertices painted bright in the active layer"),
+        ],
+        default='SELECTION'
+    )
+    seed_threshold: FloatProperty(
+        name="Threshold",
+        description="Luminance above which a painted vertex is a seed",
+        default=0.5,
+        min=0.0,
+        max=1.0
+    )
+    max_distance: FloatProperty(
+        name="Max Distance",
+        description="Distance that maps to white (0 = farthest reachable vertex)",
+        default=0.0,
+        min=0.0,
+        subtype='DISTANCE'
+    )
+    invert: BoolProperty(
+        name="Invert",
+        description="Bright at the seeds, fading away from them",
+        default=False
+    )
+    use_heat_method: BoolProperty(
+        name="Heat Method",
+        description="Smoother distances from a sparse heat solve instead of edge paths (needs SciPy)",
+        default=False
+    )
+    heat_time: FloatProperty(
+        name="Heat Time",
+        description="Diffusion time in squared mean edge lengths, higher is smoother",
+        default=1.0,
+        min=0.01,
+        max=100.0
+    )
+
+
+# Registration
+
+classes = (
+    GeodesicSettings,
+    GEODESIC_OT_apply,
+    GEODESIC_PT_panel,
+)
+
+def register():
+    for cls in classes:
+        bpy.utils.register_class(cls)
+    bpy.types.Scene.geodesic_settings = PointerProperty(type=GeodesicSettings)
+
+def unregister():
+    for cls in reversed(classes):
+        bpy.utils.unregister_class(cls)
+    del bpy.types.Scene.geodesic_settings
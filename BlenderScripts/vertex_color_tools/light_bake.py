@@ -0,0 +1,245 @@
+# light_bake.py
+import math
+from collections import namedtuple
+import bpy
+import numpy as np
+from bpy.props import StringProperty, FloatProperty, FloatVectorProperty, BoolProperty, PointerProperty
+from mathutils import Vector
+from . import config
+from . import chunked_executor
+from . import mesh_arrays
+from . import ray_engine
+
+SceneLight = namedtuple("SceneLight", "type color position direction spot_cos spot_spread")
+
+
+# Core logic
+def gather_scene_lights(context):
+    lights = []
+    for obj in context.scene.objects:
+        if obj.type != 'LIGHT' or not obj.visible_get():
+            continue
+        data = obj.data
+        if data.type not in {'SUN', 'POINT', 'SPOT', 'AREA'}:
+            continue
+
+        matrix = obj.matrix_world
+        # Lights shine along their local -Z axis
+        direction = (matrix.to_3x3() @ Vector((0.0, 0.0, -1.0))).normalized()
+        color = np.array(data.color, dtype=np.float64) * data.energy
+
+        spot_cos, spot_spread = -1.0, 1.0
+        if data.type == 'SPOT':
+            spot_cos = math.cos(data.spot_size * 0.5)
+            spot_spread = max((1.0 - spot_cos) * data.spot_blend, 1e-6)
+
+        # Area lights are approximated as point lights
+        light_type = 'POINT' if data.type == 'AREA' else data.type
+        lights.append(SceneLight(light_type, color, np.array(matrix.translation),
+                                 np.array(direction), spot_cos, spot_spread))
+    return lights
+
+
+def light_vertices(coords, normals, lights, bvh=None, bias=0.001):
+    """Irradiance per vertex (N, 3) from sun, point and spot lights, with optional hard shadows.
+
+    Runs in vertex chunks on one thread: the shadow rays are a Python loop over
+    BVHTree.ray_cast that holds the GIL, so a thread pool would not speed it up.
+    """
+
+    def bake_chunk(start, stop):
+        co = coords[start:stop]
+        no = normals[start:stop]
+        result = np.zeros((len(co), 3), dtype=np.float64)
+
+        for light in lights:
+            if light.type == 'SUN':
+                to_light = np.broadcast_to(-light.direction, co.shape)
+                dist = np.full(len(co), ray_engine.MAX_DISTANCE)
+                falloff = np.ones(len(co))
+            else:
+                vec = light.position - co
+                dist = np.maximum(np.linalg.norm(vec, axis=1), 1e-6)
+                to_light = vec / dist[:, None]
+                falloff = 1.0 / (4.0 * math.pi * dist * dist)
+                if light.type == 'SPOT':
+                    t = np.clip((-(to_light @ light.direction) - light.spot_cos) / light.spot_spread, 0.0, 1.0)
+                    falloff *= t * t * (3.0 - 2.0 * t)
+
+            weight = np.clip(np.sum(no * to_light, axis=1), 0.0, None) * falloff
+            lit = np.nonzero(weight > 0.0)[0]
+
+            if bvh is not None and len(lit):
+                # Offset along the normal so rays do not hit their own surface
+                origins = co[lit] + no[lit] * bias
+                blocked = ray_engine.ray_hits(bvh, origins, np.ascontiguousarray(to_light[lit]),
+                                              dist[lit] - bias)
+                weight[lit[blocked]] = 0.0
+
+            result += weight[:, None] * light.color
+        return result
+
+    parts = chunked_executor.map_chunks(bake_chunk, len(coords), workers=1)
+    return np.concatenate(parts) if parts else np.zeros((0, 3))
+
+
+def build_occluder_bvh(context, obj, include_scene):
+    """World space BVH of the object, plus every other visible mesh if requested."""
+    coords = [ray_engine.transform_points(obj.matrix_world, mesh_arrays.read_vertex_coords(obj.data))]
+    triangles = [mesh_arrays.read_triangles(obj.data)]
+    offset = len(coords[0])
+
+    if include_scene:
+        depsgraph = context.evaluated_depsgraph_get()
+        for other in context.scene.objects:
+            if other == obj or other.type != 'MESH' or not other.visible_get():
+                continue
+            evaluated = other.evaluated_get(depsgraph)
+            mesh = evaluated.to_mesh()
+            try:
+                coords.append(ray_engine.transform_points(other.matrix_world, mesh_arrays.read_vertex_coords(mesh)))
+                triangles.append(mesh_arrays.read_triangles(mesh) + offset)
+                offset += len(coords[-1])
+            finally:
+                evaluated.to_mesh_clear()
+
+    return ray_engine.build_bvh(np.concatenate(coords), np.concatenate(triangles))
+
+
+# Operator
+class LIGHT_BAKE_OT_vertex_color(bpy.types.Operator):
+    bl_idname = "object.light_bake_vertex_color"
+    bl_label = "Bake Scene Lights"
+    bl_description = "Bake sun, point and spot lights with hard shadows to vertex colors on the CPU"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    def execute(self, context):
+        obj = context.object
+        if obj is None or obj.type != 'MESH':
+            self.report({'ERROR'}, "Select a mesh object")
+            return {'CANCELLED'}
+
+        settings = context.scene.light_bake_settings
+        layer_name = settings.layer_name.strip()
+        if not layer_name:
+            self.report({'ERROR'}, "Layer name cannot be empty")
+            return {'CANCELLED'}
+
+        lights = gather_scene_lights(context)
+        if not lights:
+            self.report({'ERROR'}, "No visible sun, point or spot lights in the scene")
+            return {'CANCELLED'}
+
+        if obj.mode != 'OBJECT':
+            bpy.ops.object.mode_set(mode='OBJECT')
+
+        mesh = obj.data
+        coords = ray_engine.transform_points(obj.matrix_world, mesh_arrays.read_vertex_coords(mesh))
+        normals = ray_engine.transform_normals(obj.matrix_world, mesh_arrays.read_vertex_normals(mesh))
+
+        bvh = None
+        if settings.cast_shadows:
+            bvh = build_occluder_bvh(context, obj, settings.scene_occluders)
+
+        irradiance = light_vertices(coords, normals, lights, bvh, settings.bias)
+        irradiance += np.array(settings.ambient)
+
+        colors = np.ones((len(coords), 4), dtype=np.float32)
+        colors[:, :3] = np.clip(irradiance * settings.exposure, 0.0, 1.0)
+
+        if layer_name not in mesh.color_attributes:
+            mesh.color_attributes.new(name=layer_name, type='FLOAT_COLOR', domain='POINT')
+        color_layer = mesh.color_attributes[layer_name]
+        mesh_arrays.write_colors(color_layer, colors)
+        mesh.color_attributes.active_color = color_layer
+        mesh.update()
+
+        self.report({'INFO'}, f"Baked {len(lights)} light(s) to '{layer_name}'")
+        return {'FINISHED'}
+
+
+# Panel
+class LIGHT_BAKE_PT_panel(bpy.types.Panel):
+    bl_label = "Bake Lights"
+    bl_idname = "LIGHT_BAKE_PT_panel"
+    bl_parent_id = config.MAIN_PANEL_ID
+    bl_space_type = 'VIEW_3D'
+    bl_region_type = 'UI'
+    bl_category = config.BL_CATEGORY
+    bl_options = {'DEFAULT_CLOSED'}
+
+    def draw(self, context):
+        layout = self.layout
+        settings = context.scene.light_bake_settings
+
+        layout.prop(settings, "layer_name", icon='GROUP_VCOL')
+        layout.prop(settings, "exposure")
+        layout.prop(settings, "ambient")
+
+        layout.prop(settings, "cast_shadows")
+        if settings.cast_shadows:
+            col = layout.column(align=True)
+            col.prop(settings, "scene_occluders")
+            col.prop(settings, "bias")
+        layout.operator(LIGHT_BAKE_OT_vertex_color.bl_idname, icon='LIGHT_SUN')
+
+
+# Property Group
+class LightBakeSettings(bpy.types.PropertyGroup):
+    layer_name: StringProperty(
+        name="Layer",
+        default="Lights",
+        description="Name of the vertex color layer to bake lighting into"
+    )
+    exposure: FloatProperty(
+        name="Exposure",
+        description="Multiplier applied to the baked irradiance before clamping to 0-1",
+        default=1.0,
+        min=0.0,
+        max=100.0
+    )
+    ambient: FloatVectorProperty(
+        name="Ambient",
+        subtype='COLOR',
+        size=3,
+        min=0.0,
+        max=1.0,
+        default=(0.0, 0.0, 0.0),
+        description="Constant light added everywhere"
+    )
+    cast_shadows: BoolProperty(
+        name="Shadows",
+        description="Trace hard shadows against a BVH",
+        default=True
+    )
+    scene_occluders: BoolProperty(
+        name="Other Objects Cast Shadows",
+        description="Include every visible mesh in the scene as a shadow caster",
+        default=False
+    )
+    bias: FloatProperty(
+        name="Normal Offset",
+        description="Distance shadow rays start above the surface, avoids self-shadowing acne",
+        default=0.001,
+        min=0.0,
+        max=1.0,
+        precision=4
+    )
+
+
+# Registration
+classes = (
+    LightBakeSettings,
+    LIGHT_BAKE_OT_vertex_color,
+    LIGHT_BAKE_PT_panel,
+)
+
+def register():
+    for cls in classes:
+        bpy.utils.register_class(cls)
+    bpy.types.Scene.light_bake_settings = PointerProperty(type=LightBakeSettings)
+
+def unregister():
+    for cls in reversed(classes):
+        bpy.utils.unregister_class(cls)
+    del bpy.types.Scene.light_bake_settings
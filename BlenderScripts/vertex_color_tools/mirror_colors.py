@@ -0,0 +1,237 @@
+# mirror_colors.py
+import bpy
+import numpy as np
+from bpy.props import EnumProperty, FloatProperty, BoolProperty, PointerProperty
+from mathutils.kdtree import KDTree
+from . import config
+from . import mesh_arrays
+from . import surface_transfer
+
+AXES = {'X': 0, 'Y': 1, 'Z': 2}
+
+# Mirror correspondence per mesh, reused while geometry, axis and tolerance are unchanged
+_correspondence_cache = {}
+
+
+# Core function
+
+def mirror_matches(coords, axis, tolerance):
+    """Index of the vertex at each vertex's mirrored position, -1 where none is within tolerance."""
+    tree = KDTree(len(coords))
+    for i, co in enumerate(coords.tolist()):
+        tree.insert(co, i)
+    tree.balance()
+
+    mirrored = coords.copy()
+    mirrored[:, axis] *= -1.0
+    match = np.full(len(coords), -1, dtype=np.int64)
+    find = tree.find
+    for i, co in enumerate(mirrored.tolist()):
+        _, index, distance = find(co)
+        if index is not None and distance <= tolerance:
+            match[i] = index
+    return match
+
+
+class MirrorCorrespondence:
+    """Exact vertex matches plus a surface mapping for the mirrored positions of the rest."""
+
+    def __init__(self, coords, tris, axis, tolerance, use_fallback):
+        self.match = mirror_matches(coords, axis, tolerance)
+        self.unmatched = np.nonzero(self.match < 0)[0]
+        self.fallback = None
+        if use_fallback and len(self.unmatched) and len(tris):
+            mirrored = coords[self.unmatched].astype(np.float64)
+            mirrored[:, axis] *= -1.0
+            self.fallback = surface_transfer.build_mapping(coords, tris, mirrored)
+
+    def mirrored_values(self, values):
+        """(values at each vertex's mirror position, mask of vertices that have one)."""
+        mirrored = values[np.maximum(self.match, 0)]
+        valid = self.match >= 0
+        if self.fallback is not None:
+            mirrored[self.unmatched] = self.fallback.transfer(values)
+            valid[self.unmatched] = True
+        return mirrored, valid
+
+
+def get_correspondence(mesh, axis, tolerance, use_fallback):
+    coords = mesh_arrays.read_vertex_coords(mesh)
+    tris = mesh_arrays.read_triangles(mesh)
+    fingerprint = (surface_transfer.geometry_fingerprint(coords, tris), axis, tolerance, use_fallback)
+    cached = _correspondence_cache.get(mesh.name_full)
+    if cached is None or cached[0] != fingerprint:
+        cached = (fingerprint, MirrorCorrespondence(coords, tris, axis, tolerance, use_fallback))
+        _correspondence_cache[mesh.name_full] = cached
+    return cached[1], coords
+
+
+def forget_mesh(name_full):
+    _correspondence_cache.pop(name_full, None)
+
+
+def mirror_colors(colors, coords, correspondence, axis, direction):
+    mirrored, valid = correspondence.mirrored_values(colors)
+    if direction == 'AVERAGE':
+        target = valid
+        mirrored = 0.5 * (colors + mirrored)
+    elif direction == 'POSITIVE':
+        target = valid & (coords[:, axis] < 0.0)
+    else:
+        target = valid & (coords[:, axis] > 0.0)
+
+    result = colors.copy()
+    result[target] = mirrored[target]
+    return result, int(np.count_nonzero(target))
+
+
+# Operator
+
+class VERTEX_COLOR_OT_mirror(bpy.types.Operator):
+    bl_idname = "object.vertex_color_mirror"
+    bl_label = "Mirror Colors"
+    bl_description = "Mirror or symmetrize the active vertex color layer across a local axis"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    def execute(self, context):
+        obj = context.active_object
+        props = context.scene.vc_mirror_props
+
+        if not obj or obj.type != 'MESH':
+            self.report({'ERROR'}, "No mesh object selected.")
+            return {'CANCELLED'}
+
+        if obj.mode != 'OBJECT':
+            bpy.ops.object.mode_set(mode='OBJECT')
+
+        mesh = obj.data
+        color_layer = mesh.color_attributes.active_color
+        if not color_layer:
+            self.report({'ERROR'}, "No active vertex color layer found.")
+            return {'CANCELLED'}
+
+        if color_layer.domain != 'POINT':
+            self.report({'ERROR'}, "Only POINT domain vertex colors supported.")
+            return {'CANCELLED'}
+
+        axis = AXES[props.axis]
+        correspondence, coords = get_correspondence(mesh, axis, props.tolerance, props.use_fallback)
+        colors, changed = mirror_colors(mesh_arrays.read_colors(color_layer), coords,
+                                        correspondence, axis, props.direction)
+        mesh_arrays.write_colors(color_layer, colors)
+        mesh.update()
+
+        unmatched = len(correspondence.unmatched)
+        if correspondence.fallback is not None:
+            note = f", {unmatched} interpolated from the surface"
+        elif unmatched:
+            note = f", {unmatched} without a mirror vertex left unchanged"
+        else:
+            note = ""
+        self.report({'INFO'}, f"Mirrored {changed} vertices of '{color_layer.name}'{note}")
+        return {'FINISHED'}
+
+
+class VERTEX_COLOR_OT_mirror_clear_cache(bpy.types.Operator):
+    bl_idname = "object.vertex_color_mirror_clear_cache"
+    bl_label = "Clear Mirror Cache"
+    bl_description = "Free the cached mirror correspondences"
+
+    def execute(self, context):
+        _correspondence_cache.clear()
+        self.report({'INFO'}, "Mirror cache cleared")
+        return {'FINISHED'}
+
+
+# Panel
+
+class VERTEX_COLOR_PT_mirror(bpy.types.Panel):
+    bl_label = "Mirror"
+    bl_idname = "VERTEX_COLOR_PT_mirror"
+    bl_parent_id = config.MAIN_PANEL_ID
+    bl_space_type = 'VIEW_3D'
+    bl_region_type = 'UI'
+    bl_category = config.BL_CATEGORY
+    bl_options = {'DEFAULT_CLOSED'}
+
+    @classmethod
+    def poll(cls, context):
+        obj = context.active_object
+        return obj and obj.type == 'MESH'
+
+    def draw(self, context):
+        layout = self.layout
+        props = context.scene.vc_mirror_props
+        color_layer = context.active_object.data.color_attributes.active_color
+
+        if color_layer:
+            layout.label(text=f"Active Layer: {color_layer.name}")
+            layout.prop(props, "axis", expand=True)
+            layout.prop(props, "direction")
+            layout.prop(props, "tolerance")
+            layout.prop(props, "use_fallback")
+            row = layout.row(align=True)
+            row.operator("object.vertex_color_mirror", icon='MOD_MIRROR')
+            row.operator("object.vertex_color_mirror_clear_cache", text="", icon='TRASH')
+        else:
+            layout.label(text="No active vertex color layer", icon='ERROR')
+
+
+# Properties
+
+class VertexColorMirrorProps(bpy.types.PropertyGroup):
+    axis: EnumProperty(
+        name="Axis",
+        description="Local axis to mirror across",
+        items=[
+            ('X', "X", "Mirror across the local YZ plane"),
+            ('Y', "Y", "Mirror across the local XZ plane"),
+            ('Z', "Z", "Mirror across the local XY plane"),
+        ],
+        default='X'
+    )
+    direction: EnumProperty(
+        name="Direction",
+        description="Which side is copied onto the other",
+        items=[
+            ('POSITIVE', "+ to -", "Copy the positive side onto the negative side"),
+            ('NEGATIVE', "- to +", "Copy the negative side onto the positive side"),
+            ('AVERAGE', "Average", "Average both sides so they match"),
+        ],
+        default='POSITIVE'
+    )
+    tolerance: FloatProperty(
+        name="Tolerance",
+        description="Largest distance between a mirrored position and the vertex it matches",
+        default=0.001,
+        min=0.0,
+        max=1.0,
+        precision=4,
+        subtype='DISTANCE'
+    )
+    use_fallback: BoolProperty(
+        name="Interpolate Unmatched",
+        description="Vertices without a mirror vertex take the interpolated color of the mirrored surface",
+        default=True
+    )
+
+
+# Registration
+
+classes = (
+    VertexColorMirrorProps,
+    VERTEX_COLOR_OT_mirror,
+    VERTEX_COLOR_OT_mirror_clear_cache,
+    VERTEX_COLOR_PT_mirror,
+)
+
+def register():
+    for cls in classes:
+        bpy.utils.register_class(cls)
+    bpy.types.Scene.vc_mirror_props = PointerProperty(type=VertexColorMirrorProps)
+
+def unregister():
+    for cls in reversed(classes):
+        bpy.utils.unregister_class(cls)
+    del bpy.types.Scene.vc_mirror_props
+    _correspondence_cache.clear()
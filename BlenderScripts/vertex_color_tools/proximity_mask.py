@@ -0,0 +1,199 @@
+# proximity_mask.py
+import hashlib
+import bpy
+import numpy as np
+from bpy.props import StringProperty, FloatProperty, EnumProperty, BoolProperty, PointerProperty
+from . import config
+from . import mesh_arrays
+from . import ray_engine
+
+# World space BVH of the last target set, reused while targets are unchanged
+_target_cache = {}
+
+
+# Core logic
+
+def target_fingerprint(obj, coords, tris):
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(np.array(obj.matrix_world, dtype=np.float64).tobytes())
+    digest.update(coords.tobytes())
+    digest.update(tris.tobytes())
+    return obj.name_full, digest.hexdigest()
+
+
+def build_target_bvh(context, targets):
+    """One BVH over all targets (evaluated, world space), cached by their geometry and transforms."""
+    depsgraph = context.evaluated_depsgraph_get()
+    coords, triangles, keys = [], [], []
+    offset = 0
+    for obj in targets:
+        evaluated = obj.evaluated_get(depsgraph)
+        mesh = evaluated.to_mesh()
+        try:
+            co = mesh_arrays.read_vertex_coords(mesh)
+            tris = mesh_arrays.read_triangles(mesh)
+        finally:
+            evaluated.to_mesh_clear()
+        keys.append(target_fingerprint(obj, co, tris))
+        coords.append(ray_engine.transform_points(obj.matrix_world, co))
+        triangles.append(tris + offset)
+        offset += len(co)
+
+    key = tuple(keys)
+    if _target_cache.get('key') != key:
+        _target_cache.clear()
+        _target_cache['key'] = key
+        _target_cache['bvh'] = ray_engine.build_bvh(np.concatenate(coords), np.concatenate(triangles))
+    return _target_cache['bvh']
+
+
+def apply_falloff(distance, max_distance, falloff):
+    """Contact mask: 1 at distance 0, 0 at max_distance and beyond."""
+    t = np.clip(distance / max_distance, 0.0, 1.0)
+    if falloff == 'SMOOTH':
+        return 1.0 - t * t * (3.0 - 2.0 * t)
+    if falloff == 'SHARP':
+        return (1.0 - t) ** 2
+    if falloff == 'ROOT':
+        return np.sqrt(1.0 - t)
+    return 1.0 - t
+
+
+def nearest_distances(bvh, points, max_distance):
+    """Distance to the nearest target surface per point, inf beyond max_distance.
+
+    A Python loop over BVHTree.find_nearest, which holds the GIL, so it runs on one thread.
+    """
+    return ray_engine.nearest_batch(bvh, points, max_distance)[3]
+
+
+# Operator
+
+class PROXIMITY_MASK_OT_apply(bpy.types.Operator):
+    bl_idname = "object.proximity_mask"
+    bl_label = "Bake Contact Mask"
+    bl_description = "Mask vertices of the selected meshes by their distance to the target objects"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    def execute(self, context):
+        settings = context.scene.proximity_mask_settings
+        layer_name = settings.layer_name.strip()
+        if not layer_name:
+            self.report({'ERROR'}, "Layer name cannot be empty")
+            return {'CANCELLED'}
+
+        if settings.targets is None:
+            self.report({'ERROR'}, "Choose a target collection")
+            return {'CANCELLED'}
+
+        targets = [o for o in settings.targets.all_objects if o.type == 'MESH']
+        sources = [o for o in context.selected_objects if o.type == 'MESH' and o not in targets]
+        if not targets:
+            self.report({'ERROR'}, "Target collection has no mesh objects")
+            return {'CANCELLED'}
+        if not sources:
+            self.report({'ERROR'}, "Select mesh objects outside the target collection")
+            return {'CANCELLED'}
+
+        if context.mode != 'OBJECT':
+            bpy.ops.object.mode_set(mode='OBJECT')
+
+        bvh = build_target_bvh(context, targets)
+
+        for obj in sources:
+            mesh = obj.data
+            points = ray_engine.transform_points(obj.matrix_world, mesh_arrays.read_vertex_coords(mesh))
+            distance = nearest_distances(bvh, points, settings.max_distance)
+            mask = apply_falloff(distance, settings.max_distance, settings.falloff)
+            if settings.invert:
+                mask = 1.0 - mask
+
+            if layer_name not in mesh.color_attributes:
+                mesh.color_attributes.new(name=layer_name, type='FLOAT_COLOR', domain='POINT')
+            color_layer = mesh.color_attributes[layer_name]
+            mesh_arrays.write_colors(color_layer, mesh_arrays.gray_to_rgba(mask))
+            mesh.color_attributes.active_color = color_layer
+            mesh.update()
+
+        self.report({'INFO'}, f"Contact mask written to '{layer_name}' on {len(sources)} object(s)")
+        return {'FINISHED'}
+
+
+# Panel
+
+class PROXIMITY_MASK_PT_panel(bpy.types.Panel):
+    bl_label = "Contact Mask"
+    bl_idname = "PROXIMITY_MASK_PT_panel"
+    bl_parent_id = config.MAIN_PANEL_ID
+    bl_space_type = 'VIEW_3D'
+    bl_region_type = 'UI'
+    bl_category = config.BL_CATEGORY
+    bl_options = {'DEFAULT_CLOSED'}
+
+    def draw(self, context):
+        layout = self.layout
+        settings = context.scene.proximity_mask_settings
+
+        layout.prop(settings, "targets")
+        layout.prop(settings, "layer_name", icon='GROUP_VCOL')
+        layout.prop(settings, "max_distance")
+        layout.prop(settings, "falloff")
+        layout.prop(settings, "invert")
+        layout.operator(PROXIMITY_MASK_OT_apply.bl_idname, icon='SNAP_FACE')
+
+
+# Property Group
+
+class ProximityMaskSettings(bpy.types.PropertyGroup):
+    targets: PointerProperty(
+        name="Targets",
+        type=bpy.types.Collection,
+        description="Objects that cause contact (ground, other props)"
+    )
+    layer_name: StringProperty(
+        name="Layer",
+        default="Contact",
+        description="Name of the vertex color layer to write the mask into"
+    )
+    max_distance: FloatProperty(
+        name="Distance",
+        description="Distance at which the mask fades to zero",
+        default=0.1,
+        min=0.0001,
+        max=1000.0,
+        subtype='DISTANCE'
+    )
+    falloff: EnumProperty(
+        name="Falloff",
+        items=[
+            ('LINEAR', "Linear", "Straight fade"),
+            ('SMOOTH', "Smooth", "Smoothstep fade"),
+            ('SHARP', "Sharp", "Quadratic, concentrated at the contact"),
+            ('ROOT', "Root", "Square root, wide and soft"),
+        ],
+        default='SMOOTH'
+    )
+    invert: BoolProperty(
+        name="Invert",
+        default=False
+    )
+
+
+# Registration
+
+classes = (
+    ProximityMaskSettings,
+    PROXIMITY_MASK_OT_apply,
+    PROXIMITY_MASK_PT_panel,
+)
+
+def register():
+    for cls in classes:
+        bpy.utils.register_class(cls)
+    bpy.types.Scene.proximity_mask_settings = PointerProperty(type=ProximityMaskSettings)
+
+def unregister():
+    for cls in reversed(classes):
+        bpy.utils.unregister_class(cls)
+    del bpy.types.Scene.proximity_mask_settings
+    _target_cache.clear()
@@ -0,0 +1,215 @@
+# proxy_bake.py
+import bpy
+import numpy as np
+from bpy.props import EnumProperty, FloatProperty, PointerProperty
+from . import config
+from . import density_weighted
+from . import mesh_arrays
+from . import mirror_colors
+from . import surface_transfer
+
+# Generator -> operator run on the proxy with its own panel settings
+GENERATORS = {
+    'RAYCAST_AO': "object.ao_raycast_vertex_color",
+    'DISK_AO': "object.disk_ao_vertex_color",
+    'LIGHTS': "object.light_bake_vertex_color",
+    'THICKNESS': "object.thickness_bake",
+    'DENSITY': "object.paint_vertex_density_weighted",
+    'CURVATURE': "object.vertex_curvature",
+}
+
+
+# Core logic
+
+def build_proxy(context, obj, ratio):
+    """Temporary object holding a decimated copy of obj's evaluated mesh, same transform."""
+    mesh = bpy.data.meshes.new_from_object(obj.evaluated_get(context.evaluated_depsgraph_get()))
+    proxy = bpy.data.objects.new(obj.name + "_proxy", mesh)
+    proxy.matrix_world = obj.matrix_world.copy()
+    context.scene.collection.objects.link(proxy)
+
+    if ratio < 1.0:
+        decimate = proxy.modifiers.new("Decimate", 'DECIMATE')
+        decimate.ratio = ratio
+        # Getting the depsgraph evaluates the new modifier
+        decimated = bpy.data.meshes.new_from_object(proxy.evaluated_get(context.evaluated_depsgraph_get()))
+        proxy.modifiers.remove(decimate)
+        proxy.data = decimated
+        bpy.data.meshes.remove(mesh)
+    return proxy
+
+
+def remove_proxy(proxy):
+    mesh = proxy.data
+    # Generators cache per mesh name; the proxy's entries would never be used again
+    for module in (mesh_arrays, density_weighted, mirror_colors):
+        module.forget_mesh(mesh.name_full)
+    bpy.data.objects.remove(proxy)
+    bpy.data.meshes.remove(mesh)
+
+
+def point_layer_colors(mesh):
+    return {layer.name: mesh_arrays.read_colors(layer)
+            for layer in mesh.color_attributes if layer.domain == 'POINT'}
+
+
+def changed_layers(before, after):
+    """Names of layers the generator created or wrote to."""
+    return [name for name, colors in after.items()
+            if name not in before or not np.array_equal(before[name], colors)]
+
+
+# Operator
+
+class PROXY_OT_bake(bpy.types.Operator):
+    bl_idname = "object.proxy_bake"
+    bl_label = "Bake on Proxy"
+    bl_description = ("Run a generator on a decimated copy of the mesh and transfer the result "
+                      "to every vertex of the full mesh")
+    bl_options = {'REGISTER', 'UNDO'}
+
+    def execute(self, context):
+        obj = context.object
+        if obj is None or obj.type != 'MESH':
+            self.report({'ERROR'}, "Select a mesh object")
+            return {'CANCELLED'}
+
+        if obj.mode != 'OBJECT':
+            bpy.ops.object.mode_set(mode='OBJECT')
+
+        settings = context.scene.proxy_bake_settings
+        category, name = GENERATORS[settings.generator].split(".")
+        generator = getattr(getattr(bpy.ops, category), name)
+
+        proxy = build_proxy(context, obj, settings.ratio)
+        was_hidden = obj.hide_get()
+        try:
+            # Keep the full mesh out of generators that look at the rest of the scene
+            obj.hide_set(True)
+            before = point_layer_colors(proxy.data)
+            with context.temp_override(object=proxy, active_object=proxy,
+                                       selected_objects=[proxy], selected_editable_objects=[proxy]):
+                try:
+                    result = generator('EXEC_DEFAULT')
+                except RuntimeError as e:
+                    self.report({'ERROR'}, str(e))
+                    return {'CANCELLED'}
+            if 'FINISHED' not in result:
+                self.report({'ERROR'}, "Generator failed on the proxy")
+                return {'CANCELLED'}
+
+            proxy_colors = point_layer_colors(proxy.data)
+            names = changed_layers(before, proxy_colors)
+            if not names:
+                self.report({'WARNING'}, "Generator wrote no vertex colors")
+                return {'CANCELLED'}
+
+            # Map onto the positions the full mesh's vertices have after modifiers
+            target_coords = mesh_arrays.read_ray_inputs(obj, context.evaluated_depsgraph_get())[0]
+            mapping = surface_transfer.get_mapping(
+                (obj.name_full, "proxy"), mesh_arrays.read_vertex_coords(proxy.data),
+                mesh_arrays.read_triangles(proxy.data), target_coords)
+            proxy_vertex_count = len(proxy.data.vertices)
+        finally:
+            obj.hide_set(was_hidden)
+            remove_proxy(proxy)
+
+        mesh = obj.data
+        for name in names:
+            color_layer = mesh.color_attributes.get(name)
+            if color_layer is not None and color_layer.domain != 'POINT':
+                self.report({'ERROR'}, "Only POINT domain vertex colors supported.")
+                return {'CANCELLED'}
+        for name in names:
+            color_layer = mesh.color_attributes.get(name)
+            if color_layer is None:
+                color_layer = mesh.color_attributes.new(name=name, type='FLOAT_COLOR', domain='POINT')
+            mesh_arrays.write_colors(color_layer, mapping.transfer(proxy_colors[name]))
+        mesh.color_attributes.active_color = mesh.color_attributes[names[0]]
+        mesh.update()
+
+        self.report({'INFO'}, f"Baked on a {proxy_vertex_count} vertex proxy and transferred "
+                              f"{', '.join(repr(n) for n in names)} to {len(mesh.vertices)} vertices")
+        return {'FINISHED'}
+
+
+class PROXY_OT_clear_cache(bpy.types.Operator):
+    bl_idname = "object.clear_surface_transfer_cache"
+    bl_label = "Clear Transfer Cache"
+    bl_description = "Free the cached surface mappings used by proxy bakes and color transfers"
+
+    def execute(self, context):
+        surface_transfer.clear_mapping_cache()
+        self.report({'INFO'}, "Transfer cache cleared")
+        return {'FINISHED'}
+
+
+# Panel
+
+class PROXY_PT_panel(bpy.types.Panel):
+    bl_label = "Proxy Bake"
+    bl_idname = "PROXY_PT_panel"
+    bl_parent_id = config.MAIN_PANEL_ID
+    bl_space_type = 'VIEW_3D'
+    bl_region_type = 'UI'
+    bl_category = config.BL_CATEGORY
+    bl_options = {'DEFAULT_CLOSED'}
+
+    def draw(self, context):
+        layout = self.layout
+        settings = context.scene.proxy_bake_settings
+
+        layout.prop(settings, "generator")
+        layout.prop(settings, "ratio", slider=True)
+        layout.label(text="Settings come from the generator's own panel", icon='INFO')
+        layout.operator(PROXY_OT_bake.bl_idname, icon='MOD_DECIM')
+
+        row = layout.row()
+        row.label(text=f"Cache: {surface_transfer.mapping_cache_nbytes() / (1024 * 1024):.1f} MB")
+        row.operator(PROXY_OT_clear_cache.bl_idname, text="", icon='TRASH')
+
+
+# Property Group
+
+class ProxyBakeSettings(bpy.types.PropertyGroup):
+    generator: EnumProperty(
+        name="Generator",
+        description="What to bake on the proxy",
+        items=[
+            ('RAYCAST_AO', "Ray Cast AO", "CPU ray-cast ambient occlusion"),
+            ('DISK_AO', "Approximate AO", "Disk-based approximate ambient occlusion"),
+            ('LIGHTS', "Scene Lights", "Direct light from the scene's lights"),
+            ('THICKNESS', "Thickness", "Inverted AO thickness"),
+            ('DENSITY', "Density", "Weighted vertex density"),
+            ('CURVATURE', "Curvature", "Curvature and cavity"),
+        ],
+        default='RAYCAST_AO'
+    )
+    ratio: FloatProperty(
+        name="Ratio",
+        description="Fraction of faces the proxy keeps",
+        default=0.1,
+        min=0.001,
+        max=1.0
+    )
+
+
+# Registration
+
+classes = (
+    ProxyBakeSettings,
+    PROXY_OT_bake,
+    PROXY_OT_clear_cache,
+    PROXY_PT_panel,
+)
+
+def register():
+    for cls in classes:
+        bpy.utils.register_class(cls)
+    bpy.types.Scene.proxy_bake_settings = PointerProperty(type=ProxyBakeSettings)
+
+def unregister():
+    for cls in reversed(classes):
+        bpy.utils.unregister_class(cls)
+    del bpy.types.Scene.proxy_bake_settings
+    surface_transfer.clear_mapping_cache()
@@ -0,0 +1,122 @@
+# ray_engine.py
+import numpy as np
+from mathutils import Vector
+from mathutils.bvhtree import BVHTree
+from . import chunked_executor
+
+# Far enough for rays that should never stop (sun shadows)
+MAX_DISTANCE = 1.0e10
+
+
+# BVH construction
+def build_bvh(coords, triangles):
+    return BVHTree.FromPolygons(np.asarray(coords, dtype=np.float64).tolist(),
+                                np.asarray(triangles).tolist())
+
+
+def transform_points(matrix, coords):
+    m = np.array(matrix, dtype=np.float64)
+    return coords @ m[:3, :3].T + m[:3, 3]
+
+
+def transform_normals(matrix, normals):
+    m = np.linalg.inv(np.array(matrix, dtype=np.float64)[:3, :3]).T
+    out = normals @ m.T
+    lengths = np.linalg.norm(out, axis=1, keepdims=True)
+    return np.divide(out, lengths, out=np.zeros_like(out), where=lengths > 1e-12)
+
+
+# Ray casting
+def ray_hits(bvh, origins, directions, max_dists):
+    """Serial ray casts; True where a ray hits geometry within its max distance.
+
+    A Python loop over BVHTree.ray_cast, which holds the GIL: threads do not speed it up.
+    """
+    ray_cast = bvh.ray_cast
+    hits = np.zeros(len(origins), dtype=bool)
+    for i, (o, d, dist) in enumerate(zip(origins.tolist(), directions.tolist(), max_dists.tolist())):
+        hits[i] = ray_cast(Vector(o), Vector(d), dist)[0] is not None
+    return hits
+
+
+
+def ray_cast_batch(bvh, origins, directions, max_dists):
+    """Serial ray casts returning (hit mask, primitive index, hit location, hit distance)."""
+    ray_cast = bvh.ray_cast
+    count = len(origins)
+    hits = np.zeros(count, dtype=bool)
+    index = np.full(count, -1, dtype=np.int64)
+    location = np.zeros((count, 3), dtype=np.float64)
+    distance = np.full(count, np.inf, dtype=np.float64)
+    for i, (o, d, dist) in enumerate(zip(origins.tolist(), directions.tolist(), max_dists.tolist())):
+        loc, _, idx, hit_dist = ray_cast(Vector(o), Vector(d), dist)
+        if loc is not None:
+            hits[i] = True
+            index[i] = idx
+            location[i] = loc
+            distance[i] = hit_dist
+    return hits, index, location, distance
+
+
+# Sampling
+def tangent_frames(normals):
+    """Orthonormal tangent and bitangent for every normal."""
+    helper = np.where(np.abs(normals[:, 2:3]) < 0.999, [[0.0, 0.0, 1.0]], [[1.0, 0.0, 0.0]])
+    tangent = np.cross(helper, normals)
+    tangent /= np.linalg.norm(tangent, axis=1, keepdims=True)
+    return tangent, np.cross(normals, tangent)
+
+
+def stratified_uv(rng, count, samples):
+    """Jittered m x m strata per vertex, shape (count, m * m) for u and v."""
+    m = max(1, int(round(np.sqrt(samples))))
+    i, j = np.divmod(np.arange(m * m), m)
+    u = (i + rng.random((count, m * m))) / m
+    v = (j + rng.random((count, m * m))) / m
+    return u, v
+
+
+def cosine_hemisphere(normals, u, v):
+    """Cosine-weighted directions around each normal; u, v are (N, S) in [0, 1). Returns (N, S, 3)."""
+    tangent, bitangent = tangent_frames(normals)
+    r = np.sqrt(u)
+    phi = 2.0 * np.pi * v
+    x, y, z = r * np.cos(phi), r * np.sin(phi), np.sqrt(np.clip(1.0 - u, 0.0, None))
+    return (x[..., None] * tangent[:, None] + y[..., None] * bitangent[:, None]
+            + z[..., None] * normals[:, None])
+
+
+def barycentric(points, a, b, c):
+    """Barycentric weights (N, 3) of points projected into triangles (a, b, c)."""
+    v0, v1, v2 = b - a, c - a, points - a
+    d00 = np.sum(v0 * v0, axis=1)
+    d01 = np.sum(v0 * v1, axis=1)
+    d11 = np.sum(v1 * v1, axis=1)
+    d20 = np.sum(v2 * v0, axis=1)
+    d21 = np.sum(v2 * v1, axis=1)
+    denom = d00 * d11 - d01 * d01
+    denom = np.where(np.abs(denom) > 1e-30, denom, 1.0)
+    wb = (d11 * d20 - d01 * d21) / denom
+    wc = (d00 * d21 - d01 * d20) / denom
+    weights = np.column_stack((1.0 - wb - wc, wb, wc))
+    # Clamp to the triangle so nearest-surface points never extrapolate
+    weights = np.clip(weights, 0.0, None)
+    return weights / np.maximum(weights.sum(axis=1, keepdims=True), 1e-30)
+
+
+def nearest_batch(bvh, points, max_dist):
+    """Serial find_nearest returning (found mask, primitive index, nearest location, distance)."""
+    find_nearest = bvh.find_nearest
+    count = len(points)
+    found = np.zeros(count, dtype=bool)
+    index = np.full(count, -1, dtype=np.int64)
+    location = np.zeros((count, 3), dtype=np.float64)
+    distance = np.full(count, np.inf, dtype=np.float64)
+    for i, p in enumerate(points.tolist()):
+        loc, _, idx, dist = find_nearest(Vector(p), max_dist)
+        if loc is not None:
+            found[i] = True
+            index[i] = idx
+            location[i] = loc
+            distance[i] = dist
+    return found, index, location, distance
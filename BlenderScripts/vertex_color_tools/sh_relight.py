@@ -0,0 +1,345 @@
+# sh_relight.py
+import math
+import bpy
+import numpy as np
+from bpy.app.handlers import persistent
+from bpy.props import StringProperty, FloatProperty, FloatVectorProperty, BoolProperty, IntProperty, PointerProperty
+from mathutils import Vector
+from . import config
+from . import chunked_executor
+from . import mesh_arrays
+from . import ray_engine
+
+# Per-mesh transfer vectors: mesh name -> (N, 9) transfer
+_transfer_cache = {}
+
+# Clamped-cosine convolution weights per band (pi, 2pi/3, pi/4)
+BAND_SCALE = np.array([math.pi] + [2.0 * math.pi / 3.0] * 3 + [math.pi / 4.0] * 5, dtype=np.float64)
+
+
+# Core logic
+def sh_basis(dirs):
+    """Real order-2 spherical harmonics (9 per direction) for unit vectors (M, 3)."""
+    x, y, z = dirs[:, 0], dirs[:, 1], dirs[:, 2]
+    return np.column_stack((
+        np.full(len(dirs), 0.282095),
+        0.488603 * y,
+        0.488603 * z,
+        0.488603 * x,
+        1.092548 * x * y,
+        1.092548 * y * z,
+        0.315392 * (3.0 * z * z - 1.0),
+        1.092548 * x * z,
+        0.546274 * (x * x - y * y),
+    ))
+
+
+def sphere_directions(count):
+    """Evenly spread unit vectors (Fibonacci sphere)."""
+    i = np.arange(count) + 0.5
+    z = 1.0 - 2.0 * i / count
+    r = np.sqrt(np.clip(1.0 - z * z, 0.0, None))
+    phi = i * math.pi * (3.0 - math.sqrt(5.0))
+    return np.column_stack((r * np.cos(phi), r * np.sin(phi), z))
+
+
+def transfer_unshadowed(normals):
+    return sh_basis(normals) * BAND_SCALE
+
+
+def transfer_shadowed(coords, normals, bvh, samples=64, bias=0.001):
+    """Monte Carlo projection of visibility * clamped cosine onto the SH basis.
+
+    Runs on one thread: the visibility rays are a Python loop over BVHTree.ray_cast
+    that holds the GIL, so a thread pool would not speed it up.
+    """
+    dirs = sphere_directions(samples)
+    basis = sh_basis(dirs) * (4.0 * math.pi / samples)
+
+    def project_chunk(start, stop):
+        co = coords[start:stop]
+        no = normals[start:stop]
+        cosines = np.clip(no @ dirs.T, 0.0, None)
+
+        vertex, sample = np.nonzero(cosines > 0.0)
+        origins = co[vertex] + no[vertex] * bias
+        blocked = ray_engine.ray_hits(bvh, origins, dirs[sample],
+                                      np.full(len(vertex), ray_engine.MAX_DISTANCE))
+        cosines[vertex[blocked], sample[blocked]] = 0.0
+        return cosines @ basis
+
+    parts = chunked_executor.map_chunks(project_chunk, len(coords), chunk_size=1024, workers=1)
+    return np.concatenate(parts) if parts else np.zeros((0, 9))
+
+
+def light_coefficients(direction, color, ambient):
+    """SH radiance (9, 3) of a directional light plus a uniform ambient term."""
+    coeffs = sh_basis(np.asarray(direction, dtype=np.float64)[None])[0][:, None] * np.asarray(color)[None]
+    # Uniform radiance a projects to a * 2 * sqrt(pi); scaled so the irradiance equals a
+    coeffs[0] += np.asarray(ambient) * 2.0 / math.sqrt(math.pi)
+    return coeffs
+
+
+def light_direction(props, obj):
+    """Direction towards the light in the object's local space."""
+    if props.light_object is not None:
+        world_dir = props.light_object.matrix_world.to_3x3() @ Vector((0.0, 0.0, 1.0))
+    else:
+        world_dir = Vector(props.light_direction)
+    local_dir = obj.matrix_world.to_3x3().inverted_safe() @ world_dir
+    if local_dir.length == 0:
+        return None
+    return np.array(local_dir.normalized())
+
+
+def relight(obj, props):
+    """Write the cached transfer lit by the current light settings. Returns False without a cache."""
+    mesh = obj.data
+    transfer = _transfer_cache.get(mesh.name_full)
+    if transfer is None or len(transfer) != len(mesh.vertices):
+        return False
+
+    direction = light_direction(props, obj)
+    if direction is None:
+        return False
+
+    coeffs = light_coefficients(direction, np.array(props.light_color) * props.light_intensity,
+                                np.array(props.ambient))
+    colors = np.ones((len(mesh.vertices), 4), dtype=np.float32)
+    colors[:, :3] = np.clip(transfer @ coeffs, 0.0, 1.0)
+
+    layer_name = props.layer_name.strip() or "SH Light"
+    if layer_name not in mesh.color_attributes:
+        mesh.color_attributes.new(name=layer_name, type='FLOAT_COLOR', domain='POINT')
+    color_layer = mesh.color_attributes[layer_name]
+    mesh_arrays.write_colors(color_layer, colors)
+    mesh.color_attributes.active_color = color_layer
+    mesh.update()
+    return True
+
+
+def _live_relight(context):
+    props = context.scene.sh_relight_props
+    obj = context.view_layer.objects.active
+    if props.live_update and obj is not None and obj.type == 'MESH' and obj.mode == 'OBJECT':
+        relight(obj, props)
+
+
+def _on_light_changed(self, context):
+    _live_relight(context)
+
+
+@persistent
+def _on_depsgraph_update(scene, depsgraph):
+    props = scene.sh_relight_props
+    if not props.live_update or props.light_object is None:
+        return
+    for update in depsgraph.updates:
+        if update.id.original == props.light_object and update.is_updated_transform:
+            _live_relight(bpy.context)
+            return
+
+
+# Operators
+class SH_RELIGHT_OT_precompute(bpy.types.Operator):
+    bl_idname = "object.sh_relight_precompute"
+    bl_label = "Precompute Transfer"
+    bl_description = "Precompute per-vertex spherical harmonic transfer for fast relighting"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    def execute(self, context):
+        obj = context.object
+        if obj is None or obj.type != 'MESH':
+            self.report({'ERROR'}, "Select a mesh object")
+            return {'CANCELLED'}
+
+        if obj.mode != 'OBJECT':
+            bpy.ops.object.mode_set(mode='OBJECT')
+
+        props = context.scene.sh_relight_props
+        mesh = obj.data
+        coords = mesh_arrays.read_vertex_coords(mesh).astype(np.float64)
+        normals = mesh_arrays.read_vertex_normals(mesh).astype(np.float64)
+
+        if props.use_visibility:
+            bvh = ray_engine.build_bvh(coords, mesh_arrays.read_triangles(mesh))
+            transfer = transfer_shadowed(coords, normals, bvh, props.samples, props.bias)
+        else:
+            transfer = transfer_unshadowed(normals)
+
+        _transfer_cache[mesh.name_full] = transfer.astype(np.float32)
+        relight(obj, props)
+
+        self.report({'INFO'}, f"SH transfer cached for {len(coords)} vertices")
+        return {'FINISHED'}
+
+
+class SH_RELIGHT_OT_apply(bpy.types.Operator):
+    bl_idname = "object.sh_relight_apply"
+    bl_label = "Relight"
+    bl_description = "Light the cached transfer with the current light settings"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    def execute(self, context):
+        obj = context.object
+        if obj is None or obj.type != 'MESH':
+            self.report({'ERROR'}, "Select a mesh object")
+            return {'CANCELLED'}
+
+        if obj.mode != 'OBJECT':
+            bpy.ops.object.mode_set(mode='OBJECT')
+
+        if not relight(obj, context.scene.sh_relight_props):
+            self.report({'ERROR'}, "No transfer cached for this mesh, precompute first")
+            return {'CANCELLED'}
+        return {'FINISHED'}
+
+
+class SH_RELIGHT_OT_clear_cache(bpy.types.Operator):
+    bl_idname = "object.sh_relight_clear_cache"
+    bl_label = "Clear SH Cache"
+    bl_description = "Free all cached transfer vectors"
+
+    def execute(self, context):
+        _transfer_cache.clear()
+        return {'FINISHED'}
+
+
+# Panel
+class SH_RELIGHT_PT_panel(bpy.types.Panel):
+    bl_label = "SH Relight"
+    bl_idname = "SH_RELIGHT_PT_panel"
+    bl_parent_id = config.MAIN_PANEL_ID
+    bl_space_type = 'VIEW_3D'
+    bl_region_type = 'UI'
+    bl_category = config.BL_CATEGORY
+    bl_options = {'DEFAULT_CLOSED'}
+
+    def draw(self, context):
+        layout = self.layout
+        props = context.scene.sh_relight_props
+        obj = context.object
+
+        layout.prop(props, "layer_name", icon='GROUP_VCOL')
+
+        box = layout.box()
+        box.prop(props, "use_visibility")
+        if props.use_visibility:
+            col = box.column(align=True)
+            col.prop(props, "samples")
+            col.prop(props, "bias")
+        box.operator(SH_RELIGHT_OT_precompute.bl_idname, icon='LIGHTPROBE_SPHERE')
+
+        cached = obj is not None and obj.type == 'MESH' and obj.data.name_full in _transfer_cache
+        row = box.row()
+        row.label(text="Transfer cached" if cached else "No transfer cached",
+                  icon='CHECKMARK' if cached else 'INFO')
+        row.operator(SH_RELIGHT_OT_clear_cache.bl_idname, text="", icon='TRASH')
+
+        layout.prop(props, "light_object")
+        if props.light_object is None:
+            layout.prop(props, "light_direction")
+        layout.prop(props, "light_color")
+        layout.prop(props, "light_intensity")
+        layout.prop(props, "ambient")
+        layout.prop(props, "live_update")
+        layout.operator(SH_RELIGHT_OT_apply.bl_idname, icon='LIGHT_SUN')
+
+
+# Property Group
+class SHRelightProperties(bpy.types.PropertyGroup):
+    layer_name: StringProperty(
+        name="Layer",
+        default="SH Light",
+        description="Name of the vertex color layer to write the relit result into"
+    )
+    use_visibility: BoolProperty(
+        name="Self Shadowing",
+        description="Include visibility from BVH rays in the transfer (slower precompute)",
+        default=False
+    )
+    samples: IntProperty(
+        name="Samples",
+        description="Sphere directions per vertex for the visibility integral",
+        default=64,
+        min=8,
+        max=1024
+    )
+    bias: FloatProperty(
+        name="Normal Offset",
+        description="Distance visibility rays start above the surface",
+        default=0.001,
+        min=0.0,
+        max=1.0,
+        precision=4
+    )
+    light_object: PointerProperty(
+        name="Light Object",
+        type=bpy.types.Object,
+        poll=lambda self, obj: obj.type == 'LIGHT',
+        description="Take the direction from this light, relights live while it is rotated",
+        update=_on_light_changed
+    )
+    light_direction: FloatVectorProperty(
+        name="Direction",
+        description="World space direction towards the light",
+        default=(0.0, 0.0, 1.0),
+        subtype='DIRECTION',
+        size=3,
+        update=_on_light_changed
+    )
+    light_color: FloatVectorProperty(
+        name="Color",
+        subtype='COLOR',
+        size=3,
+        min=0.0,
+        max=1.0,
+        default=(1.0, 1.0, 1.0),
+        update=_on_light_changed
+    )
+    light_intensity: FloatProperty(
+        name="Intensity",
+        default=1.0,
+        min=0.0,
+        max=10.0,
+        update=_on_light_changed
+    )
+    ambient: FloatVectorProperty(
+        name="Ambient",
+        subtype='COLOR',
+        size=3,
+        min=0.0,
+        max=1.0,
+        default=(0.1, 0.1, 0.1),
+        description="Uniform environment light",
+        update=_on_light_changed
+    )
+    live_update: BoolProperty(
+        name="Live Update",
+        description="Relight the active object whenever the light settings or light object change",
+        default=True
+    )
+
+
+# Registration
+classes = (
+    SHRelightProperties,
+    SH_RELIGHT_OT_precompute,
+    SH_RELIGHT_OT_apply,
+    SH_RELIGHT_OT_clear_cache,
+    SH_RELIGHT_PT_panel,
+)
+
+def register():
+    for cls in classes:
+        bpy.utils.register_class(cls)
+    bpy.types.Scene.sh_relight_props = PointerProperty(type=SHRelightProperties)
+    bpy.app.handlers.depsgraph_update_post.append(_on_depsgraph_update)
+
+def unregister():
+    if _on_depsgraph_update in bpy.app.handlers.depsgraph_update_post:
+        bpy.app.handlers.depsgraph_update_post.remove(_on_depsgraph_update)
+    for cls in reversed(classes):
+        bpy.utils.unregister_class(cls)
+    del bpy.types.Scene.sh_relight_props
+    _transfer_cache.clear()
@@ -0,0 +1,178 @@
+# thickness.py
+import bpy
+import numpy as np
+from bpy.props import StringProperty, IntProperty, FloatProperty, BoolProperty, PointerProperty
+from . import config
+from . import ao_engine
+from . import mesh_arrays
+from . import progressive
+from . import ray_engine
+
+# Operator
+
+class THICKNESS_OT_bake(progressive.ProgressiveBakeMixin, bpy.types.Operator):
+    bl_idname = "object.thickness_bake"
+    bl_label = "Bake Thickness"
+    bl_description = ("Bake local thickness (inverted AO) from rays cast into the mesh, "
+                      "for subsurface and translucency masks (ESC stops early)")
+    bl_options = {'REGISTER', 'UNDO'}
+
+    def start(self, context):
+        obj = context.object
+        if obj is None or obj.type != 'MESH':
+            self.report({'ERROR'}, "Select a mesh object")
+            return False
+
+        settings = context.scene.thickness_settings
+        self.layer_name = settings.layer_name.strip()
+        if not self.layer_name:
+            self.report({'ERROR'}, "Result layer name cannot be empty")
+            return False
+
+        if obj.mode != 'OBJECT':
+            bpy.ops.object.mode_set(mode='OBJECT')
+
+        coords, normals, occluder_coords, tris = mesh_arrays.read_ray_inputs(
+            obj, context.evaluated_depsgraph_get())
+        if len(tris) == 0:
+            self.report({'ERROR'}, "Mesh has no faces")
+            return False
+
+        self.obj = obj
+        self.settings = settings
+        self.coords = coords.astype(np.float64)
+        # Rays leave through the back of the surface, into the volume
+        self.inward = -normals.astype(np.float64)
+        self.bvh = ray_engine.build_bvh(occluder_coords, tris)
+        self.total = np.zeros(len(coords))
+        self.rays = 0
+        self.passes_done = 0
+
+        mesh = obj.data
+        if self.layer_name not in mesh.color_attributes:
+            mesh.color_attributes.new(name=self.layer_name, type='FLOAT_COLOR', domain='POINT')
+        return True
+
+    def run_pass(self, context):
+        s = self.settings
+        summed, rays = ao_engine.hit_distance_pass(self.bvh, self.coords, self.inward, s.samples,
+                                                   s.max_distance, s.seed + self.passes_done,
+                                                   s.bias)
+        self.total += summed
+        self.rays += rays
+        self.passes_done += 1
+        self.write_result()
+        return self.passes_done >= s.passes
+
+    def write_result(self):
+        thickness = self.total / (max(self.rays, 1) * self.settings.max_distance)
+        if self.settings.invert:
+            thickness = 1.0 - thickness
+        mesh = self.obj.data
+        mesh_arrays.write_colors(mesh.color_attributes[self.layer_name],
+                                 mesh_arrays.gray_to_rgba(np.clip(thickness, 0.0, 1.0)))
+        mesh.update()
+
+    def progress_text(self):
+        return f"Thickness: pass {self.passes_done}/{self.settings.passes}, {self.rays} rays per vertex"
+
+    def finish(self, context):
+        mesh = self.obj.data
+        mesh.color_attributes.active_color = mesh.color_attributes[self.layer_name]
+        self.report({'INFO'}, f"Thickness baked to '{self.layer_name}' with {self.rays} rays per vertex")
+
+
+# Panel
+
+class THICKNESS_PT_panel(bpy.types.Panel):
+    bl_label = "Thickness"
+    bl_idname = "THICKNESS_PT_panel"
+    bl_parent_id = config.MAIN_PANEL_ID
+    bl_space_type = 'VIEW_3D'
+    bl_region_type = 'UI'
+    bl_category = config.BL_CATEGORY
+    bl_options = {'DEFAULT_CLOSED'}
+
+    def draw(self, context):
+        layout = self.layout
+        settings = context.scene.thickness_settings
+
+        layout.prop(settings, "layer_name", icon='GROUP_VCOL')
+        layout.prop(settings, "max_distance")
+        layout.prop(settings, "invert")
+
+        col = layout.column(align=True)
+        col.prop(settings, "samples")
+        col.prop(settings, "passes")
+        col.prop(settings, "seed")
+        col.prop(settings, "bias")
+        layout.operator(THICKNESS_OT_bake.bl_idname, icon='MOD_SOLIDIFY')
+
+
+# Property Group
+
+class ThicknessSettings(bpy.types.PropertyGroup):
+    layer_name: StringProperty(
+        name="Result Layer",
+        default="Thickness",
+        description="Name of the vertex color layer to write thickness into"
+    )
+    max_distance: FloatProperty(
+        name="Max Distance",
+        description="Thickness that maps to white (object space); rays that travel further count as this",
+        default=0.5,
+        min=0.001,
+        soft_max=100.0,
+        subtype='DISTANCE'
+    )
+    invert: BoolProperty(
+        name="Invert",
+        description="White where the mesh is thin, as translucency masks usually expect",
+        default=False
+    )
+    samples: IntProperty(
+        name="Samples per Pass",
+        description="Cosine-weighted rays per vertex in every pass (rounded to a square)",
+        default=16,
+        min=1,
+        max=1024
+    )
+    passes: IntProperty(
+        name="Passes",
+        description="Progressive passes, the layer is updated after each one",
+        default=4,
+        min=1,
+        max=256
+    )
+    seed: IntProperty(
+        name="Seed",
+        default=0,
+        min=0
+    )
+    bias: FloatProperty(
+        name="Normal Offset",
+        description="Distance rays start below the surface",
+        default=0.001,
+        min=0.0,
+        max=1.0,
+        precision=4
+    )
+
+
+# Registration
+
+classes = (
+    ThicknessSettings,
+    THICKNESS_OT_bake,
+    THICKNESS_PT_panel,
+)
+
+def register():
+    for cls in classes:
+        bpy.utils.register_class(cls)
+    bpy.types.Scene.thickness_settings = PointerProperty(type=ThicknessSettings)
+
+def unregister():
+    for cls in reversed(classes):
+        bpy.utils.unregister_class(cls)
+    del bpy.types.Scene.thickness_settings
@@ -0,0 +1,58 @@
+# ao_worker.py
+# Runs inside a background Blender:
+#   blender -b --factory-startup --python ao_worker.py -- <job.npz> <result.npy>
+# Progress goes to stdout as "VCT_AO <message>" lines, everything else Blender prints is ignored.
+import importlib
+import os
+import sys
+import traceback
+import numpy as np
+
+PREFIX = "VCT_AO"
+
+
+def send(*parts):
+    print(PREFIX, *parts, flush=True)
+
+
+def load_engine():
+    # Import the add-on package by folder name so the worker follows wherever it is installed
+    addon_dir = os.path.dirname(os.path.abspath(__file__))
+    sys.path.insert(0, os.path.dirname(addon_dir))
+    package = os.path.basename(addon_dir)
+    return importlib.import_module(package + ".ao_engine"), importlib.import_module(package + ".ray_engine")
+
+
+def main(job_path, result_path):
+    ao_engine, ray_engine = load_engine()
+    with np.load(job_path) as job:
+        data = {name: job[name] for name in job.files}
+
+    bvh = ray_engine.build_bvh(data["occluder_coords"], data["triangles"])
+    ao = ao_engine.RaycastAO(bvh, data["coords"], data["normals"], float(data["max_distance"]),
+                             float(data["bias"]), int(data["seed"]))
+
+    samples, passes = int(data["samples"]), int(data["passes"])
+    # A tolerance of 0 means fixed passes, otherwise adaptive up to the ray budget
+    tolerance, budget = float(data["tolerance"]) or None, int(data["budget"])
+    done = False
+    while not done:
+        done = ao.step(samples, passes, tolerance, budget)
+        if tolerance is None:
+            send("PROGRESS", ao.passes, passes)
+        else:
+            send("PROGRESS", ao.total_rays // len(ao.coords), budget // len(ao.coords))
+
+    partial = result_path + ".partial.npy"
+    np.save(partial, ao.result().astype(np.float32))
+    os.replace(partial, result_path)
+    send("DONE")
+
+
+if __name__ == "__main__":
+    argv = sys.argv[sys.argv.index("--") + 1:]
+    try:
+        main(*argv[:2])
+    except Exception:
+        send("ERROR", traceback.format_exc().strip().splitlines()[-1])
+        sys.exit(1)
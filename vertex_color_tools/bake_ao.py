@@ -1,8 +1,156 @@
 # bake_ao.py
+import time
 import bpy
+import numpy as np
 from . import config
+from . import ao_background
+from . import ao_cache
+from . import ao_engine
+from . import mesh_arrays
+from . import progressive
+from . import ray_engine
 
 
+# Cycles bake setup
+# (owner path, attribute) pairs the bake changes, restored afterwards
+BAKE_SETTINGS = (
+    ("render", "engine"),
+    ("cycles", "bake_type"),
+    ("render.bake", "use_pass_direct"),
+    ("render.bake", "use_pass_indirect"),
+    ("render.bake", "target"),
+    ("render.bake", "use_clear"),
+    ("render.bake", "use_selected_to_active"),
+    ("render.bake", "margin"),
+)
+
+
+def _settings_owner(scene, path):
+    owner = scene
+    for part in path.split("."):
+        owner = getattr(owner, part)
+    return owner
+
+
+def save_bake_settings(scene):
+    saved = []
+    for path, attr in BAKE_SETTINGS:
+        owner = _settings_owner(scene, path)
+        saved.append((owner, attr, getattr(owner, attr)))
+    return saved
+
+
+def restore_bake_settings(saved):
+    for owner, attr, value in saved:
+        setattr(owner, attr, value)
+
+
+def configure_cycles_ao(scene):
+    scene.render.engine = 'CYCLES'
+    scene.cycles.bake_type = 'AO'
+    bake = scene.render.bake
+    bake.use_pass_direct = False
+    bake.use_pass_indirect = False
+    bake.target = 'VERTEX_COLORS'
+    bake.use_clear = True
+    bake.use_selected_to_active = False
+    bake.margin = 1
+
+
+def ensure_bake_layer(mesh, layer_name):
+    """Create the POINT color layer if needed and make it the one Cycles bakes into."""
+    if layer_name not in mesh.color_attributes:
+        mesh.color_attributes.new(name=layer_name, type='FLOAT_COLOR', domain='POINT')
+    mesh.color_attributes.active_color = mesh.color_attributes[layer_name]
+
+
+# Ray cast input
+def raycast_schedule(settings, vertex_count):
+    """Arguments for RaycastAO.step: (samples, passes, tolerance, total ray budget)."""
+    if settings.use_adaptive:
+        return settings.samples, settings.passes, settings.tolerance, settings.ray_budget * vertex_count
+    return settings.samples, settings.passes, None, None
+
+
+# Disk cache
+def world_bounds(obj):
+    corners = ray_engine.transform_points(obj.matrix_world, np.array(obj.bound_box, dtype=np.float64))
+    return corners.min(axis=0), corners.max(axis=0)
+
+
+def nearby_occluders(obj, scene, depsgraph, distance):
+    """Fingerprint of the other visible meshes within the AO distance of obj's bounds.
+
+    Cycles traces against the whole scene, so these are part of a Cycles bake's inputs.
+    """
+    low, high = world_bounds(obj)
+    occluders = []
+    for other in scene.objects:
+        if other == obj or other.type != 'MESH' or not other.visible_get():
+            continue
+        other_low, other_high = world_bounds(other)
+        gap = np.maximum(np.maximum(other_low - high, low - other_high), 0.0)
+        if np.linalg.norm(gap) > distance:
+            continue
+        coords, _, tris = mesh_arrays.read_evaluated(other, depsgraph)
+        occluders.append((other.name_full, tuple(tuple(row) for row in other.matrix_world),
+                          ao_cache.bake_key(coords, tris, (), ())))
+    return tuple(sorted(occluders))
+
+
+def disk_cache_key(obj, scene, settings, engine, coords, tris, occluders=()):
+    """Cache key for baking obj with engine ('CYCLES' or 'RAYCAST', the one producing the data,
+    not the panel's choice); coords and tris are the evaluated mesh, occluders the
+    nearby_occluders fingerprint for Cycles."""
+    modifiers = tuple((m.type, m.name, m.show_viewport, m.show_render) for m in obj.modifiers)
+    if engine == 'RAYCAST':
+        params = ('RAYCAST', settings.samples, settings.max_distance, settings.bias, settings.seed)
+        if settings.use_adaptive:
+            params += ('ADAPTIVE', settings.tolerance, settings.ray_budget)
+        else:
+            params += (settings.passes,)
+    else:
+        # Cycles also sees the rest of the scene: the nearby meshes are keyed as well
+        world = scene.world
+        distance = world.light_settings.distance if world else None
+        params = ('CYCLES', scene.cycles.samples, distance,
+                  tuple(tuple(row) for row in obj.matrix_world), occluders)
+    return ao_cache.bake_key(coords, tris, modifiers, (len(obj.data.vertices),) + params)
+
+
+def evaluated_cache_key(obj, context, settings, engine):
+    depsgraph = context.evaluated_depsgraph_get()
+    coords, _, tris = mesh_arrays.read_evaluated(obj, depsgraph)
+    occluders = ()
+    if engine == 'CYCLES':
+        world = context.scene.world
+        distance = world.light_settings.distance if world else np.inf
+        occluders = nearby_occluders(obj, context.scene, depsgraph, distance)
+    return disk_cache_key(obj, context.scene, settings, engine, coords, tris, occluders)
+
+
+def cache_directory(settings):
+    return bpy.path.abspath(settings.cache_dir) if settings.cache_dir else ""
+
+
+def restore_from_cache(obj, layer_name, key, settings):
+    mesh = obj.data
+    colors = ao_cache.load(cache_directory(settings), key, len(mesh.vertices))
+    if colors is None:
+        return False
+    ensure_bake_layer(mesh, layer_name)
+    mesh_arrays.write_colors(mesh.color_attributes[layer_name], colors)
+    mesh.update()
+    return True
+
+
+def store_in_cache(obj, layer_name, key, settings):
+    color_layer = obj.data.color_attributes.get(layer_name)
+    if color_layer is None or color_layer.domain != 'POINT':
+        return
+    ao_cache.store(cache_directory(settings), key, mesh_arrays.read_colors(color_layer),
+                   settings.cache_size_mb * 1024 * 1024)
+
 
 # Property Group
 class AOBakeSettings(bpy.types.PropertyGroup):
@@ -11,6 +159,95 @@ class AOBakeSettings(bpy.types.PropertyGroup):
         default="AO",
         description="Name of the vertex color layer to bake AO into"
     )
+    engine: bpy.props.EnumProperty(
+        name="Engine",
+        description="What computes the occlusion",
+        items=[
+            ('CYCLES', "Cycles", "Bake through Cycles, render settings are set up and restored"),
+            ('RAYCAST', "Ray Cast", "Trace hemisphere rays against a BVH of the evaluated mesh on the CPU"),
+        ],
+        default='CYCLES'
+    )
+    samples: bpy.props.IntProperty(
+        name="Samples per Pass",
+        description="Cosine-weighted rays per vertex in every pass (rounded to a square)",
+        default=16,
+        min=1,
+        max=1024
+    )
+    passes: bpy.props.IntProperty(
+        name="Passes",
+        description="Progressive passes, the layer is updated after each one",
+        default=4,
+        min=1,
+        max=256
+    )
+    use_adaptive: bpy.props.BoolProperty(
+        name="Adaptive",
+        description="After the first pass, only trace more rays where the AO estimate is still uncertain",
+        default=False
+    )
+    tolerance: bpy.props.FloatProperty(
+        name="Tolerance",
+        description="Vertices stop receiving rays once their 95% confidence interval is narrower than this",
+        default=0.05,
+        min=0.001,
+        max=0.5,
+        precision=3
+    )
+    ray_budget: bpy.props.IntProperty(
+        name="Ray Budget",
+        description="Upper bound on rays per vertex, averaged over the mesh",
+        default=256,
+        min=1,
+        max=65536
+    )
+    max_distance: bpy.props.FloatProperty(
+        name="Max Distance",
+        description="Occluders further away than this (object space) are ignored",
+        default=1.0,
+        min=0.001,
+        soft_max=100.0,
+        subtype='DISTANCE'
+    )
+    bias: bpy.props.FloatProperty(
+        name="Normal Offset",
+        description="Distance rays start above the surface",
+        default=0.001,
+        min=0.0,
+        max=1.0,
+        precision=4
+    )
+    seed: bpy.props.IntProperty(
+        name="Seed",
+        default=0,
+        min=0
+    )
+    background_jobs: bpy.props.IntProperty(
+        name="Background Jobs",
+        description="Background Blender processes baking at the same time",
+        default=2,
+        min=1,
+        max=64
+    )
+    use_disk_cache: bpy.props.BoolProperty(
+        name="Disk Cache",
+        description="Reuse earlier bakes of identical geometry and settings from disk",
+        default=False
+    )
+    cache_dir: bpy.props.StringProperty(
+        name="Cache Directory",
+        description="Where cached bakes are stored (empty = system temp directory)",
+        default="",
+        subtype='DIR_PATH'
+    )
+    cache_size_mb: bpy.props.IntProperty(
+        name="Cache Size (MB)",
+        description="Least recently used bakes are deleted beyond this size",
+        default=512,
+        min=1,
+        max=1024 * 1024
+    )
 
 
 # Operator
@@ -26,53 +263,36 @@ class AO_BAKE_OT_vertex_color(bpy.types.Operator):
             self.report({'ERROR'}, "Select a mesh object")
             return {'CANCELLED'}
 
-        layer_name = context.scene.ao_bake_settings.layer_name
+        settings = context.scene.ao_bake_settings
+        layer_name = settings.layer_name
+
+        # Ensure in Object mode
+        bpy.ops.object.mode_set(mode='OBJECT')
+
+        key = None
+        if settings.use_disk_cache:
+            key = evaluated_cache_key(obj, context, settings, 'CYCLES')
+            if restore_from_cache(obj, layer_name, key, settings):
+                self.report({'INFO'}, f"AO restored from cache to layer '{layer_name}'.")
+                return {'FINISHED'}
 
         # Save current render engine & bake settings
-        scene = context.scene
-        render = scene.render
-        cycles = scene.cycles
-        bake = render.bake
-
-        old_render_engine = render.engine
-        old_bake_type = cycles.bake_type
-        old_use_pass_direct = bake.use_pass_direct
-        old_use_pass_indirect = bake.use_pass_indirect
-        old_target = bake.target
-        old_use_clear = bake.use_clear
-        old_use_selected_to_active = bake.use_selected_to_active
-        old_margin = bake.margin
+        saved = save_bake_settings(context.scene)
 
         try:
             # Ensure object is selected and active
             obj.select_set(True)
             context.view_layer.objects.active = obj
 
-            # Ensure in Object mode
-            bpy.ops.object.mode_set(mode='OBJECT')
-
-            # Create vertex color layer if it doesn't exist
-            if layer_name not in obj.data.color_attributes:
-                obj.data.color_attributes.new(name=layer_name, type='FLOAT_COLOR', domain='POINT')
-
-            # Set the layer as active
-            obj.data.color_attributes.active_color = obj.data.color_attributes[layer_name]
-
-            # Set Cycles render engine
-            render.engine = 'CYCLES'
-
-            # Bake settings
-            cycles.bake_type = 'AO'
-            bake.use_pass_direct = False
-            bake.use_pass_indirect = False
-            bake.target = 'VERTEX_COLORS'
-            bake.use_clear = True
-            bake.use_selected_to_active = False
-            bake.margin = 1
+            ensure_bake_layer(obj.data, layer_name)
+            configure_cycles_ao(context.scene)
 
             # Run bake
             bpy.ops.object.bake(type='AO')
 
+            if key is not None:
+                store_in_cache(obj, layer_name, key, settings)
+
             self.report({'INFO'}, f"AO bake completed to layer '{layer_name}'.")
 
         except Exception as e:
@@ -80,18 +300,344 @@ class AO_BAKE_OT_vertex_color(bpy.types.Operator):
             return {'CANCELLED'}
 
         finally:
-            # Restore settings
-            render.engine = old_render_engine
-            cycles.bake_type = old_bake_type
-            bake.use_pass_direct = old_use_pass_direct
-            bake.use_pass_indirect = old_use_pass_indirect
-            bake.target = old_target
-            bake.use_clear = old_use_clear
-            bake.use_selected_to_active = old_use_selected_to_active
-            bake.margin = old_margin
+            restore_bake_settings(saved)
+
+        return {'FINISHED'}
+
+
+class AO_BAKE_OT_batch(bpy.types.Operator):
+    bl_idname = "object.ao_bake_vertex_color_batch"
+    bl_label = "Batch Bake AO (Selected)"
+    bl_description = "Bake AO into every selected mesh in one Cycles session"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    def execute(self, context):
+        objects = [o for o in context.selected_objects if o.type == 'MESH']
+        if not objects:
+            self.report({'ERROR'}, "Select at least one mesh object")
+            return {'CANCELLED'}
+
+        settings = context.scene.ao_bake_settings
+        layer_name = settings.layer_name.strip()
+        if not layer_name:
+            self.report({'ERROR'}, "Layer name cannot be empty")
+            return {'CANCELLED'}
+
+        if context.mode != 'OBJECT':
+            bpy.ops.object.mode_set(mode='OBJECT')
+
+        keys = {}
+        cached = []
+        if settings.use_disk_cache:
+            for obj in objects:
+                keys[obj.name] = evaluated_cache_key(obj, context, settings, 'CYCLES')
+                if restore_from_cache(obj, layer_name, keys[obj.name], settings):
+                    cached.append(obj)
+            objects = [obj for obj in objects if obj not in cached]
+            if not objects:
+                self.report({'INFO'}, f"AO restored from cache for all {len(cached)} objects")
+                return {'FINISHED'}
+
+        view_layer = context.view_layer
+        old_active = view_layer.objects.active
+        old_selection = list(context.selected_objects)
+        saved = save_bake_settings(context.scene)
+        timings = {}
+        baked = []
+        failed = []
+
+        try:
+            # Only the meshes to bake stay selected, a selected light or empty fails the whole bake
+            for obj in old_selection:
+                obj.select_set(obj in objects)
+            for obj in objects:
+                ensure_bake_layer(obj.data, layer_name)
+            configure_cycles_ao(context.scene)
+
+            # Cycles bakes every selected object into its own active color attribute in one call
+            view_layer.objects.active = objects[0]
+            start = time.perf_counter()
+            try:
+                bpy.ops.object.bake(type='AO')
+                total = time.perf_counter() - start
+                baked = list(objects)
+                single_call = True
+            except RuntimeError as e:
+                print(f"Batch AO bake failed ({e}), baking objects one by one")
+                single_call = False
+
+            if not single_call:
+                for obj in objects:
+                    for other in objects:
+                        other.select_set(other is obj)
+                    view_layer.objects.active = obj
+                    start = time.perf_counter()
+                    try:
+                        bpy.ops.object.bake(type='AO')
+                        timings[obj.name] = time.perf_counter() - start
+                        baked.append(obj)
+                    except RuntimeError as e:
+                        failed.append(obj.name)
+                        print(f"AO bake failed on '{obj.name}': {e}")
+                total = sum(timings.values())
+
+        finally:
+            restore_bake_settings(saved)
+            for obj in old_selection:
+                obj.select_set(True)
+            view_layer.objects.active = old_active
+
+        for obj in baked:
+            if obj.name in keys:
+                store_in_cache(obj, layer_name, keys[obj.name], settings)
+
+        if single_call:
+            # One call bakes them all, Cycles does not report per-object times
+            print(f"AO baked {', '.join(repr(obj.name) for obj in baked)} in {total:.2f}s (single bake call)")
+        for name, seconds in timings.items():
+            print(f"AO baked '{name}' in {seconds:.2f}s")
+
+        if cached:
+            print(f"AO restored from cache: {', '.join(obj.name for obj in cached)}")
+        if not baked:
+            self.report({'ERROR'}, f"AO bake failed on all {len(objects)} objects, see console")
+            return {'CANCELLED'}
+        if failed:
+            self.report({'WARNING'}, f"AO baked {len(baked)} objects in {total:.1f}s, "
+                                     f"failed: {', '.join(failed)}")
+        else:
+            calls = 1 if single_call else len(objects)
+            self.report({'INFO'}, f"AO baked {len(baked)} objects to '{layer_name}' in {total:.1f}s "
+                                  f"({calls} bake call{'s' if calls > 1 else ''}, {len(cached)} from cache), "
+                                  f"timings in console")
+        return {'FINISHED'}
+
+
+class AO_BAKE_OT_raycast(progressive.ProgressiveBakeMixin, bpy.types.Operator):
+    bl_idname = "object.ao_raycast_vertex_color"
+    bl_label = "Ray Cast AO to Vertex Colors"
+    bl_description = "Trace ambient occlusion on the CPU without touching render settings (ESC stops early)"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    def start(self, context):
+        obj = context.object
+        if obj is None or obj.type != 'MESH':
+            self.report({'ERROR'}, "Select a mesh object")
+            return False
+
+        settings = context.scene.ao_bake_settings
+        self.layer_name = settings.layer_name.strip()
+        if not self.layer_name:
+            self.report({'ERROR'}, "Layer name cannot be empty")
+            return False
+
+        if obj.mode != 'OBJECT':
+            bpy.ops.object.mode_set(mode='OBJECT')
+
+        mesh = obj.data
+        depsgraph = context.evaluated_depsgraph_get()
+        coords, normals, occluder_coords, tris = mesh_arrays.read_ray_inputs(obj, depsgraph)
+        if len(tris) == 0:
+            self.report({'ERROR'}, "Mesh has no faces")
+            return False
+
+        self.obj = obj
+        self.settings = settings
+        self.ao = None
+        self.cache_key = None
+        if settings.use_disk_cache:
+            self.cache_key = disk_cache_key(obj, context.scene, settings, 'RAYCAST', occluder_coords, tris)
+            if restore_from_cache(obj, self.layer_name, self.cache_key, settings):
+                return True
+
+        bvh = ray_engine.build_bvh(occluder_coords, tris)
+        self.ao = ao_engine.RaycastAO(bvh, coords, normals, settings.max_distance,
+                                      settings.bias, settings.seed)
+        self.done = False
+
+        if self.layer_name not in mesh.color_attributes:
+            mesh.color_attributes.new(name=self.layer_name, type='FLOAT_COLOR', domain='POINT')
+        return True
+
+    def run_pass(self, context):
+        if self.ao is None:
+            return True
+        self.done = self.ao.step(*raycast_schedule(self.settings, len(self.ao.coords)))
+        mesh = self.obj.data
+        mesh_arrays.write_colors(mesh.color_attributes[self.layer_name],
+                                 mesh_arrays.gray_to_rgba(self.ao.result()))
+        mesh.update()
+        return self.done
+
+    def progress_text(self):
+        if self.ao is None:
+            return "Ray cast AO: restored from cache"
+        if self.settings.use_adaptive:
+            return (f"Ray cast AO (adaptive): pass {self.ao.passes}, {self.ao.uncertain} vertices uncertain, "
+                    f"{self.ao.total_rays / len(self.ao.coords):.0f}/{self.settings.ray_budget} rays per vertex")
+        return f"Ray cast AO: pass {self.ao.passes}/{self.settings.passes}, {int(self.ao.rays.max())} rays per vertex"
+
+    def finish(self, context):
+        mesh = self.obj.data
+        mesh.color_attributes.active_color = mesh.color_attributes[self.layer_name]
+        if self.ao is None:
+            self.report({'INFO'}, f"Ray cast AO restored from cache to '{self.layer_name}'")
+            return
+        # Only complete bakes are cached, not ones stopped early with ESC
+        if self.cache_key is not None and self.done:
+            store_in_cache(self.obj, self.layer_name, self.cache_key, self.settings)
+        self.report({'INFO'}, f"Ray cast AO written to '{self.layer_name}' "
+                              f"with {self.ao.total_rays / len(self.ao.coords):.0f} rays per vertex on average")
+
 
+class AO_BAKE_OT_clear_cache(bpy.types.Operator):
+    bl_idname = "object.ao_bake_clear_cache"
+    bl_label = "Clear AO Cache"
+    bl_description = "Delete every cached AO bake from the cache directory"
+
+    def execute(self, context):
+        settings = context.scene.ao_bake_settings
+        directory = cache_directory(settings)
+        ao_cache.clear(directory)
+        self.report({'INFO'}, f"AO cache cleared ({ao_cache.resolve_dir(directory)})")
+        return {'FINISHED'}
+
+
+class AO_BAKE_OT_background(bpy.types.Operator):
+    bl_idname = "object.ao_bake_background"
+    bl_label = "Ray Cast AO in Background"
+    bl_description = ("Ray cast AO for the selected meshes in background Blender processes "
+                      "while you keep working (ESC cancels)")
+
+    _timer = None
+
+    def invoke(self, context, event):
+        objects = [o for o in context.selected_objects if o.type == 'MESH']
+        if not objects:
+            self.report({'ERROR'}, "Select at least one mesh object")
+            return {'CANCELLED'}
+
+        settings = context.scene.ao_bake_settings
+        self.layer_name = settings.layer_name.strip()
+        if not self.layer_name:
+            self.report({'ERROR'}, "Layer name cannot be empty")
+            return {'CANCELLED'}
+
+        if context.mode != 'OBJECT':
+            bpy.ops.object.mode_set(mode='OBJECT')
+
+        depsgraph = context.evaluated_depsgraph_get()
+        self.settings = settings
+        self.jobs = []
+        self.cache_keys = {}
+        self.imported = set()
+        self.failed = []
+        cached = 0
+
+        for obj in objects:
+            coords, normals, occluder_coords, tris = mesh_arrays.read_ray_inputs(obj, depsgraph)
+            if len(tris) == 0:
+                self.failed.append(f"{obj.name} (no faces)")
+                continue
+            if settings.use_disk_cache:
+                key = disk_cache_key(obj, context.scene, settings, 'RAYCAST', occluder_coords, tris)
+                if restore_from_cache(obj, self.layer_name, key, settings):
+                    cached += 1
+                    continue
+                self.cache_keys[obj.name] = key
+
+            samples, passes, tolerance, budget = raycast_schedule(settings, len(coords))
+            self.jobs.append(ao_background.BackgroundBake(obj.name, dict(
+                coords=coords, normals=normals, occluder_coords=occluder_coords, triangles=tris,
+                samples=samples, passes=passes, tolerance=tolerance or 0.0, budget=budget or 0,
+                max_distance=settings.max_distance, bias=settings.bias, seed=settings.seed)))
+
+        if not self.jobs:
+            self.report({'INFO'}, f"Nothing to bake, {cached} objects restored from cache")
+            return {'FINISHED'}
+
+        self._launch()
+        wm = context.window_manager
+        self._timer = wm.event_timer_add(0.25, window=context.window)
+        wm.modal_handler_add(self)
+        return {'RUNNING_MODAL'}
+
+    def _launch(self):
+        running = sum(job.state == 'RUNNING' for job in self.jobs)
+        for job in self.jobs:
+            if running >= self.settings.background_jobs:
+                break
+            if job.state == 'PENDING':
+                job.start(bpy.app.binary_path)
+                running += 1
+
+    def _import(self, job):
+        """Write a finished result; False while the object is in edit mode and has to wait."""
+        obj = bpy.data.objects.get(job.name)
+        if obj is None or obj.type != 'MESH' or len(obj.data.vertices) != len(job.result):
+            self.failed.append(f"{job.name} (changed while baking)")
+            return True
+        if obj.mode == 'EDIT':
+            return False
+
+        ensure_bake_layer(obj.data, self.layer_name)
+        mesh_arrays.write_colors(obj.data.color_attributes[self.layer_name],
+                                 mesh_arrays.gray_to_rgba(job.result))
+        obj.data.update()
+        if job.name in self.cache_keys:
+            store_in_cache(obj, self.layer_name, self.cache_keys[job.name], self.settings)
+        return True
+
+    def modal(self, context, event):
+        if event.type == 'ESC':
+            for job in self.jobs:
+                if job.state in {'PENDING', 'RUNNING'}:
+                    job.cancel()
+            self._stop(context)
+            self.report({'WARNING'}, f"Background AO cancelled, {len(self.imported)} objects finished")
+            return {'CANCELLED'}
+
+        if event.type != 'TIMER':
+            return {'PASS_THROUGH'}
+
+        for job in self.jobs:
+            state = job.poll()
+            if job.name in self.imported:
+                continue
+            if state == 'DONE' and self._import(job):
+                self.imported.add(job.name)
+                job.result = None
+            elif state == 'FAILED':
+                self.imported.add(job.name)
+                self.failed.append(f"{job.name} ({job.error})")
+        self._launch()
+
+        if context.area:
+            context.area.header_text_set(self.progress_text())
+        if len(self.imported) < len(self.jobs):
+            return {'PASS_THROUGH'}
+
+        self._stop(context)
+        if self.failed:
+            self.report({'WARNING'}, f"Background AO done, failed: {', '.join(self.failed)}")
+        else:
+            self.report({'INFO'}, f"Background AO written to '{self.layer_name}' on {len(self.jobs)} objects")
         return {'FINISHED'}
 
+    def progress_text(self):
+        running = [f"{job.name} {job.progress[0]}/{job.progress[1]}"
+                   for job in self.jobs if job.state == 'RUNNING']
+        queued = sum(job.state == 'PENDING' for job in self.jobs)
+        return (f"Background AO: {len(self.imported)}/{len(self.jobs)} done, "
+                f"running: {', '.join(running) or '-'}, {queued} queued")
+
+    def _stop(self, context):
+        if self._timer is not None:
+            context.window_manager.event_timer_remove(self._timer)
+            self._timer = None
+        if context.area:
+            context.area.header_text_set(None)
+
 
 # Panel
 class AO_BAKE_PT_panel(bpy.types.Panel):
@@ -108,13 +654,45 @@ class AO_BAKE_PT_panel(bpy.types.Panel):
         settings = context.scene.ao_bake_settings
 
         layout.prop(settings, "layer_name", icon='GROUP_VCOL')
-        layout.operator(AO_BAKE_OT_vertex_color.bl_idname, icon='IPO_EXPO')
+        layout.prop(settings, "engine", expand=True)
+
+        if settings.engine == 'RAYCAST':
+            col = layout.column(align=True)
+            col.prop(settings, "samples")
+            col.prop(settings, "use_adaptive")
+            if settings.use_adaptive:
+                col.prop(settings, "tolerance")
+                col.prop(settings, "ray_budget")
+            else:
+                col.prop(settings, "passes")
+            col.prop(settings, "max_distance")
+            col.prop(settings, "bias")
+            col.prop(settings, "seed")
+            layout.operator(AO_BAKE_OT_raycast.bl_idname, icon='IPO_EXPO')
+            row = layout.row(align=True)
+            row.operator(AO_BAKE_OT_background.bl_idname, icon='SORTTIME')
+            row.prop(settings, "background_jobs", text="")
+        else:
+            layout.operator(AO_BAKE_OT_vertex_color.bl_idname, icon='IPO_EXPO')
+            layout.operator(AO_BAKE_OT_batch.bl_idname, icon='OUTLINER_OB_GROUP_INSTANCE')
+
+        layout.prop(settings, "use_disk_cache")
+        if settings.use_disk_cache:
+            col = layout.column(align=True)
+            col.prop(settings, "cache_dir", text="")
+            row = col.row(align=True)
+            row.prop(settings, "cache_size_mb")
+            row.operator(AO_BAKE_OT_clear_cache.bl_idname, text="", icon='TRASH')
 
 
 # Registration
 classes = (
     AOBakeSettings,
     AO_BAKE_OT_vertex_color,
+    AO_BAKE_OT_batch,
+    AO_BAKE_OT_raycast,
+    AO_BAKE_OT_background,
+    AO_BAKE_OT_clear_cache,
     AO_BAKE_PT_panel,
 )
 
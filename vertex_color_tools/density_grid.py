@@ -0,0 +1,355 @@
+# density_grid.py
+import hashlib
+import itertools
+import multiprocessing
+import os
+import sys
+from multiprocessing import shared_memory
+import numpy as np
+
+# Upper bound on candidate pairs evaluated per NumPy block
+PAIR_BUDGET = 4_000_000
+# Largest neighbor list kept by DensityIndex (pairs, 16 bytes each)
+NEIGHBOR_CACHE_LIMIT = 16_000_000
+# Tiles only run in parallel where worker processes can be forked safely. A spawned child
+# cannot import the add-on (its package imports bpy), Windows cannot fork, and forking the
+# multithreaded Blender process is unsafe on macOS; there the tiles run one after another.
+PARALLEL_TILES = sys.platform.startswith('linux')
+
+
+# Uniform grid
+class SpatialGrid:
+    """Points bucketed into cubic cells, sorted so every cell is one contiguous run."""
+
+    def __init__(self, coords, cell_size, origin=None):
+        self.coords = np.asarray(coords, dtype=np.float64).reshape(-1, 3)
+        self.cell_size = float(cell_size)
+
+        if origin is None:
+            origin = self.coords.min(axis=0) if len(self.coords) else np.zeros(3)
+        self.origin = np.asarray(origin, dtype=np.float64)
+
+        self.cells = np.floor((self.coords - self.origin) / self.cell_size).astype(np.int64)
+        self.dims = self.cells.max(axis=0) + 1 if len(self.cells) else np.ones(3, dtype=np.int64)
+
+        keys = self.cell_key(self.cells)
+        # Stable sort keeps original index order inside a cell, so sums are reproducible
+        self.order = np.argsort(keys, kind='stable')
+        self.cell_keys, self.cell_starts, self.cell_counts = np.unique(
+            keys[self.order], return_index=True, return_counts=True)
+
+    def cell_key(self, cells):
+        return cells[:, 0] + self.dims[0] * (cells[:, 1] + self.dims[1] * cells[:, 2])
+
+    @property
+    def nbytes(self):
+        return sum(a.nbytes for a in (self.coords, self.cells, self.order,
+                                      self.cell_keys, self.cell_starts, self.cell_counts))
+
+    def mean_occupancy(self):
+        return len(self.coords) / max(len(self.cell_keys), 1)
+
+    def candidate_pairs(self, queries, reach=1):
+        """Yield (query_pos, point_idx) for every point in the cells within `reach` of each query.
+
+        query_pos indexes into `queries`; point_idx indexes into the grid coords.
+        """
+        query_cells = self.cells[queries]
+        span = range(-reach, reach + 1)
+
+        for offset in itertools.product(span, span, span):
+            neighbor = query_cells + np.array(offset, dtype=np.int64)
+            inside = np.all((neighbor >= 0) & (neighbor < self.dims), axis=1)
+            query_pos = np.nonzero(inside)[0]
+            if len(query_pos) == 0:
+                continue
+
+            keys = self.cell_key(neighbor[query_pos])
+            slot = np.minimum(np.searchsorted(self.cell_keys, keys), len(self.cell_keys) - 1)
+            found = self.cell_keys[slot] == keys
+            query_pos = query_pos[found]
+            slot = slot[found]
+
+            counts = self.cell_counts[slot]
+            total = int(counts.sum())
+            if total == 0:
+                continue
+
+            run_start = np.cumsum(counts) - counts
+            within = np.arange(total) - np.repeat(run_start, counts)
+            point_idx = self.order[np.repeat(self.cell_starts[slot], counts) + within]
+            yield np.repeat(query_pos, counts), point_idx
+
+    def query_chunks(self, queries, reach=1):
+        """Split queries into blocks whose candidate pairs stay within PAIR_BUDGET."""
+        per_query = (2 * reach + 1) ** 3 * self.mean_occupancy()
+        chunk_size = max(1, int(PAIR_BUDGET / max(per_query, 1.0)))
+        for start in range(0, len(queries), chunk_size):
+            yield queries[start:start + chunk_size]
+
+
+# Density
+def gaussian_densities(coords, radii, grid=None, queries=None):
+    """Gaussian-weighted neighbor sums at several radii from one neighbor search.
+
+    Column k holds the sum of exp(-(d / radii[k])^2) over all points within
+    radii[k], self included. Neighbors are gathered once at the largest radius
+    and every smaller radius is accumulated from the same distances.
+    """
+    radii = np.atleast_1d(np.asarray(radii, dtype=np.float64))
+    max_radius = radii.max()
+    if grid is None:
+        grid = SpatialGrid(coords, max_radius)
+    if queries is None:
+        queries = np.arange(len(grid.coords))
+
+    reach = int(np.ceil(max_radius / grid.cell_size - 1e-9))
+    r2 = radii * radii
+    density = np.zeros((len(queries), len(radii)), dtype=np.float64)
+
+    offset = 0
+    for chunk in grid.query_chunks(queries, reach):
+        acc = np.zeros((len(chunk), len(radii)), dtype=np.float64)
+        chunk_co = grid.coords[chunk]
+        for query_pos, point_idx in grid.candidate_pairs(chunk, reach):
+            d2 = np.sum((chunk_co[query_pos] - grid.coords[point_idx]) ** 2, axis=1)
+            near = d2 <= r2.max()
+            query_pos, d2 = query_pos[near], d2[near]
+            for k in range(len(radii)):
+                inside = d2 <= r2[k]
+                acc[:, k] += np.bincount(query_pos[inside], np.exp(-d2[inside] / r2[k]),
+                                         minlength=len(chunk))
+        density[offset:offset + len(chunk)] = acc
+        offset += len(chunk)
+
+    return density
+
+
+def gaussian_density(coords, radius, grid=None, queries=None):
+    """Sum of exp(-(d / radius)^2) over all points within radius, self included."""
+    return gaussian_densities(coords, [radius], grid=grid, queries=queries)[:, 0]
+
+
+def normalize_by_percentile(values, percentile):
+    """Scale so the given percentile maps to 1.0, clamped to [0, 1]."""
+    ref = np.percentile(values, percentile) if len(values) else 0.0
+    if ref <= 0.0:
+        ref = values.max() if len(values) and values.max() > 0.0 else 1.0
+    return np.clip(values / ref, 0.0, 1.0)
+
+
+# Persistent index
+def coords_fingerprint(coords):
+    coords = np.ascontiguousarray(coords)
+    return (coords.shape, hashlib.blake2b(coords.tobytes(), digest_size=16).hexdigest())
+
+
+class DensityIndex:
+    """Grid, last neighbor list and raw densities kept between runs on unchanged coordinates.
+
+    Changing only the normalisation reuses the raw densities, a smaller radius is
+    re-accumulated from the stored neighbor list and a larger one reuses the grid.
+    """
+
+    def __init__(self, coords, fingerprint):
+        self.coords = np.asarray(coords, dtype=np.float64).reshape(-1, 3)
+        self.fingerprint = fingerprint
+        self.grid = None
+        self.neighbor_radius = 0.0
+        self.neighbors = None  # (query_idx, point_idx, d2)
+        self.overflow_radius = np.inf  # smallest radius whose neighbor list exceeded the limit
+        self.raw = {}  # radius -> density sums
+
+    @property
+    def nbytes(self):
+        total = self.coords.nbytes + sum(d.nbytes for d in self.raw.values())
+        if self.grid is not None:
+            total += self.grid.nbytes - self.grid.coords.nbytes
+        if self.neighbors is not None:
+            total += sum(a.nbytes for a in self.neighbors)
+        return total
+
+    def _grid_for(self, radius):
+        # Too coarse or too fine cells make the neighbor search wasteful, rebuild then
+        if self.grid is None or not (0.25 <= radius / self.grid.cell_size <= 3.0):
+            self.grid = SpatialGrid(self.coords, radius)
+        return self.grid
+
+    def _gather_neighbors(self, radius):
+        grid = self._grid_for(radius)
+        reach = int(np.ceil(radius / grid.cell_size - 1e-9))
+        r2 = radius * radius
+        # Pairs expected on a surface (a disk of cells around each vertex); skip a scan that cannot fit
+        expected = len(self.coords) * grid.mean_occupancy() * np.pi * (radius / grid.cell_size) ** 2
+        if expected > NEIGHBOR_CACHE_LIMIT:
+            return None
+        parts = []
+        stored = 0
+
+        for chunk in grid.query_chunks(np.arange(len(self.coords)), reach):
+            chunk_co = self.coords[chunk]
+            for query_pos, point_idx in grid.candidate_pairs(chunk, reach):
+                d2 = np.sum((chunk_co[query_pos] - self.coords[point_idx]) ** 2, axis=1)
+                inside = d2 <= r2
+                stored += int(inside.sum())
+                if stored > NEIGHBOR_CACHE_LIMIT:
+                    return None
+                parts.append((chunk[query_pos[inside]].astype(np.int32),
+                              point_idx[inside].astype(np.int32), d2[inside]))
+
+        if not parts:
+            empty = np.zeros(0, dtype=np.int32)
+            return empty, empty, np.zeros(0, dtype=np.float64)
+        return tuple(np.concatenate(column) for column in zip(*parts))
+
+    def _from_neighbors(self, radius):
+        query_idx, _, d2 = self.neighbors
+        inside = d2 <= radius * radius
+        return np.bincount(query_idx[inside], np.exp(-d2[inside] / (radius * radius)),
+                           minlength=len(self.coords))
+
+    def densities(self, radii, tile_size=None, workers=0):
+        """Density sums for every radius, shape (N, len(radii)).
+
+        The tiled path matches gaussian_densities bit for bit. The stored
+        neighbor list sums pairs in a different order, so it agrees with the
+        other two paths to float tolerance (around 1e-15), not exactly.
+        """
+        radii = [float(r) for r in radii]
+        missing = [r for r in radii if r not in self.raw]
+
+        if missing and tile_size:
+            computed = tiled_gaussian_densities(self.coords, missing, tile_size, workers)
+            self.raw.update(zip(missing, computed.T))
+        elif missing:
+            radius = max(missing)
+            covered = self.neighbors is not None and radius <= self.neighbor_radius
+            if not covered and radius < self.overflow_radius:
+                neighbors = self._gather_neighbors(radius)
+                if neighbors is None:
+                    # Remembered, so this or a larger radius goes straight to the grid path next time
+                    self.overflow_radius = radius
+                else:
+                    self.neighbors, self.neighbor_radius = neighbors, radius
+                    covered = True
+
+            if covered:
+                for r in missing:
+                    self.raw[r] = self._from_neighbors(r)
+            else:
+                computed = gaussian_densities(None, missing, grid=self._grid_for(radius))
+                self.raw.update(zip(missing, computed.T))
+
+        # Only the current radii are worth keeping
+        self.raw = {r: self.raw[r] for r in radii}
+        return np.column_stack([self.raw[r] for r in radii])
+
+
+# Tiled density over a process pool
+def _tile_density(task):
+    coords_name, out_name, count, origin, radii, members, core_count = task
+
+    coords_shm = shared_memory.SharedMemory(name=coords_name)
+    out_shm = shared_memory.SharedMemory(name=out_name)
+    try:
+        coords = np.ndarray((count, 3), dtype=np.float64, buffer=coords_shm.buf)
+        out = np.ndarray((count, len(radii)), dtype=np.float64, buffer=out_shm.buf)
+
+        grid = SpatialGrid(coords[members], max(radii), origin=origin)
+        out[members[:core_count]] = gaussian_densities(None, radii, grid=grid,
+                                                       queries=np.arange(core_count))
+        del coords, out
+    finally:
+        coords_shm.close()
+        out_shm.close()
+    return core_count
+
+
+def tile_members(cells, tile_cells):
+    """Vertex indices of every tile plus its one-cell halo, computed once from the cells.
+
+    Yields (members, core_count) per tile that owns vertices; the tile's own vertices come
+    first, followed by the vertices of the neighboring tiles' border cells.
+    """
+    tile = cells // tile_cells
+    local = cells - tile * tile_cells
+    low = local == 0
+    high = local == tile_cells - 1
+
+    # A vertex in a tile's border cell also belongs to the halo of the tile across that border
+    border = np.nonzero(np.any(low | high, axis=1))[0]
+    vertex_parts = [np.arange(len(cells))]
+    tile_parts = [tile]
+    for offset in itertools.product((-1, 0, 1), repeat=3):
+        if offset == (0, 0, 0):
+            continue
+        offset = np.array(offset, dtype=np.int64)
+        reaches = np.all((offset == 0) | ((offset < 0) & low[border]) | ((offset > 0) & high[border]),
+                         axis=1)
+        vertex_parts.append(border[reaches])
+        tile_parts.append(tile[border[reaches]] + offset)
+
+    vertices = np.concatenate(vertex_parts)
+    tiles = np.concatenate(tile_parts) + 1  # halo tiles start at -1
+    dims = tiles.max(axis=0) + 1
+    keys = tiles[:, 0] + dims[0] * (tiles[:, 1] + dims[1] * tiles[:, 2])
+    halo = np.arange(len(vertices)) >= len(cells)
+
+    order = np.argsort(keys * 2 + halo, kind='stable')
+    vertices, keys, halo = vertices[order], keys[order], halo[order]
+    _, starts, counts = np.unique(keys, return_index=True, return_counts=True)
+    for start, size in zip(starts.tolist(), counts.tolist()):
+        core_count = size - int(np.count_nonzero(halo[start:start + size]))
+        if core_count:
+            yield vertices[start:start + size], core_count
+
+
+def tiled_gaussian_densities(coords, radii, tile_size, workers=0):
+    """gaussian_densities computed tile by tile in worker processes.
+
+    Every tile is an axis-aligned block of grid cells. Vertices are bucketed into
+    tiles (plus a one-radius halo) once here; each worker gets its tile's index
+    list, reads the shared coordinates and writes the tile's own vertices into the
+    shared output, so the merge is a plain scatter. Cell and summation order follow
+    gaussian_densities, so the result is bit for bit the same. Parallel only where
+    PARALLEL_TILES, elsewhere the tiles run serially.
+    """
+    coords = np.ascontiguousarray(coords, dtype=np.float64).reshape(-1, 3)
+    radii = tuple(float(r) for r in np.atleast_1d(radii))
+    radius = max(radii)
+    count = len(coords)
+    if count == 0:
+        return np.zeros((0, len(radii)), dtype=np.float64)
+
+    origin = coords.min(axis=0)
+    cells = np.floor((coords - origin) / radius).astype(np.int64)
+    tile_cells = max(1, int(round(tile_size / radius)))
+
+    coords_shm = shared_memory.SharedMemory(create=True, size=coords.nbytes)
+    out_shm = shared_memory.SharedMemory(create=True, size=count * len(radii) * 8)
+    try:
+        np.ndarray(coords.shape, dtype=np.float64, buffer=coords_shm.buf)[:] = coords
+        out = np.ndarray((count, len(radii)), dtype=np.float64, buffer=out_shm.buf)
+        out[:] = 0.0
+
+        tasks = [(coords_shm.name, out_shm.name, count, origin, radii, members, core_count)
+                 for members, core_count in tile_members(cells, tile_cells)]
+        del cells
+
+        workers = workers or os.cpu_count() or 1
+        if PARALLEL_TILES and workers > 1 and len(tasks) > 1:
+            with multiprocessing.get_context('fork').Pool(min(workers, len(tasks))) as pool:
+                pool.map(_tile_density, tasks, chunksize=1)
+        else:
+            for task in tasks:
+                _tile_density(task)
+
+        result = out.copy()
+        del out
+    finally:
+        coords_shm.close()
+        coords_shm.unlink()
+        out_shm.close()
+        out_shm.unlink()
+
+    return result
@@ -0,0 +1,287 @@
+# disk_ao.py
+import itertools
+import math
+import bpy
+import numpy as np
+from bpy.props import StringProperty, IntProperty, FloatProperty, PointerProperty
+from . import config
+from . import density_grid
+from . import mesh_arrays
+
+# Core logic
+
+def vertex_disk_areas(mesh):
+    """Each vertex's share of its adjacent polygon areas."""
+    loop_verts = mesh_arrays.read_loop_vertices(mesh)
+    loop_polys = mesh_arrays.read_loop_polygons(mesh)
+    poly_areas = mesh_arrays.read_polygon_areas(mesh).astype(np.float64)
+    corners = np.bincount(loop_polys, minlength=len(poly_areas))
+    share = poly_areas[loop_polys] / np.maximum(corners[loop_polys], 1)
+    return np.bincount(loop_verts, share, minlength=len(mesh.vertices))
+
+
+def disk_occlusion(recv_pos, recv_nrm, emit_pos, emit_nrm, emit_area):
+    """Form factor of an oriented disk seen from a receiver point: A cos_r cos_e / (pi d^2 + A)."""
+    v = emit_pos - recv_pos
+    d2 = np.maximum(np.einsum('ij,ij->i', v, v), 1e-20)
+    # Cosines from the unnormalized v; their product is divided by d2 once
+    cos_r = np.maximum(np.einsum('ij,ij->i', recv_nrm, v), 0.0)
+    cos_e = np.maximum(-np.einsum('ij,ij->i', emit_nrm, v), 0.0)
+    return emit_area * np.minimum(cos_r * cos_e / d2, 1.0) / (math.pi * d2 + emit_area)
+
+
+def _interaction_offsets(reach):
+    """Children of the parent's neighborhood, relative to 2 * parent cell."""
+    span = range(-2 * reach, 2 * reach + 2)
+    return np.array(list(itertools.product(span, span, span)), dtype=np.int64)
+
+
+def _expand_ranges(starts, counts):
+    """Concatenated aranges starts[i] .. starts[i] + counts[i]."""
+    return np.repeat(starts - (np.cumsum(counts) - counts), counts) + np.arange(counts.sum())
+
+
+class _FarLevel:
+    """One octree level: a disk cluster per occupied cell and each cell's interaction list.
+
+    Both depend only on the geometry, so they are built once and reused by every
+    pass; a pass only re-sums the weighted cluster areas.
+    """
+
+    def __init__(self, cells, positions, normals, areas, offsets, reach):
+        dims = cells.max(axis=0) + 1
+        keys = cells[:, 0] + dims[0] * (cells[:, 1] + dims[1] * cells[:, 2])
+        self.keys, first, self.inverse = np.unique(keys, return_index=True, return_inverse=True)
+        self.inverse = self.inverse.ravel()
+        count = len(self.keys)
+
+        total = np.bincount(self.inverse, areas, minlength=count)
+        safe = np.where(total > 0.0, total, 1.0)[:, None]
+        self.position = np.column_stack(
+            [np.bincount(self.inverse, areas * positions[:, k], minlength=count) for k in range(3)]) / safe
+        # Not renormalized: incoherent clusters face the receiver less
+        self.normal = np.column_stack(
+            [np.bincount(self.inverse, areas * normals[:, k], minlength=count) for k in range(3)]) / safe
+
+        # Every vertex of a cell shares its interaction list, so it is gathered once per cell,
+        # in blocks of cells that keep the (cells x offsets) candidates within the pair budget
+        own = cells[first]
+        block = max(1, density_grid.PAIR_BUDGET // len(offsets))
+        list_cell, list_slot = [], []
+        for start in range(0, count, block):
+            cell = np.arange(start, min(start + block, count))
+            target = (((own[cell] >> 1) << 1)[:, None, :] + offsets[None]).reshape(-1, 3)
+            owner = np.repeat(cell, len(offsets))
+            far = (np.any(np.abs(target - own[owner]) > reach, axis=1)
+                   & np.all((target >= 0) & (target < dims), axis=1))
+            target, owner = target[far], owner[far]
+            target_keys = target[:, 0] + dims[0] * (target[:, 1] + dims[1] * target[:, 2])
+            slot = np.minimum(np.searchsorted(self.keys, target_keys), count - 1)
+            found = self.keys[slot] == target_keys
+            list_cell.append(owner[found])
+            list_slot.append(slot[found])
+
+        # Blocks are in cell order, so the lists are already grouped by cell
+        self.list_slot = np.concatenate(list_slot)
+        self.list_count = np.bincount(np.concatenate(list_cell), minlength=count)
+        self.list_start = np.cumsum(self.list_count) - self.list_count
+
+    def occlusion(self, positions, normals, emit_area):
+        """Occlusion of every vertex by the clusters in its cell's interaction list."""
+        count = len(positions)
+        area = np.bincount(self.inverse, emit_area, minlength=len(self.keys))
+        pairs = self.list_count[self.inverse]
+        occlusion = np.zeros(count, dtype=np.float64)
+
+        chunk_size = max(1, int(density_grid.PAIR_BUDGET / max(pairs.mean(), 1.0)))
+        for start in range(0, count, chunk_size):
+            stop = min(start + chunk_size, count)
+            cell = self.inverse[start:stop]
+            recv = np.repeat(np.arange(start, stop), pairs[start:stop])
+            slot = self.list_slot[_expand_ranges(self.list_start[cell], self.list_count[cell])]
+            occ = disk_occlusion(positions[recv], normals[recv], self.position[slot],
+                                 self.normal[slot], area[slot])
+            occlusion[start:stop] = np.bincount(recv - start, occ, minlength=stop - start)
+        return occlusion
+
+
+def far_field_levels(grid, positions, normals, areas, reach=1):
+    """Octree levels above the near field, until the whole mesh is a neighbor."""
+    offsets = _interaction_offsets(reach)
+    levels = []
+    level = 0
+    while np.any((grid.cells.max(axis=0) >> level) + 1 > reach + 1):
+        levels.append(_FarLevel(grid.cells >> level, positions, normals, areas, offsets, reach))
+        level += 1
+    return levels
+
+
+def occlusion_pass(positions, normals, areas, weights, grid, levels, reach=1):
+    """Total occlusion per vertex: exact disks in the nearest cells, clusters further out.
+
+    A cluster is only used once it is more than `reach` cells away at its level,
+    so larger reach trades speed for accuracy.
+    """
+    count = len(positions)
+    emit_area = areas * weights
+    occlusion = np.zeros(count, dtype=np.float64)
+    queries = np.arange(count)
+
+    # Near field, exact disk to point
+    for chunk in grid.query_chunks(queries, reach):
+        acc = np.zeros(len(chunk), dtype=np.float64)
+        for query_pos, point_idx in grid.candidate_pairs(chunk, reach):
+            recv = chunk[query_pos]
+            other = recv != point_idx
+            recv, point_idx, query_pos = recv[other], point_idx[other], query_pos[other]
+            occ = disk_occlusion(positions[recv], normals[recv], positions[point_idx],
+                                 normals[point_idx], emit_area[point_idx])
+            acc += np.bincount(query_pos, occ, minlength=len(chunk))
+        occlusion[chunk] += acc
+
+    # Far field, one interaction list per level
+    for level in levels:
+        occlusion += level.occlusion(positions, normals, emit_area)
+
+    return occlusion
+
+
+def approximate_ao(positions, normals, areas, passes=2, reach=1, disks_per_cell=8.0):
+    """Disk-based ambient occlusion (accessibility, 1 = open) in O(N log N).
+
+    The first pass over-occludes where disks hide behind each other; later passes
+    weight every emitter by its own accessibility, and the last two passes are
+    averaged to cancel the remaining over/under estimate.
+    """
+    positions = np.asarray(positions, dtype=np.float64)
+    count = len(positions)
+    if count == 0:
+        return np.zeros(0)
+
+    cell_size = math.sqrt(disks_per_cell * max(areas.sum(), 1e-12) / count)
+    grid = density_grid.SpatialGrid(positions, cell_size)
+    levels = far_field_levels(grid, positions, normals, areas, reach)
+
+    weights = np.ones(count)
+    results = []
+    for _ in range(max(1, passes)):
+        occlusion = occlusion_pass(positions, normals, areas, weights, grid, levels, reach)
+        accessibility = 1.0 - np.clip(occlusion, 0.0, 1.0)
+        results.append(accessibility)
+        weights = accessibility
+
+    if len(results) == 1:
+        return results[0]
+    return 0.5 * (results[-1] + results[-2])
+
+
+# Operator
+
+class DISK_AO_OT_apply(bpy.types.Operator):
+    bl_idname = "object.disk_ao_vertex_color"
+    bl_label = "Approximate AO"
+    bl_description = "Fast approximate ambient occlusion from oriented vertex disks, no Cycles needed"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    def execute(self, context):
+        obj = context.object
+        if obj is None or obj.type != 'MESH':
+            self.report({'ERROR'}, "Select a mesh object")
+            return {'CANCELLED'}
+
+        settings = context.scene.disk_ao_settings
+        layer_name = settings.layer_name.strip()
+        if not layer_name:
+            self.report({'ERROR'}, "Layer name cannot be empty")
+            return {'CANCELLED'}
+
+        if obj.mode != 'OBJECT':
+            bpy.ops.object.mode_set(mode='OBJECT')
+
+        mesh = obj.data
+        ao = approximate_ao(mesh_arrays.read_vertex_coords(mesh),
+                            mesh_arrays.read_vertex_normals(mesh).astype(np.float64),
+                            vertex_disk_areas(mesh), settings.passes, settings.near_field)
+        ao = np.clip(ao, 0.0, 1.0) ** settings.contrast
+
+        if layer_name not in mesh.color_attributes:
+            mesh.color_attributes.new(name=layer_name, type='FLOAT_COLOR', domain='POINT')
+        color_layer = mesh.color_attributes[layer_name]
+        mesh_arrays.write_colors(color_layer, mesh_arrays.gray_to_rgba(ao))
+        mesh.color_attributes.active_color = color_layer
+        mesh.update()
+
+        self.report({'INFO'}, f"Approximate AO written to '{layer_name}'")
+        return {'FINISHED'}
+
+
+# Panel
+
+class DISK_AO_PT_panel(bpy.types.Panel):
+    bl_label = "Approximate AO"
+    bl_idname = "DISK_AO_PT_panel"
+    bl_parent_id = config.MAIN_PANEL_ID
+    bl_space_type = 'VIEW_3D'
+    bl_region_type = 'UI'
+    bl_category = config.BL_CATEGORY
+    bl_options = {'DEFAULT_CLOSED'}
+
+    def draw(self, context):
+        layout = self.layout
+        settings = context.scene.disk_ao_settings
+
+        layout.prop(settings, "layer_name", icon='GROUP_VCOL')
+        layout.prop(settings, "passes")
+        layout.prop(settings, "near_field")
+        layout.prop(settings, "contrast")
+        layout.operator(DISK_AO_OT_apply.bl_idname, icon='SHADING_SOLID')
+
+
+# Property Group
+
+class DiskAOSettings(bpy.types.PropertyGroup):
+    layer_name: StringProperty(
+        name="Layer",
+        default="AO",
+        description="Name of the vertex color layer to write AO into"
+    )
+    passes: IntProperty(
+        name="Passes",
+        description="1 is fastest; 2-3 correct double occlusion where surfaces hide behind each other",
+        default=2,
+        min=1,
+        max=4
+    )
+    near_field: IntProperty(
+        name="Near Field",
+        description="Cells around each vertex evaluated with exact disks, higher is much slower and more accurate",
+        default=1,
+        min=1,
+        max=3
+    )
+    contrast: FloatProperty(
+        name="Contrast",
+        description="Exponent applied to the result",
+        default=1.0,
+        min=0.1,
+        max=8.0
+    )
+
+
+# Registration
+
+classes = (
+    DiskAOSettings,
+    DISK_AO_OT_apply,
+    DISK_AO_PT_panel,
+)
+
+def register():
+    for cls in classes:
+        bpy.utils.register_class(cls)
+    bpy.types.Scene.disk_ao_settings = PointerProperty(type=DiskAOSettings)
+
+def unregister():
+    for cls in reversed(classes):
+        bpy.utils.unregister_class(cls)
+    del bpy.types.Scene.disk_ao_settings
@@ -0,0 +1,185 @@
+# mesh_arrays.py
+import hashlib
+import numpy as np
+
+# Vertex adjacency per mesh, reused while the edge list is unchanged
+_adjacency_cache = {}
+
+
+# Bulk mesh access through foreach_get / foreach_set instead of per-element loops
+
+def read_vertex_coords(mesh):
+    coords = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+    mesh.vertices.foreach_get("co", coords)
+    return coords.reshape(-1, 3)
+
+
+def read_colors(color_layer):
+    colors = np.empty(len(color_layer.data) * 4, dtype=np.float32)
+    color_layer.data.foreach_get("color", colors)
+    return colors.reshape(-1, 4)
+
+
+def write_colors(color_layer, colors):
+    colors = np.ascontiguousarray(colors, dtype=np.float32)
+    color_layer.data.foreach_set("color", colors.ravel())
+
+
+def gray_to_rgba(values):
+    values = np.asarray(values, dtype=np.float32)
+    colors = np.ones((len(values), 4), dtype=np.float32)
+    colors[:, :3] = values[:, None]
+    return colors
+
+
+def read_vertex_normals(mesh):
+    normals = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+    if hasattr(mesh, "vertex_normals"):
+        mesh.vertex_normals.foreach_get("vector", normals)
+    else:
+        mesh.vertices.foreach_get("normal", normals)
+    return normals.reshape(-1, 3)
+
+
+def read_loop_vertices(mesh):
+    loop_verts = np.empty(len(mesh.loops), dtype=np.int32)
+    mesh.loops.foreach_get("vertex_index", loop_verts)
+    return loop_verts
+
+
+def read_corner_normals(mesh):
+    normals = np.empty(len(mesh.loops) * 3, dtype=np.float32)
+    if hasattr(mesh, "corner_normals"):
+        mesh.corner_normals.foreach_get("vector", normals)
+    else:
+        if hasattr(mesh, "calc_normals_split"):
+            mesh.calc_normals_split()
+        mesh.loops.foreach_get("normal", normals)
+    return normals.reshape(-1, 3)
+
+
+def normalize_rows(vectors, eps=1e-12):
+    lengths = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return np.divide(vectors, lengths, out=np.zeros_like(vectors), where=lengths > eps)
+
+
+def average_corner_normals(mesh):
+    """Per-vertex mean of the corner (split) normals, normalized."""
+    loop_verts = read_loop_vertices(mesh)
+    corner_normals = read_corner_normals(mesh)
+    count = len(mesh.vertices)
+    summed = np.column_stack([
+        np.bincount(loop_verts, corner_normals[:, axis], minlength=count) for axis in range(3)
+    ])
+    return normalize_rows(summed)
+
+
+def read_polygon_normals(mesh):
+    normals = np.empty(len(mesh.polygons) * 3, dtype=np.float32)
+    if hasattr(mesh, "polygon_normals"):
+        mesh.polygon_normals.foreach_get("vector", normals)
+    else:
+        mesh.polygons.foreach_get("normal", normals)
+    return normals.reshape(-1, 3)
+
+
+def read_polygon_areas(mesh):
+    areas = np.empty(len(mesh.polygons), dtype=np.float32)
+    mesh.polygons.foreach_get("area", areas)
+    return areas
+
+
+def read_loop_polygons(mesh):
+    """Polygon index of every loop (corner)."""
+    totals = np.empty(len(mesh.polygons), dtype=np.int32)
+    mesh.polygons.foreach_get("loop_total", totals)
+    return np.repeat(np.arange(len(totals), dtype=np.int32), totals)
+
+
+def read_triangles(mesh):
+    mesh.calc_loop_triangles()
+    tris = np.empty(len(mesh.loop_triangles) * 3, dtype=np.int32)
+    mesh.loop_triangles.foreach_get("vertices", tris)
+    return tris.reshape(-1, 3)
+
+
+def read_evaluated(obj, depsgraph):
+    """Coordinates, vertex normals and triangles of the object with modifiers applied."""
+    evaluated = obj.evaluated_get(depsgraph)
+    mesh = evaluated.to_mesh()
+    try:
+        return read_vertex_coords(mesh), read_vertex_normals(mesh), read_triangles(mesh)
+    finally:
+        evaluated.to_mesh_clear()
+
+
+def read_ray_inputs(obj, depsgraph):
+    """(receiver coords, receiver normals, occluder coords, occluder triangles) in object space.
+
+    Occluders always come from the evaluated mesh; receivers too as long as
+    modifiers only moved vertices, otherwise the base vertices are shaded.
+    """
+    occluder_coords, normals, tris = read_evaluated(obj, depsgraph)
+    coords = occluder_coords
+    if len(coords) != len(obj.data.vertices):
+        coords = read_vertex_coords(obj.data)
+        normals = read_vertex_normals(obj.data)
+    return coords, normals, occluder_coords, tris
+
+
+def read_edges(mesh):
+    edges = np.empty(len(mesh.edges) * 2, dtype=np.int32)
+    mesh.edges.foreach_get("vertices", edges)
+    return edges.reshape(-1, 2)
+
+
+def luminance(colors):
+    return colors[:, 0] * 0.2126 + colors[:, 1] * 0.7152 + colors[:, 2] * 0.0722
+
+
+# Adjacency
+def build_adjacency(edges, vertex_count, include_self=False):
+    """CSR vertex adjacency (indptr, indices); every vertex lists its edge neighbors."""
+    src = np.concatenate((edges[:, 0], edges[:, 1]))
+    dst = np.concatenate((edges[:, 1], edges[:, 0]))
+    if include_self:
+        own = np.arange(vertex_count, dtype=src.dtype)
+        src = np.concatenate((own, src))
+        dst = np.concatenate((own, dst))
+
+    order = np.argsort(src, kind='stable')
+    indices = dst[order].astype(np.int32)
+    indptr = np.zeros(vertex_count + 1, dtype=np.int64)
+    np.cumsum(np.bincount(src, minlength=vertex_count), out=indptr[1:])
+    return indptr, indices
+
+
+def vertex_adjacency(mesh, include_self=False):
+    """Cached build_adjacency for a mesh, rebuilt when its edges change."""
+    edges = read_edges(mesh)
+    fingerprint = (len(mesh.vertices), hashlib.blake2b(edges.tobytes(), digest_size=16).hexdigest())
+    key = (mesh.name_full, include_self)
+
+    cached = _adjacency_cache.get(key)
+    if cached is None or cached[0] != fingerprint:
+        cached = (fingerprint, build_adjacency(edges, len(mesh.vertices), include_self))
+        _adjacency_cache[key] = cached
+    return cached[1]
+
+
+def forget_mesh(name_full):
+    """Drop the cached adjacency of a mesh that is about to be removed."""
+    for include_self in (False, True):
+        _adjacency_cache.pop((name_full, include_self), None)
+
+
+def smooth_over_adjacency(values, indptr, indices, iterations=1):
+    """Repeated mean over each vertex's CSR neighborhood (pass an adjacency that includes self)."""
+    counts = np.diff(indptr).astype(np.float64)
+    counts = np.where(counts > 0, counts, 1.0)
+    if values.ndim > 1:
+        counts = counts[:, None]
+    starts = indptr[:-1]
+    for _ in range(iterations):
+        values = np.add.reduceat(values[indices], starts, axis=0) / counts
+    return values
@@ -0,0 +1,159 @@
+# morphology.py
+import bpy
+import numpy as np
+from bpy.props import EnumProperty, IntProperty, PointerProperty
+from . import config
+from . import mesh_arrays
+
+# Core function
+
+def morph_values(values, indptr, indices, operation, iterations=1):
+    """Max/min filter over the vertex graph; indptr/indices must include each vertex itself."""
+    if operation == 'DILATE':
+        steps = [np.maximum] * iterations
+    elif operation == 'ERODE':
+        steps = [np.minimum] * iterations
+    elif operation == 'OPEN':
+        steps = [np.minimum] * iterations + [np.maximum] * iterations
+    elif operation == 'CLOSE':
+        steps = [np.maximum] * iterations + [np.minimum] * iterations
+    else:
+        raise ValueError(f"Unknown operation: {operation}")
+
+    starts = indptr[:-1]
+    for ufunc in steps:
+        values = ufunc.reduceat(values[indices], starts, axis=0)
+    return values
+
+
+def morph_vertex_colors(obj, operation, iterations=1, mode='CHANNELS'):
+    mesh = obj.data
+    color_layer = mesh.color_attributes.active_color
+
+    colors = mesh_arrays.read_colors(color_layer)
+    indptr, indices = mesh_arrays.vertex_adjacency(mesh, include_self=True)
+
+    if mode == 'LUMINANCE':
+        gray = morph_values(mesh_arrays.luminance(colors), indptr, indices, operation, iterations)
+        colors[:, :3] = gray[:, None]
+    else:
+        colors[:, :3] = morph_values(colors[:, :3], indptr, indices, operation, iterations)
+
+    mesh_arrays.write_colors(color_layer, colors)
+    mesh.update()
+
+
+# Operator
+
+class VERTEX_COLOR_OT_morphology(bpy.types.Operator):
+    bl_idname = "object.vertex_color_morphology"
+    bl_label = "Apply Morphology"
+    bl_description = "Grow or shrink the active vertex color layer over the mesh edges"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    def execute(self, context):
+        obj = context.active_object
+        props = context.scene.vc_morphology_props
+
+        if not obj or obj.type != 'MESH':
+            self.report({'ERROR'}, "No mesh object selected.")
+            return {'CANCELLED'}
+
+        if obj.mode != 'OBJECT':
+            bpy.ops.object.mode_set(mode='OBJECT')
+
+        color_layer = obj.data.color_attributes.active_color
+        if not color_layer:
+            self.report({'ERROR'}, "No active vertex color layer found.")
+            return {'CANCELLED'}
+
+        if color_layer.domain != 'POINT':
+            self.report({'ERROR'}, "Only POINT domain vertex colors supported.")
+            return {'CANCELLED'}
+
+        morph_vertex_colors(obj, props.operation, props.iterations, props.mode)
+
+        self.report({'INFO'}, f"{props.operation.title()} x{props.iterations} applied to '{color_layer.name}'")
+        return {'FINISHED'}
+
+
+# Panel
+
+class VERTEX_COLOR_PT_morphology(bpy.types.Panel):
+    bl_label = "Grow / Shrink"
+    bl_idname = "VERTEX_COLOR_PT_morphology"
+    bl_parent_id = config.MAIN_PANEL_ID
+    bl_space_type = 'VIEW_3D'
+    bl_region_type = 'UI'
+    bl_category = config.BL_CATEGORY
+    bl_options = {'DEFAULT_CLOSED'}
+
+    @classmethod
+    def poll(cls, context):
+        obj = context.active_object
+        return obj and obj.type == 'MESH'
+
+    def draw(self, context):
+        layout = self.layout
+        props = context.scene.vc_morphology_props
+        color_layer = context.active_object.data.color_attributes.active_color
+
+        if color_layer:
+            layout.label(text=f"Active Layer: {color_layer.name}")
+            layout.prop(props, "operation")
+            layout.prop(props, "mode", expand=True)
+            layout.prop(props, "iterations")
+            layout.operator("object.vertex_color_morphology", icon='MOD_EDGESPLIT')
+        else:
+            layout.label(text="No active vertex color layer", icon='ERROR')
+
+
+# Properties
+
+class VertexColorMorphologyProps(bpy.types.PropertyGroup):
+    operation: EnumProperty(
+        name="Operation",
+        description="Morphological operation to apply",
+        items=[
+            ('DILATE', "Dilate", "Grow bright areas by one edge ring per iteration"),
+            ('ERODE', "Erode", "Shrink bright areas by one edge ring per iteration"),
+            ('OPEN', "Open", "Erode then dilate, removes small bright specks"),
+            ('CLOSE', "Close", "Dilate then erode, fills small dark holes"),
+        ],
+        default='DILATE'
+    )
+    mode: EnumProperty(
+        name="Mode",
+        description="What the filter compares",
+        items=[
+            ('CHANNELS', "Per Channel", "Filter R, G and B independently"),
+            ('LUMINANCE', "Luminance", "Filter the luminance and write it as grayscale"),
+        ],
+        default='CHANNELS'
+    )
+    iterations: IntProperty(
+        name="Rings",
+        description="Number of edge rings to grow or shrink",
+        default=1,
+        min=1,
+        max=100
+    )
+
+
+# Register
+
+classes = (
+    VertexColorMorphologyProps,
+    VERTEX_COLOR_OT_morphology,
+    VERTEX_COLOR_PT_morphology,
+)
+
+def register():
+    for cls in classes:
+        bpy.utils.register_class(cls)
+    bpy.types.Scene.vc_morphology_props = PointerProperty(type=VertexColorMorphologyProps)
+
+def unregister():
+    for cls in reversed(classes):
+        bpy.utils.unregister_class(cls)
+    del bpy.types.Scene.vc_morphology_props
@@ -0,0 +1,394 @@
+# procedural_noise.py
+import bpy
+import numpy as np
+from bpy.props import StringProperty, EnumProperty, FloatProperty, IntProperty, PointerProperty
+from . import config
+from . import chunked_executor
+from . import mesh_arrays
+from . import ray_engine
+
+# Vertices per chunk task; every octave allocates a few float32 arrays of this length
+NOISE_CHUNK_SIZE = 65536
+
+# Edge midpoints of a cube, the classic Perlin gradient set, padded to 16 entries as in
+# improved Perlin noise so the top 4 hash bits index it; one table per axis for np.take
+GRADIENTS = np.array([
+    (1, 1, 0), (-1, 1, 0), (1, -1, 0), (-1, -1, 0),
+    (1, 0, 1), (-1, 0, 1), (1, 0, -1), (-1, 0, -1),
+    (0, 1, 1), (0, -1, 1), (0, 1, -1), (0, -1, -1),
+    (1, 1, 0), (-1, 1, 0), (0, -1, 1), (0, -1, -1),
+], dtype=np.float32)
+GRADIENT_X, GRADIENT_Y, GRADIENT_Z = (np.ascontiguousarray(GRADIENTS[:, axis]) for axis in range(3))
+
+CHANNELS = {'R': 0, 'G': 1, 'B': 2, 'A': 3}
+
+# Brings simplex_noise's extremes (with the 0.5 kernel radius) to about +-1
+SIMPLEX_SCALE = 70.0
+
+
+# Core logic
+
+def _mix(h):
+    """Avalanche finalizer, every input bit affects every output bit."""
+    h ^= h >> np.uint32(16)
+    h *= np.uint32(0x7FEB352D)
+    h ^= h >> np.uint32(15)
+    h *= np.uint32(0x846CA68B)
+    h ^= h >> np.uint32(16)
+    return h
+
+
+def _axis_terms(cell, seed, offsets):
+    """Per-axis hash terms for cell + offset; _mix of the XOR of one term per axis hashes a lattice point."""
+    primes = (0x8DA6B343, 0xD8163841, 0xCB1AB31F)
+    terms = []
+    for axis in range(3):
+        base = cell[:, axis].astype(np.uint32)
+        terms.append({d: (base + np.uint32(d & 0xFFFFFFFF)) * np.uint32(primes[axis]) for d in offsets})
+    terms[0] = {d: t ^ np.uint32((seed * 0x9E3779B9) & 0xFFFFFFFF) for d, t in terms[0].items()}
+    return terms
+
+
+def _unit_float(h):
+    """uint32 hash to float32 in [0, 1)."""
+    return (h >> np.uint32(8)).astype(np.float32) * np.float32(1.0 / 16777216.0)
+
+
+def _fade(t):
+    return t * t * t * (t * (t * np.float32(6.0) - np.float32(15.0)) + np.float32(10.0))
+
+
+def _lattice(points):
+    cell = np.floor(points)
+    return cell.astype(np.int32), (points - cell).astype(np.float32)
+
+
+def _trilinear(corner_value, frac):
+    """Blend the 8 cell corners; corner_value(dx, dy, dz) returns (N,) values."""
+    u, v, w = (_fade(frac[:, axis]) for axis in range(3))
+    result = np.zeros(len(frac), dtype=np.float32)
+    for dx in (0, 1):
+        wx = u if dx else 1.0 - u
+        for dy in (0, 1):
+            wxy = wx * (v if dy else 1.0 - v)
+            for dz in (0, 1):
+                result += wxy * (w if dz else 1.0 - w) * corner_value(dx, dy, dz)
+    return result
+
+
+def _gradient_dot(h, x, y, z):
+    """Dot product with one of the cube edge gradients, selected by the hash's top bits."""
+    index = (h >> np.uint32(28)).astype(np.intp)
+    return GRADIENT_X.take(index) * x + GRADIENT_Y.take(index) * y + GRADIENT_Z.take(index) * z
+
+
+def value_noise(points, seed=0):
+    """Smoothly interpolated random lattice values, in [-1, 1]."""
+    cell, frac = _lattice(points)
+    hx, hy, hz = _axis_terms(cell, seed, (0, 1))
+
+    def corner(dx, dy, dz):
+        return _unit_float(_mix(hx[dx] ^ hy[dy] ^ hz[dz])) * np.float32(2.0) - np.float32(1.0)
+
+    return _trilinear(corner, frac)
+
+
+def perlin_noise(points, seed=0):
+    """Gradient noise with quintic fade, roughly in [-1, 1]."""
+    cell, frac = _lattice(points)
+    hx, hy, hz = _axis_terms(cell, seed, (0, 1))
+    fx, fy, fz = frac[:, 0], frac[:, 1], frac[:, 2]
+
+    def corner(dx, dy, dz):
+        return _gradient_dot(_mix(hx[dx] ^ hy[dy] ^ hz[dz]), fx - dx, fy - dy, fz - dz)
+
+    return _trilinear(corner, frac)
+
+
+def simplex_noise(points, seed=0):
+    """3D simplex noise (4 corners per point instead of 8), roughly in [-1, 1]."""
+    points = points.astype(np.float32, copy=False)
+    skew = points.sum(axis=1) * np.float32(1.0 / 3.0)
+    cell = np.floor(points + skew[:, None]).astype(np.int32)
+    unskew = cell.sum(axis=1).astype(np.float32) * np.float32(1.0 / 6.0)
+    x0, y0, z0 = (points[:, axis] - cell[:, axis] + unskew for axis in range(3))
+    terms = _axis_terms(cell, seed, (0, 1))
+
+    # Rank of every component picks the simplex the point lies in
+    rank_x = (x0 >= y0).astype(np.int8) + (x0 >= z0)
+    rank_y = (y0 > x0).astype(np.int8) + (y0 >= z0)
+    rank_z = (z0 > x0).astype(np.int8) + (z0 > y0)
+    first = (rank_x >= 2, rank_y >= 2, rank_z >= 2)
+    second = (rank_x >= 1, rank_y >= 1, rank_z >= 1)
+
+    result = np.zeros(len(points), dtype=np.float32)
+    for k, step in enumerate((None, first, second, True)):
+        if step is None:
+            steps = (0, 0, 0)
+            h = terms[0][0] ^ terms[1][0] ^ terms[2][0]
+        elif step is True:
+            steps = (1, 1, 1)
+            h = terms[0][1] ^ terms[1][1] ^ terms[2][1]
+        else:
+            steps = step
+            h = (np.where(step[0], terms[0][1], terms[0][0]) ^ np.where(step[1], terms[1][1], terms[1][0])
+                 ^ np.where(step[2], terms[2][1], terms[2][0]))
+        offset = np.float32(k / 6.0)
+        dx, dy, dz = (c - shift + offset for c, shift in zip((x0, y0, z0), steps))
+        t = np.maximum(np.float32(0.5) - (dx * dx + dy * dy + dz * dz), np.float32(0.0))
+        t *= t
+        result += (t * t) * _gradient_dot(_mix(h), dx, dy, dz)
+    return result * np.float32(SIMPLEX_SCALE)
+
+
+def voronoi_noise(points, seed=0):
+    """Distance to the nearest jittered feature point (F1), in [0, ~1]."""
+    cell, frac = _lattice(points)
+    hx, hy, hz = _axis_terms(cell, seed, (-1, 0, 1))
+    fx, fy, fz = frac[:, 0], frac[:, 1], frac[:, 2]
+    nearest = np.full(len(points), np.inf, dtype=np.float32)
+    for dx in (-1, 0, 1):
+        for dy in (-1, 0, 1):
+            hxy = hx[dx] ^ hy[dy]
+            for dz in (-1, 0, 1):
+                # One hash per cell; the feature point's y and z come from cheap re-multiplies
+                h = _mix(hxy ^ hz[dz])
+                h2 = h * np.uint32(0x9E3779B1)
+                h3 = h2 * np.uint32(0x9E3779B1)
+                ddx = _unit_float(h) + np.float32(dx) - fx
+                ddy = _unit_float(h2) + np.float32(dy) - fy
+                ddz = _unit_float(h3) + np.float32(dz) - fz
+                np.minimum(nearest, ddx * ddx + ddy * ddy + ddz * ddz, out=nearest)
+    return np.sqrt(nearest)
+
+
+NOISE_FUNCTIONS = {
+    'VALUE': value_noise,
+    'PERLIN': perlin_noise,
+    'SIMPLEX': simplex_noise,
+    'VORONOI': voronoi_noise,
+}
+
+
+def fbm(points, noise_type='PERLIN', octaves=4, lacunarity=2.0, gain=0.5, seed=0):
+    """Fractal sum of octaves, normalised by the total amplitude; float32 (N,)."""
+    noise = NOISE_FUNCTIONS[noise_type]
+    points = np.asarray(points, dtype=np.float32)
+    total = np.zeros(len(points), dtype=np.float32)
+    amplitude, frequency, norm = 1.0, 1.0, 0.0
+    for octave in range(octaves):
+        total += np.float32(amplitude) * noise(points * np.float32(frequency), seed + octave)
+        norm += amplitude
+        amplitude *= gain
+        frequency *= lacunarity
+    return total / np.float32(norm)
+
+
+def to_unit_range(values, noise_type):
+    """Map noise to [0, 1]: signed noises are re-centred, Voronoi distances are clamped."""
+    if noise_type != 'VORONOI':
+        values = values * np.float32(0.5) + np.float32(0.5)
+    return np.clip(values, 0.0, 1.0)
+
+
+def noise_field(points, noise_type, octaves, lacunarity, gain, seed, workers=0):
+    """fbm over a large point set, split into chunks on the thread pool."""
+    parts = chunked_executor.map_chunks(
+        lambda start, stop: to_unit_range(
+            fbm(points[start:stop], noise_type, octaves, lacunarity, gain, seed), noise_type),
+        len(points), NOISE_CHUNK_SIZE, workers)
+    return np.concatenate(parts) if parts else np.zeros(0, dtype=np.float32)
+
+
+# Operator
+
+class NOISE_OT_apply(bpy.types.Operator):
+    bl_idname = "object.vertex_color_noise"
+    bl_label = "Apply Noise"
+    bl_description = "Write procedural 3D noise evaluated at the vertex positions into a layer or channel"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    def execute(self, context):
+        obj = context.object
+        if obj is None or obj.type != 'MESH':
+            self.report({'ERROR'}, "Select a mesh object")
+            return {'CANCELLED'}
+
+        settings = context.scene.noise_settings
+        layer_name = settings.layer_name.strip()
+        if not layer_name:
+            self.report({'ERROR'}, "Layer name cannot be empty")
+            return {'CANCELLED'}
+
+        if obj.mode != 'OBJECT':
+            bpy.ops.object.mode_set(mode='OBJECT')
+
+        mesh = obj.data
+        coords = mesh_arrays.read_vertex_coords(mesh)
+        if settings.space == 'WORLD':
+            coords = ray_engine.transform_points(obj.matrix_world, coords.astype(np.float64))
+        points = coords.astype(np.float32) * np.float32(settings.scale)
+
+        values = noise_field(points, settings.noise_type, settings.octaves, settings.lacunarity,
+                             settings.gain, settings.seed, settings.threads)
+
+        color_layer = mesh.color_attributes.get(layer_name)
+        if color_layer is not None and color_layer.domain != 'POINT':
+            self.report({'ERROR'}, "Only POINT domain vertex colors supported.")
+            return {'CANCELLED'}
+        if color_layer is None:
+            color_layer = mesh.color_attributes.new(name=layer_name, type='FLOAT_COLOR', domain='POINT')
+
+        if settings.output == 'CHANNEL':
+            colors = mesh_arrays.read_colors(color_layer)
+            colors[:, CHANNELS[settings.channel]] = values
+        else:
+            colors = mesh_arrays.gray_to_rgba(values)
+        mesh_arrays.write_colors(color_layer, colors)
+        mesh.color_attributes.active_color = color_layer
+        mesh.update()
+
+        target = f"'{layer_name}'" if settings.output == 'LAYER' else f"'{layer_name}'.{settings.channel}"
+        self.report({'INFO'}, f"{settings.noise_type.title()} noise written to {target}")
+        return {'FINISHED'}
+
+
+# Panel
+
+class NOISE_PT_panel(bpy.types.Panel):
+    bl_label = "Noise"
+    bl_idname = "NOISE_PT_panel"
+    bl_parent_id = config.MAIN_PANEL_ID
+    bl_space_type = 'VIEW_3D'
+    bl_region_type = 'UI'
+    bl_category = config.BL_CATEGORY
+    bl_options = {'DEFAULT_CLOSED'}
+
+    def draw(self, context):
+        layout = self.layout
+        settings = context.scene.noise_settings
+
+        layout.prop(settings, "noise_type")
+        layout.prop(settings, "space", expand=True)
+
+        col = layout.column(align=True)
+        col.prop(settings, "scale")
+        col.prop(settings, "octaves")
+        col.prop(settings, "lacunarity")
+        col.prop(settings, "gain")
+        col.prop(settings, "seed")
+
+        layout.prop(settings, "layer_name", icon='GROUP_VCOL')
+        layout.prop(settings, "output", expand=True)
+        if settings.output == 'CHANNEL':
+            layout.prop(settings, "channel", expand=True)
+        layout.prop(settings, "threads")
+        layout.operator(NOISE_OT_apply.bl_idname, icon='RNDCURVE')
+
+
+# Property Group
+
+class NoiseSettings(bpy.types.PropertyGroup):
+    noise_type: EnumProperty(
+        name="Type",
+        description="Noise basis summed over the octaves",
+        items=[
+            ('VALUE', "Value", "Interpolated random lattice values, blocky at one octave"),
+            ('PERLIN', "Perlin", "Gradient noise"),
+            ('SIMPLEX', "Simplex", "Simplex gradient noise, fewer axis-aligned artifacts"),
+            ('VORONOI', "Voronoi", "Distance to the nearest random feature point (cells)"),
+        ],
+        default='PERLIN'
+    )
+    space: EnumProperty(
+        name="Space",
+        description="Coordinates the noise is evaluated in",
+        items=[
+            ('OBJECT', "Object", "Noise moves with the object"),
+            ('WORLD', "World", "Noise stays fixed in the scene, continuous across objects"),
+        ],
+        default='OBJECT'
+    )
+    scale: FloatProperty(
+        name="Scale",
+        description="Frequency of the first octave, in features per unit",
+        default=2.0,
+        min=0.0001,
+        soft_max=100.0
+    )
+    octaves: IntProperty(
+        name="Octaves",
+        description="Number of fBm layers, each at a higher frequency",
+        default=4,
+        min=1,
+        max=16
+    )
+    lacunarity: FloatProperty(
+        name="Lacunarity",
+        description="Frequency multiplier between octaves",
+        default=2.0,
+        min=1.0,
+        max=8.0
+    )
+    gain: FloatProperty(
+        name="Roughness",
+        description="Amplitude multiplier between octaves",
+        default=0.5,
+        min=0.0,
+        max=1.0
+    )
+    seed: IntProperty(
+        name="Seed",
+        default=0,
+        min=0
+    )
+    layer_name: StringProperty(
+        name="Layer",
+        description="Name of the vertex color layer to write",
+        default="Noise"
+    )
+    output: EnumProperty(
+        name="Output",
+        description="Where the noise goes",
+        items=[
+            ('LAYER', "Layer", "Grayscale into the whole layer"),
+            ('CHANNEL', "Channel", "Into one channel, keeping the others"),
+        ],
+        default='LAYER'
+    )
+    channel: EnumProperty(
+        name="Channel",
+        items=[
+            ('R', "R", "Red"),
+            ('G', "G", "Green"),
+            ('B', "B", "Blue"),
+            ('A', "A", "Alpha"),
+        ],
+        default='R'
+    )
+    threads: IntProperty(
+        name="Threads",
+        description="Worker threads for the vertex chunks (0 = one per CPU core)",
+        default=0,
+        min=0,
+        max=256
+    )
+
+
+# Registration
+
+classes = (
+    NoiseSettings,
+    NOISE_OT_apply,
+    NOISE_PT_panel,
+)
+
+def register():
+    for cls in classes:
+        bpy.utils.register_class(cls)
+    bpy.types.Scene.noise_settings = PointerProperty(type=NoiseSettings)
+
+def unregister():
+    for cls in reversed(classes):
+        bpy.utils.unregister_class(cls)
+    del bpy.types.Scene.noise_settings
@@ -0,0 +1,55 @@
+# progressive.py
+import bpy
+
+
+class ProgressiveBakeMixin:
+    """Operator mixin for bakes that refine a vertex color layer pass by pass.
+
+    Subclasses implement start(context) -> bool, run_pass(context) -> bool (True when done),
+    finish(context) and progress_text(). Invoked from the UI it runs one pass per timer tick
+    and shows the running result; ESC stops early and keeps what was accumulated.
+    execute() runs every pass in one go, for scripts and background mode.
+    """
+
+    _timer = None
+
+    def execute(self, context):
+        if not self.start(context):
+            return {'CANCELLED'}
+        while not self.run_pass(context):
+            pass
+        self.finish(context)
+        return {'FINISHED'}
+
+    def invoke(self, context, event):
+        if not self.start(context):
+            return {'CANCELLED'}
+        wm = context.window_manager
+        self._timer = wm.event_timer_add(0.01, window=context.window)
+        wm.modal_handler_add(self)
+        return {'RUNNING_MODAL'}
+
+    def modal(self, context, event):
+        if event.type == 'ESC':
+            self._stop(context)
+            self.finish(context)
+            return {'FINISHED'}
+
+        if event.type == 'TIMER':
+            done = self.run_pass(context)
+            if context.area:
+                context.area.header_text_set(self.progress_text())
+                context.area.tag_redraw()
+            if done:
+                self._stop(context)
+                self.finish(context)
+                return {'FINISHED'}
+
+        return {'PASS_THROUGH'}
+
+    def _stop(self, context):
+        if self._timer is not None:
+            context.window_manager.event_timer_remove(self._timer)
+            self._timer = None
+        if context.area:
+            context.area.header_text_set(None)
@@ -0,0 +1,84 @@
+# surface_transfer.py
+import hashlib
+import numpy as np
+from . import chunked_executor
+from . import ray_engine
+
+# Mapping per (source, target) pair, reused while both geometries are unchanged
+_mapping_cache = {}
+
+
+# Core logic
+
+class SurfaceMapping:
+    """For every target point: the three source vertices of its nearest source triangle and
+    barycentric weights, so any per-vertex source attribute transfers as one gather."""
+
+    def __init__(self, corners, weights, distances):
+        self.corners = corners      # (M, 3) source vertex indices
+        self.weights = weights      # (M, 3)
+        self.distances = distances  # (M,) distance to the source surface
+
+    @property
+    def nbytes(self):
+        return self.corners.nbytes + self.weights.nbytes + self.distances.nbytes
+
+    def transfer(self, values):
+        """Interpolate (N, ...) per-vertex source values to (M, ...) target values."""
+        values = np.asarray(values)
+        gathered = values[self.corners]
+        weights = self.weights.reshape(self.weights.shape + (1,) * (values.ndim - 1))
+        return (gathered * weights).sum(axis=1).astype(values.dtype, copy=False)
+
+
+def build_mapping(source_coords, source_tris, target_coords, bvh=None):
+    """Map target points to the nearest point on the source surface (same space for both).
+
+    Runs on one thread: the lookups are a Python loop over BVHTree.find_nearest that
+    holds the GIL, so a thread pool would not speed it up.
+    """
+    source_coords = np.asarray(source_coords, dtype=np.float64)
+    target_coords = np.asarray(target_coords, dtype=np.float64)
+    if bvh is None:
+        bvh = ray_engine.build_bvh(source_coords, source_tris)
+
+    def map_chunk(start, stop):
+        _, index, location, distance = ray_engine.nearest_batch(bvh, target_coords[start:stop],
+                                                                ray_engine.MAX_DISTANCE)
+        corners = source_tris[index]
+        tri_co = source_coords[corners]
+        weights = ray_engine.barycentric(location, tri_co[:, 0], tri_co[:, 1], tri_co[:, 2])
+        return corners, weights, distance
+
+    parts = chunked_executor.map_chunks(map_chunk, len(target_coords), workers=1)
+    if not parts:
+        return SurfaceMapping(np.zeros((0, 3), dtype=np.int32), np.zeros((0, 3)), np.zeros(0))
+    corners, weights, distances = (np.concatenate(column) for column in zip(*parts))
+    return SurfaceMapping(corners.astype(np.int32), weights.astype(np.float32), distances)
+
+
+def geometry_fingerprint(*arrays):
+    digest = hashlib.blake2b(digest_size=16)
+    for array in arrays:
+        array = np.ascontiguousarray(array)
+        digest.update(repr(array.shape).encode())
+        digest.update(array.tobytes())
+    return digest.hexdigest()
+
+
+def get_mapping(key, source_coords, source_tris, target_coords):
+    """Cached build_mapping; key names the (source, target) pair, geometry changes rebuild it."""
+    fingerprint = geometry_fingerprint(source_coords, source_tris, target_coords)
+    cached = _mapping_cache.get(key)
+    if cached is None or cached[0] != fingerprint:
+        cached = (fingerprint, build_mapping(source_coords, source_tris, target_coords))
+        _mapping_cache[key] = cached
+    return cached[1]
+
+
+def mapping_cache_nbytes():
+    return sum(mapping.nbytes for _, mapping in _mapping_cache.values())
+
+
+def clear_mapping_cache():
+    _mapping_cache.clear()